@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+# Word Wizard - Card model benchmark
+# Compares memory use and attribute-access cost of the slotted Card model against plain dicts.
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core import Card, ALLOWED_CATEGORIES, ALLOWED_LEVELS  # noqa: E402
+
+
+def make_dicts(count):
+    """Build synthetic cards shaped like german_flashcards.json entries."""
+    return [{
+        'german': f"das Wort{i}",
+        'english': f"word {i}",
+        'level': ALLOWED_LEVELS[i % len(ALLOWED_LEVELS)],
+        'category': ALLOWED_CATEGORIES[i % len(ALLOWED_CATEGORIES)],
+        'gender': 'das',
+        'examples': [f"Das ist Wort {i}.", f"Ich lerne Wort {i}."],
+        'box': i % 5 + 1,
+        'favorite': i % 50 == 0
+    } for i in range(count)]
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, current
+
+
+def scan_dicts(cards):
+    """The access pattern the app used on dict cards (card.get with defaults)."""
+    total = 0
+    for card in cards:
+        total += card.get('box', 1)
+        if card.get('level', '') == 'A1' and card.get('favorite', False):
+            total += 1
+    return total
+
+
+def scan_cards(cards):
+    total = 0
+    for card in cards:
+        total += card.box
+        if card.level == 'A1' and card.favorite:
+            total += 1
+    return total
+
+
+def best_time(scan, cards, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scan(cards)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Card model against plain dict cards.")
+    parser.add_argument('--count', type=int, default=100_000, help="number of synthetic cards")
+    args = parser.parse_args()
+
+    source = make_dicts(args.count)
+    dicts, dict_bytes = measure_memory(lambda: [dict(card, examples=list(card['examples'])) for card in source])
+    cards, card_bytes = measure_memory(lambda: [Card.from_dict(card)[0] for card in source])
+
+    dict_time = best_time(scan_dicts, dicts)
+    card_time = best_time(scan_cards, cards)
+
+    print(f"{args.count} cards")
+    print(f"  memory  dict: {dict_bytes / 1024 / 1024:8.2f} MiB   Card: {card_bytes / 1024 / 1024:8.2f} MiB   "
+          f"({card_bytes / dict_bytes:.0%})")
+    print(f"  access  dict: {dict_time * 1000:8.2f} ms    Card: {card_time * 1000:8.2f} ms    "
+          f"({card_time / dict_time:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Word Wizard - Compiled base deck benchmark
+# Compares loading a read-only base deck from JSON, from the pickled deck cache and from the compiled,
+# memory-mapped format profiles use: load time, Python heap allocated by the load (tracemalloc; the
+# mapped file itself lives in the shared page cache) and the cost of showing a session's worth of cards.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card  # noqa: E402
+from word_wizard_core.compiled import CompiledDeck, write_compiled_deck  # noqa: E402
+from word_wizard_core.storage import (atomic_write_json, _load_deck_cache, _parse_deck_file, _source_key,  # noqa: E402
+                                      _write_deck_cache)
+
+SHIPPED_DECK = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard',
+                            'german_flashcards.json')
+
+
+def synthetic_deck(path, count):
+    cards = [Card(f"das Wort{i}", f"word {i}", ALLOWED_LEVELS[i % len(ALLOWED_LEVELS)],
+                  ALLOWED_CATEGORIES[i % len(ALLOWED_CATEGORIES)], 'das',
+                  (f"Das ist Wort {i}.", f"Ich lerne Wort {i}."), i % 5 + 1, i % 50 == 0) for i in range(count)]
+    atomic_write_json(path, [card.to_dict() for card in cards], ensure_ascii=False, indent=2)
+
+
+def measure(load, repeat):
+    """Best load time over repeat runs, and the heap allocated by one load."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    cards = load()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cards, best, allocated
+
+
+def show(cards, count=20):
+    """What displaying a session does with each card's text."""
+    return sum(len(card.english or '') + sum(len(example) for example in card.examples) for card in cards[:count])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading the base deck from JSON, pickle and mmap.")
+    parser.add_argument('--count', type=int, help="synthetic cards instead of the shipped deck")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = SHIPPED_DECK
+        if args.count:
+            source = os.path.join(tmp, 'deck.json')
+            synthetic_deck(source, args.count)
+        parsed = _parse_deck_file(source)[0]
+        cache_file = os.path.join(tmp, 'deck.cache')
+        compiled_file = os.path.join(tmp, 'deck.wwdeck')
+        _write_deck_cache(cache_file, source, parsed, 3)
+        write_compiled_deck(compiled_file, parsed, _source_key(source))
+        del parsed
+
+        print(f"{source}: {os.path.getsize(source) / 1024:.0f} KiB JSON, "
+              f"{os.path.getsize(cache_file) / 1024:.0f} KiB pickle, "
+              f"{os.path.getsize(compiled_file) / 1024:.0f} KiB compiled")
+        loaders = {
+            'json': lambda: _parse_deck_file(source)[0],
+            'pickle cache': lambda: _load_deck_cache(cache_file, source, 3),
+            'compiled (mmap)': lambda: CompiledDeck(compiled_file).cards()
+        }
+        for name, load in loaders.items():
+            cards, best, allocated = measure(load, args.repeat)
+            start = time.perf_counter()
+            show(cards)
+            shown_ms = (time.perf_counter() - start) * 1000
+            print(f"  {name:<16} load {best * 1000:8.1f} ms   heap {allocated / 1024 / 1024:7.2f} MiB   "
+                  f"show 20 cards {shown_ms:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
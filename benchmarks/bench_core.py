@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+# Word Wizard - Core deck operations benchmark
+# Runs the app headless (see headless_tk.py) against the shipped deck and synthetic decks and times loading,
+# saving, starting sessions, answering cards (stats updates), importing and exporting. Results are printed
+# and written to a JSON file so runs can be compared over time.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, '..', 'usr', 'share', 'word-wizard')
+sys.path.insert(0, APP_DIR)
+
+import headless_tk  # noqa: E402
+import word_wizard  # noqa: E402
+from word_wizard_core import ALLOWED_CATEGORIES, ALLOWED_LEVELS  # noqa: E402
+
+SHIPPED_DECK = os.path.join(APP_DIR, 'german_flashcards.json')
+SIZES = {'shipped': None, '50k': 50_000, '500k': 500_000, '5m': 5_000_000}
+
+
+def synthetic_card(i, prefix="Wort"):
+    return {
+        'german': f"das {prefix}{i}",
+        'english': f"word {i}",
+        'level': ALLOWED_LEVELS[i % len(ALLOWED_LEVELS)],
+        'category': ALLOWED_CATEGORIES[i % len(ALLOWED_CATEGORIES)],
+        'gender': 'das',
+        'examples': [f"Das ist {prefix} {i}.", f"Ich lerne {prefix} {i}."],
+        'box': i % 5 + 1,
+        'favorite': i % 50 == 0
+    }
+
+
+def write_deck(path, count, prefix="Wort"):
+    """Write count synthetic cards as a JSON array, one card at a time."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(count):
+            f.write((',\n' if i else '') + json.dumps(synthetic_card(i, prefix), ensure_ascii=False))
+        f.write('\n]\n')
+
+
+def settle(app):
+    """Wait until the writer thread has finished every queued job and pending save."""
+    done = threading.Event()
+    app.deck.writer.submit(done.set)
+    done.wait()
+
+
+def run_to_completion(app, start):
+    """Start a background import or export, then run the after() polls Tk would until it has finished."""
+    start()
+    while app._import_stop is not None or app._export_stop is not None:
+        _, callback, args = app.master.scheduled.pop()
+        callback(*args)
+        time.sleep(0.001)
+
+
+def timed(function, repeat, before=None):
+    runs = []
+    for i in range(repeat):
+        if before:
+            before(i)
+        start = time.perf_counter()
+        function(i)
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs
+
+
+def answer_session(app):
+    """Answer every card of the current session, alternating correct and incorrect."""
+    for i in range(len(app.session)):
+        app.current_card = app.session.current
+        app.feedback_given = False
+        app.answer_feedback(i % 2 == 0)
+    app._update_stats_view()
+
+
+def bench_deck(name, count, repeat, import_count, tmp):
+    data_dir = os.path.join(tmp, name)
+    os.makedirs(os.path.join(data_dir, 'data'))
+    deck_file = os.path.join(data_dir, 'data', 'german_flashcards.json')
+    if count is None:
+        shutil.copy(SHIPPED_DECK, deck_file)
+    else:
+        write_deck(deck_file, count)
+
+    root = headless_tk.install(word_wizard)
+    timings = {}
+    start = time.perf_counter()
+    app = word_wizard.WordWizardApp(root, data_dir=data_dir)
+    timings['startup (cold load_data)'] = [(time.perf_counter() - start) * 1000]
+    app.sound_enabled = False
+    app.deck.writer.debounce_ms = 0
+    app.setup_stats_frame()
+    settle(app)
+
+    timings['load_data'] = timed(lambda i: app.load_data(), repeat, before=lambda i: settle(app))
+    settle(app)
+    timings['_perform_save'] = timed(lambda i: app._perform_save(), repeat)
+    timings['start_review_session'] = timed(lambda i: app.start_review_session(), repeat)
+    timings['start_review_session(B1)'] = timed(lambda i: app.start_review_session(level='B1'), repeat)
+    app.level_var.set('B1')
+    app.category_var.set('Noun')
+    app.word_count_var.set('50')
+    timings['start_custom_review'] = timed(lambda i: app.start_custom_review(), repeat)
+    timings['answer session + stats view'] = timed(lambda i: answer_session(app), repeat,
+                                                   before=lambda i: app.start_custom_review())
+    settle(app)
+
+    export_file = os.path.join(tmp, f"{name}-export.json")
+    timings['export_vocabulary'] = timed(lambda i: run_to_completion(app, lambda: app.export_vocabulary(export_file)),
+                                         repeat)
+    import_files = []
+    for i in range(repeat):
+        import_files.append(os.path.join(tmp, f"{name}-import{i}.json"))
+        write_deck(import_files[-1], import_count, prefix=f"Import{i}x")
+    timings['import_vocabulary'] = timed(
+        lambda i: run_to_completion(app, lambda: app.import_vocabulary(import_files[i])), repeat,
+        before=lambda i: settle(app))
+    settle(app)
+    cards = len(app.deck)
+    app.deck.close()
+    return {'cards': cards, 'timings': {
+        op: {'runs_ms': [round(run, 3) for run in runs], 'min_ms': round(min(runs), 3),
+             'median_ms': round(statistics.median(runs), 3)} for op, runs in timings.items()}}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark core deck operations without a display.")
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help=f"comma-separated decks to run (default: all of {', '.join(SIZES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per operation")
+    parser.add_argument('--import-count', type=int, default=1000, help="new cards per import run")
+    parser.add_argument('--output', default=f"bench_core-{datetime.now():%Y%m%d-%H%M%S}.json",
+                        help="JSON results file")
+    args = parser.parse_args()
+
+    sizes = [size.strip().lower() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    results = {'created': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+               'python': platform.python_version(), 'platform': platform.platform(), 'repeat': args.repeat,
+               'import_count': args.import_count, 'decks': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in sizes:
+            # The app prints notices such as "Sound disabled"; keep them out of the report
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                deck = results['decks'][name] = bench_deck(name, SIZES[name], args.repeat, args.import_count, tmp)
+            print(f"{name} ({deck['cards']} cards)")
+            for op, timing in deck['timings'].items():
+                print(f"  {op:<30} min {timing['min_ms']:10.1f} ms   median {timing['median_ms']:10.1f} ms")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+# Word Wizard - Review log benchmark
+# Writes a synthetic review history and times loading it into columns and replaying it into stats and
+# Leitner boxes, with NumPy (when installed) and with the pure-Python fallback.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core import Card, ReviewLog, ALLOWED_CATEGORIES, ALLOWED_LEVELS  # noqa: E402
+from word_wizard_core.stats import _load_numpy  # noqa: E402
+
+
+def write_history(path, words, events, days=365):
+    """Write events reviews of random words spread over the last days days, in time order."""
+    rng = random.Random(42)
+    with open(os.path.splitext(path)[0] + '.words', 'w', encoding='utf-8') as f:
+        f.writelines(f"{word}\n" for word in words)
+    boxes = [1] * len(words)
+    start = time.time() - days * 86400
+    step = days * 86400 / events
+    with open(path, 'wb') as f:
+        for i in range(events):
+            card_id = rng.randrange(len(words))
+            correct = rng.random() < 0.75
+            box_before = boxes[card_id]
+            box_after = boxes[card_id] = min(box_before + 1, 5) if correct else 1
+            timestamp = start + i * step
+            f.write(ReviewLog.RECORD.pack(card_id, timestamp, date.fromtimestamp(timestamp).toordinal(), correct,
+                                          box_before, box_after, rng.randrange(500, 8000)))
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading and replaying the review log.")
+    parser.add_argument('--events', type=int, default=1_000_000, help="number of synthetic reviews")
+    parser.add_argument('--words', type=int, default=50_000, help="number of distinct cards")
+    args = parser.parse_args()
+
+    words = [f"das Wort{i}" for i in range(args.words)]
+    cards = {word: Card(word, level=ALLOWED_LEVELS[i % len(ALLOWED_LEVELS)],
+                        category=ALLOWED_CATEGORIES[i % len(ALLOWED_CATEGORIES)]) for i, word in enumerate(words)}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'review_events.bin')
+        _, write_time = timed(lambda: write_history(path, words, args.events))
+        print(f"{args.events} events, {args.words} cards ({os.path.getsize(path) / 1024 / 1024:.1f} MiB on disk, "
+              f"written in {write_time:.1f} s)")
+
+        modes = [('numpy', True)] if _load_numpy() is not None else []
+        modes.append(('python', False))
+        for name, use_numpy in modes:
+            log = ReviewLog(path)
+            _, load_time = timed(lambda: log.columns(use_numpy))
+            (stats, boxes), replay_time = timed(lambda: log.replay(cards, use_numpy))
+            print(f"  {name:<7} load {load_time * 1000:8.1f} ms   replay {replay_time * 1000:8.1f} ms   "
+                  f"({stats['total_reviews']} reviews, {len(boxes)} boxes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# Word Wizard - Startup benchmark
+# Measures the import cost of word_wizard with `python -X importtime` and fails if it pulls in heavy
+# optional modules (pygame, matplotlib, numpy) or exceeds a time budget. With a display available it
+# also measures time to first frame: building the main window and drawing it once. The terminal commands
+# (`word-wizard stats` etc.) are timed end to end and must not import tkinter or the deferred modules at all.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard')
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'bin', 'word-wizard')
+
+# Modules that must only be imported after the first frame is drawn
+DEFERRED_MODULES = ('pygame', 'matplotlib', 'numpy')
+
+FIRST_FRAME_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import tkinter as tk
+from word_wizard import WordWizardApp
+root = tk.Tk()
+app = WordWizardApp(root)
+root.update()
+print(f"{{(time.perf_counter() - start) * 1000:.1f}}")
+app.on_closing()
+"""
+
+
+def import_profile(command=('-c', 'import word_wizard')):
+    """Run a command under -X importtime; returns {module: cumulative milliseconds}."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *command],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=APP_DIR))
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if cumulative_us.strip().isdigit():  # Skip the header line
+            modules[name.strip()] = int(cumulative_us) / 1000
+    return modules
+
+
+def first_frame_ms():
+    result = subprocess.run([sys.executable, '-c', FIRST_FRAME_SCRIPT.format(app_dir=APP_DIR)],
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def cli_runs(data_dir, runs):
+    """Wall-clock milliseconds of `word-wizard stats` runs, after one warm-up run that creates the data."""
+    command = [sys.executable, LAUNCHER, 'stats', '--data-dir', data_dir]
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    subprocess.run(command, env=env, capture_output=True, check=True)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Word Wizard startup.")
+    parser.add_argument('--max-import-ms', type=float, default=300.0,
+                        help="fail if importing word_wizard takes longer than this")
+    parser.add_argument('--max-cli-ms', type=float, default=100.0,
+                        help="fail if `word-wizard stats` takes longer than this (median, whole process)")
+    parser.add_argument('--cli-runs', type=int, default=5, help="timed `word-wizard stats` runs")
+    parser.add_argument('--first-frame', action='store_true',
+                        help="also time window creation up to the first drawn frame (needs a display; "
+                             "uses the app's normal data directory)")
+    args = parser.parse_args()
+
+    modules = import_profile()
+    total_ms = modules.get('word_wizard', 0.0)
+    print(f"import word_wizard: {total_ms:.1f} ms")
+    for name, cumulative_ms in sorted(modules.items(), key=lambda item: -item[1])[1:11]:
+        print(f"  {name:<24} {cumulative_ms:8.1f} ms")
+
+    failures = []
+    deferred = sorted({name.split('.')[0] for name in modules} & set(DEFERRED_MODULES))
+    if deferred:
+        failures.append(f"imported at startup: {', '.join(deferred)}")
+    if total_ms > args.max_import_ms:
+        failures.append(f"import took {total_ms:.1f} ms (budget {args.max_import_ms:.0f} ms)")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        cli_modules = import_profile((LAUNCHER, 'stats', '--data-dir', data_dir))
+        cli_ms = statistics.median(cli_runs(data_dir, args.cli_runs))
+    print(f"word-wizard stats: {cli_ms:.1f} ms (median of {args.cli_runs}, including interpreter startup)")
+    cli_deferred = sorted({name.split('.')[0] for name in cli_modules} & {'tkinter', *DEFERRED_MODULES})
+    if cli_deferred:
+        failures.append(f"imported by terminal commands: {', '.join(cli_deferred)}")
+    if cli_ms > args.max_cli_ms:
+        failures.append(f"`word-wizard stats` took {cli_ms:.1f} ms (budget {args.max_cli_ms:.0f} ms)")
+
+    if args.first_frame:
+        print(f"time to first frame: {first_frame_ms():.1f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
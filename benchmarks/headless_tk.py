@@ -0,0 +1,126 @@
+# Word Wizard - Headless Tk stand-in for benchmarks
+# install(word_wizard) swaps the module's tk, ttk, tkfont, messagebox and filedialog for stand-ins that
+# accept every call the app makes without a display. after() callbacks are recorded but not run, dialogs
+# return immediately and fonts measure text with a fixed per-character width.
+
+import itertools
+import tkinter
+import types
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class Widget:
+    """Any Tk/ttk widget (or the root window): remembers its options and ignores everything else."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, *args, **options):
+        self._options = dict(options)
+        self.scheduled = []  # (delay ms, callback, args) passed to after(); only run if a benchmark does
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _noop
+
+    def config(self, *args, **options):
+        self._options.update(options)
+
+    configure = config
+
+    def cget(self, key):
+        return self._options.get(key)
+
+    def __getitem__(self, key):
+        return self._options.get(key)
+
+    def __setitem__(self, key, value):
+        self._options[key] = value
+
+    def after(self, ms, callback=None, *args):
+        self.scheduled.append((ms, callback, args))
+        return f"after#{next(self._ids)}"
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    def winfo_width(self):
+        return 800
+
+    def winfo_height(self):
+        return 600
+
+    def winfo_ismapped(self):
+        return True
+
+    def winfo_children(self):
+        return []
+
+    def _item(self, *args, **kwargs):
+        return next(self._ids)
+
+    create_text = create_rectangle = create_line = _item
+
+
+class Variable:
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    trace_add = _noop
+
+
+class Font:
+    """Measures text as 0.6 em per character, which is close enough for the fitter's search."""
+
+    def __init__(self, family=None, size=12, **options):
+        self.size = abs(size)
+
+    def measure(self, text):
+        return int(len(text) * self.size * 0.6)
+
+    def metrics(self, option=None):
+        metrics = {'ascent': self.size, 'descent': self.size // 4, 'linespace': int(self.size * 1.3), 'fixed': 0}
+        return metrics[option] if option else metrics
+
+
+class _WidgetModule(types.ModuleType):
+    """A module whose unknown attributes are all Widget classes."""
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Widget
+
+
+def _module(name, **attributes):
+    module = _WidgetModule(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def install(word_wizard):
+    """Point word_wizard's GUI modules at the stand-ins; returns a root window for WordWizardApp."""
+    word_wizard.tk = _module('tk', Tk=Widget, TclError=tkinter.TclError, StringVar=Variable, BooleanVar=Variable,
+                             IntVar=Variable, END='end')
+    word_wizard.ttk = _module('ttk')
+    word_wizard.tkfont = _module('tkfont', Font=Font)
+    word_wizard.messagebox = _module('messagebox', showinfo=_noop, showwarning=_noop, showerror=_noop,
+                                     askyesno=lambda *args, **kwargs: True)
+    word_wizard.filedialog = _module('filedialog', askopenfilename=lambda **kwargs: '',
+                                     asksaveasfilename=lambda **kwargs: '')
+    return Widget()
@@ -0,0 +1,97 @@
+# Word Wizard - profile tests
+# Run from the repository root with: python -m pytest tests
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core.cards import Card  # noqa: E402
+from word_wizard_core.compiled import compile_deck  # noqa: E402
+from word_wizard_core.profiles import PROFILES_DIR, open_profile, profile_dir  # noqa: E402
+
+BASE = [
+    {"german": "das Haus", "english": "house", "level": "A1", "category": "Noun", "gender": "das",
+     "examples": ["Das Haus ist groß."], "box": 1, "favorite": False},
+    {"german": "laufen", "english": "to run", "level": "A2", "category": "Verb", "gender": None,
+     "examples": ["Ich laufe jeden Tag.", "Er läuft schnell."], "box": 2, "favorite": False},
+] + [{"german": f"Wort {i}", "english": f"word {i}", "level": "B1", "category": "Adjective"} for i in range(20)]
+
+
+class OverlayProfileTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_path = tmp.name
+        self.base_file = os.path.join(self.data_path, 'german_flashcards.json')
+        with open(self.base_file, 'w', encoding='utf-8') as f:
+            json.dump(BASE, f, ensure_ascii=False)
+        self.assertEqual(compile_deck(self.base_file, os.path.splitext(self.base_file)[0] + '.wwdeck'), len(BASE))
+
+    def open(self, name):
+        deck = open_profile(self.data_path, name, self.base_file)
+        deck.load()
+        self.assertEqual(deck.storage.name, 'overlay')
+        return deck
+
+    def read_overlay(self, name):
+        with open(os.path.join(profile_dir(self.data_path, name), 'overlay.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_only_changes_are_stored(self):
+        deck = self.open('anna')
+        laufen = deck.index.get('laufen')
+        self.assertEqual(laufen.examples, ("Ich laufe jeden Tag.", "Er läuft schnell."))
+        deck.answer(laufen, True)
+        deck.set_favorite(deck.index.get('das Haus'), True)
+        deck.add(Card('neu', 'new', 'B2', 'Adjective'))
+        schedule = (laufen.box, laufen.due, laufen.interval)
+        deck.close()
+
+        overlay = self.read_overlay('anna')
+        self.assertEqual(overlay['cards'], {
+            'laufen': {'box': 3, 'due': schedule[1], 'interval': schedule[2]},
+            'das Haus': {'favorite': True},
+        })
+        self.assertEqual([card['german'] for card in overlay['added']], ['neu'])
+        # The base was read from the compiled deck next to it, not compiled again into the profiles cache
+        self.assertFalse(os.path.exists(os.path.join(self.data_path, PROFILES_DIR, 'base.wwdeck')))
+
+        deck = self.open('anna')
+        laufen = deck.index.get('laufen')
+        self.assertEqual((laufen.box, laufen.due, laufen.interval), schedule)
+        self.assertEqual((laufen.english, laufen.level, laufen.category), ('to run', 'A2', 'Verb'))
+        self.assertEqual(laufen.examples, ("Ich laufe jeden Tag.", "Er läuft schnell."))
+        self.assertTrue(deck.index.get('das Haus').favorite)
+        self.assertEqual(deck.index.get('neu').level, 'B2')
+        self.assertEqual(len(deck), len(BASE) + 1)
+        self.assertEqual(deck.stats.data['correct'], 1)
+        deck.close()
+        self.assertEqual(self.read_overlay('anna')['cards'].keys(), {'laufen', 'das Haus'})
+
+        # Another profile still sees the untouched base deck
+        deck = self.open('ben')
+        self.assertEqual((deck.index.get('laufen').box, deck.index.get('das Haus').favorite), (2, False))
+        self.assertNotIn('neu', deck.index)
+        deck.close()
+        self.assertEqual(self.read_overlay('ben')['cards'], {})
+        with open(self.base_file, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), BASE)
+
+    def test_unsaved_changes_are_replayed_from_the_journal(self):
+        deck = self.open('anna')
+        deck.answer(deck.index.get('laufen'), False)
+        deck.close(save=False)
+        self.assertFalse(os.path.exists(os.path.join(profile_dir(self.data_path, 'anna'), 'overlay.json')))
+
+        deck = self.open('anna')
+        self.assertEqual(deck.index.get('laufen').box, 1)
+        deck.close()
+        self.assertEqual(self.read_overlay('anna')['cards']['laufen']['box'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Word Wizard - scheduler tests
+# Run from the repository root with: python -m pytest tests
+
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core.cards import Card  # noqa: E402
+from word_wizard_core.scheduler import Scheduler  # noqa: E402
+
+NOW = 1760000000
+
+
+def make_deck():
+    """10 overdue, 30 new and 10 upcoming cards, in that deck order."""
+    due = [Card(f"due {i}", due=NOW - 1000 * (i + 1)) for i in range(10)]
+    new = [Card(f"new {i}") for i in range(30)]
+    upcoming = [Card(f"upcoming {i}", due=NOW + 1000 * (i + 1)) for i in range(10)]
+    return due, new, upcoming
+
+
+class NextCardsTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+
+    def check_session(self, pick):
+        due, new, upcoming = make_deck()
+        scheduler = Scheduler(due + new + upcoming)
+        orders, new_cards = set(), set()
+        for _ in range(20):
+            session = pick(scheduler, due + new + upcoming)
+            self.assertEqual(len(session), 25)
+            # Priority between the groups is kept: every due card, then new cards, nothing upcoming
+            self.assertEqual(set(session[:10]), set(due))
+            self.assertTrue(all(card in new for card in session[10:]))
+            orders.add(tuple(card.german for card in session))
+            new_cards.update(session[10:])
+        self.assertGreater(len(orders), 1, "sessions always come in the same order")
+        self.assertGreater(len(new_cards), 15, "new cards are always taken from the top of the deck")
+
+    def test_heap(self):
+        self.check_session(lambda scheduler, cards: scheduler.next_cards(25, now=NOW))
+
+    def test_candidates(self):
+        self.check_session(lambda scheduler, cards: scheduler.next_cards(25, now=NOW, candidates=cards))
+
+    def test_upcoming_fill(self):
+        due, new, upcoming = make_deck()
+        for candidates in (None, due + new + upcoming):
+            session = Scheduler(due + new + upcoming).next_cards(45, now=NOW, candidates=candidates)
+            self.assertEqual(set(session[40:]), set(upcoming[:5]))
+
+    def test_new_cards_sampled_in_place(self):
+        """Reviewed cards come first and exactly the rest of the session is sampled from the new cards."""
+        for algorithm in Scheduler.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                cards = [Card(f"word {i}") for i in range(5000)]
+                scheduler = Scheduler(cards, algorithm=algorithm)
+                reviewed = cards[::500]
+                for i, card in enumerate(reviewed):
+                    scheduler.review(card, correct=i % 2 == 0, now=NOW)
+                self.assertEqual(len(scheduler), len(cards))
+
+                later = NOW + 60 * Scheduler.DAY
+                with mock.patch('word_wizard_core.scheduler.random.sample', wraps=random.sample) as sample:
+                    session = scheduler.next_cards(25, now=later)
+                (population, count), _ = sample.call_args
+                self.assertIs(population, scheduler._new)  # Sampled in place, not copied per session
+                self.assertEqual(count, 25 - len(reviewed))
+                self.assertEqual(len(population), len(cards) - len(reviewed))
+
+                self.assertEqual(len(session), 25)
+                self.assertEqual(set(session[:len(reviewed)]), set(reviewed))
+                self.assertTrue(all(not card.due for card in session[len(reviewed):]))
+                self.assertEqual(len(set(session)), len(session))
+
+    def test_remove_keeps_new_cards_consistent(self):
+        cards = [Card(f"word {i}") for i in range(100)]
+        scheduler = Scheduler(cards)
+        for card in cards[::3]:
+            scheduler.remove(card)
+        scheduler.add(cards[0])
+        remaining = [card for card in cards if card not in cards[::3]] + [cards[0]]
+        self.assertEqual(sorted(card.german for card in scheduler.next_cards(100, now=NOW)),
+                         sorted(card.german for card in remaining))
+
+    def test_empty(self):
+        self.assertEqual(Scheduler().next_cards(5, now=NOW), [])
+        self.assertEqual(Scheduler(make_deck()[1]).next_cards(0, now=NOW), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
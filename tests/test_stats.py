@@ -0,0 +1,100 @@
+# Word Wizard - review log tests
+# Run from the repository root with: python -m pytest tests
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core.cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card  # noqa: E402
+from word_wizard_core.stats import ReviewLog, Stats, _load_numpy  # noqa: E402
+
+START = 1750000000  # Unix time of the first review
+DAY = 86400
+
+
+class ReviewLogTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'review_events.bin')
+        levels, categories = ('',) + ALLOWED_LEVELS, ('',) + ALLOWED_CATEGORIES
+        self.cards = {f"Wort {i}": Card(f"Wort {i}", level=levels[i % len(levels)],
+                                        category=categories[i % len(categories)]) for i in range(40)}
+
+    def write_history(self, events=3000):
+        """Reviews over about 200 days with gaps, including a word no longer in the deck."""
+        rng = random.Random(5)
+        words = list(self.cards) + ['gelöscht']
+        boxes = dict.fromkeys(words, 1)
+        log = ReviewLog(self.path)
+        timestamp = START
+        for _ in range(events):
+            timestamp += rng.choice((60, 600, DAY // 3, DAY, 3 * DAY)) if rng.random() < 0.1 else 30
+            word = rng.choice(words)
+            correct = rng.random() < 0.7
+            box_before = boxes[word]
+            boxes[word] = min(box_before + 1, 5) if correct else max(box_before - 1, 1)
+            log.append(word, timestamp, correct, box_before, boxes[word], rng.randrange(4000))
+        log.close()
+        return boxes
+
+    def replay(self, use_numpy):
+        log = ReviewLog(self.path)
+        try:
+            return log.replay(self.cards, use_numpy=use_numpy)
+        finally:
+            log.close()
+
+    @unittest.skipIf(_load_numpy() is None, "NumPy is not installed")
+    def test_numpy_and_python_replay_agree(self):
+        boxes = self.write_history()
+        stats, replayed_boxes = self.replay(use_numpy=True)
+        self.assertEqual(replayed_boxes, boxes)
+        self.assertEqual(stats['total_reviews'], 3000)
+        self.assertTrue(1 < len(stats['daily']) <= Stats.WINDOW_DAYS)  # Older days are pruned
+        self.assertEqual(self.replay(use_numpy=False), (stats, replayed_boxes))
+        with mock.patch('word_wizard_core.stats._load_numpy', return_value=None):
+            self.assertEqual(self.replay(use_numpy=True), (stats, replayed_boxes))
+
+    def test_empty_log(self):
+        for use_numpy in (True, False):
+            with self.subTest(use_numpy=use_numpy):
+                stats, boxes = self.replay(use_numpy)
+                self.assertEqual((stats['total_reviews'], boxes), (0, {}))
+
+    def test_torn_final_record(self):
+        self.write_history(events=500)
+        expected = self.replay(use_numpy=False)
+        with open(self.path, 'ab') as f:
+            f.write(ReviewLog.RECORD.pack(0, START, 0, 1, 1, 2, 0)[:11])
+        with open(os.path.splitext(self.path)[0] + '.words', 'a', encoding='utf-8') as f:
+            f.write("halb geschrie")
+
+        log = ReviewLog(self.path)
+        self.assertEqual(len(log), 500)
+        self.assertNotIn("halb geschrie", log.words)
+        for use_numpy in (True, False):
+            with self.subTest(use_numpy=use_numpy):
+                self.assertEqual(log.replay(self.cards, use_numpy=use_numpy), expected)
+
+        # Appending drops the torn tails first, so the new record and word line up
+        log.append("neu", START + 400 * DAY, False, 3, 2)
+        log.close()
+        log = ReviewLog(self.path)
+        self.assertEqual(len(log), 501)
+        self.assertEqual(log.words[-1], "neu")
+        for use_numpy in (True, False):
+            with self.subTest(use_numpy=use_numpy):
+                stats, boxes = log.replay(self.cards, use_numpy=use_numpy)
+                self.assertEqual((boxes["neu"], stats['difficult_words']["neu"]), (2, 1))
+                self.assertEqual(stats['total_reviews'], 501)
+        log.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
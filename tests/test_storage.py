@@ -0,0 +1,280 @@
+# Word Wizard - storage tests
+# Run from the repository root with: python -m pytest tests
+
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core import cli  # noqa: E402
+from word_wizard_core.cards import Card  # noqa: E402
+from word_wizard_core.deck import Deck  # noqa: E402
+from word_wizard_core.storage import ReviewJournal, SqliteStorage, iter_json_array  # noqa: E402
+
+# Schedules and extra keys put floats and exponents (in both cases and signs) at every position in an element
+DECK = [
+    {"german": "das Haus", "english": "house", "level": "A1", "category": "Noun", "gender": "das",
+     "examples": ["Das Haus ist groß."], "box": 2, "favorite": False, "due": 1760000000, "interval": 3,
+     "ease": 2.5},
+    {"german": "laufen", "english": "to run", "level": "A2", "category": "Verb", "gender": None, "examples": [],
+     "box": 1, "favorite": True, "due": 1760086400, "interval": 12, "ease": 1.3000000000000003,
+     "weight": -1.5e10, "score": 2.25E-3, "ratio": 1e+21},
+    {"german": "schnell", "ease": -0.125, "values": [1.5, -2e-7, 0, 10, 3.14159]},
+]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def test_numbers_across_chunk_boundaries(self):
+        for text in (json.dumps(DECK), json.dumps(DECK, indent=2), '[1.5]', '[-1.5e10]', '[ 1 , 2.25E-3 ]'):
+            expected = json.loads(text)
+            for chunk_size in range(1, 65):
+                with self.subTest(text=text[:20], chunk_size=chunk_size):
+                    self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), expected)
+
+    def test_empty_array(self):
+        for chunk_size in (1, 2, 3):
+            self.assertEqual(list(iter_json_array(io.StringIO(' [ ] '), chunk_size)), [])
+
+    def test_malformed(self):
+        for text in ('[1 2]', '[1.]', '[1,]', '[{"a": 1}', '[1] 2'):
+            for chunk_size in (1, 2, 3, 1 << 16):
+                with self.subTest(text=text, chunk_size=chunk_size), self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(io.StringIO(text), chunk_size))
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"german": "das Haus"}')))
+
+
+
+class StorageTestCase(unittest.TestCase):
+    """A temporary data and config directory with the JSON deck written to it."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data_dir = os.path.join(self.tmp.name, 'data')
+        self.config_dir = os.path.join(self.tmp.name, 'config')
+        os.makedirs(self.data_dir)
+        os.makedirs(self.config_dir)
+        # Decks under 1000 bytes are rejected as truncated, so pad the two real cards
+        self.cards = DECK[:2] + [{"german": f"Wort {i}", "english": f"word {i}"} for i in range(20)]
+        self.write_json(os.path.join(self.data_dir, 'german_flashcards.json'), self.cards)
+
+    def write_json(self, path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def open_deck(self, **config):
+        self.write_json(os.path.join(self.config_dir, 'config.json'), config)
+        deck = Deck(self.data_dir, self.config_dir)
+        deck.load()
+        return deck
+
+
+class JournalTest(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.journal_file = os.path.join(self.data_dir, 'journal.jsonl')
+        self.open_deck().close()  # Standardize the deck so later loads have nothing to rewrite
+
+    def read_journal(self):
+        with open(self.journal_file, encoding='utf-8') as f:
+            return f.read()
+
+    def make_changes(self):
+        deck = self.open_deck()
+        deck.answer(deck.index.get('laufen'), False)
+        deck.set_favorite(deck.index.get('das Haus'), True)
+        deck.update_config(max_cards=7)
+        deck.add(Card('neu', 'new', 'B1', 'Adjective'))
+        deck.close(save=False)  # As after a crash: the changes are only in the journal
+
+    def test_changes_are_appended_and_replayed(self):
+        self.make_changes()
+        entries = [json.loads(line) for line in self.read_journal().splitlines()]
+        self.assertEqual([(entry['op'], entry['seq']) for entry in entries],
+                         [('review', 1), ('favorite', 2), ('config', 3), ('add', 4)])
+        with open(os.path.join(self.data_dir, 'german_flashcards.json'), encoding='utf-8') as f:
+            self.assertNotIn('neu', {record['german'] for record in json.load(f)})
+
+        deck = self.open_deck()
+        self.assertEqual((deck.index.get('laufen').box, deck.index.get('laufen').favorite), (1, True))
+        self.assertTrue(deck.index.get('das Haus').favorite)
+        self.assertEqual(deck.user_config['max_cards'], 7)
+        self.assertEqual(deck.index.get('neu').level, 'B1')
+        self.assertEqual((deck.stats.data['incorrect'], deck.stats.data['difficult_words']), (1, {'laufen': 1}))
+        self.assertEqual(deck.journal_seq, 4)
+        deck.close()  # Replayed changes are compacted into the files
+
+        self.assertEqual(self.read_journal(), '')
+        deck = self.open_deck()
+        self.assertEqual((deck.stats.data['incorrect'], deck.stats.data['journal_seq']), (1, 4))
+        self.assertEqual(len(deck), len(self.cards) + 1)
+        deck.close(save=False)
+
+    def test_interrupted_compaction_is_not_counted_twice(self):
+        self.make_changes()
+        journal = self.read_journal()
+        self.open_deck().close()
+        # The files were written but the journal was never truncated
+        with open(self.journal_file, 'w', encoding='utf-8') as f:
+            f.write(journal)
+
+        deck = self.open_deck()
+        self.assertEqual(deck.stats.data['incorrect'], 1)
+        self.assertEqual(deck.stats.data['total_reviews'], 1)
+        self.assertEqual(deck.stats.lifetime('by_box', '1'), (0, 1))
+        self.assertEqual(len(deck), len(self.cards) + 1)
+
+        # Later changes continue the sequence, so they are replayed
+        deck.answer(deck.index.get('laufen'), True)
+        deck.close(save=False)
+        deck = self.open_deck()
+        self.assertEqual((deck.stats.data['correct'], deck.stats.data['incorrect']), (1, 1))
+        self.assertEqual(deck.index.get('laufen').box, 2)
+        deck.close(save=False)
+
+    def test_truncated_last_line_is_skipped(self):
+        self.make_changes()
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"op": "review", "german": "das Haus", "corr')
+        self.assertEqual(len(ReviewJournal(self.journal_file).read_entries()), 4)
+
+        deck = self.open_deck()
+        self.assertEqual(deck.journal_seq, 4)
+        self.assertEqual(deck.stats.data['total_reviews'], 1)
+        self.assertEqual(deck.index.get('das Haus').box, 2)
+        deck.close()
+        self.assertEqual(self.read_journal(), '')
+
+
+class SqliteStorageTest(StorageTestCase):
+    def query(self, sql, *params):
+        with sqlite3.connect(os.path.join(self.data_dir, 'word_wizard.db')) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def test_seeded_from_json(self):
+        deck = self.open_deck(storage_backend='sqlite')
+        self.assertEqual(deck.storage.name, 'sqlite')
+        self.assertEqual([card.german for card in deck.flashcards], [record['german'] for record in self.cards])
+        deck.close()
+        self.assertEqual(self.query("SELECT german, box, due, interval, ease FROM cards ORDER BY rowid LIMIT 2"),
+                         [('das Haus', 2, 1760000000, 3, 2.5), ('laufen', 1, 1760086400, 12, 1.3000000000000003)])
+        self.assertEqual(self.query("SELECT value FROM config WHERE key = 'storage_backend'"), [('"sqlite"',)])
+
+        # Read back from the database now; the JSON deck is no longer consulted
+        os.remove(os.path.join(self.data_dir, 'german_flashcards.json'))
+        deck = self.open_deck(storage_backend='sqlite')
+        self.assertEqual([card.to_dict() for card in deck.flashcards],
+                         [Card.from_dict(record)[0].to_dict() for record in self.cards])
+        deck.close(save=False)
+
+    def test_answer_updates_one_row_and_inserts_an_event(self):
+        self.open_deck(storage_backend='sqlite').close()
+        deck = self.open_deck(storage_backend='sqlite')
+        card = deck.index.get('laufen')
+        deck.answer(card, True)
+        deck.set_favorite(card, False)
+        deck.close(save=False)  # Only the per-change writes, no full save
+
+        self.assertEqual(self.query("SELECT box, favorite, due FROM cards WHERE german = 'laufen'"),
+                         [(2, 0, card.due)])
+        self.assertEqual(self.query("SELECT box FROM cards WHERE german = 'das Haus'"), [(2,)])
+        self.assertEqual(self.query("SELECT german, correct, box FROM review_events"), [('laufen', 1, 2)])
+        self.assertEqual(self.query("SELECT correct, incorrect FROM stats WHERE scope = 'total'"), [(1, 0)])
+        self.assertEqual(self.query("SELECT value FROM meta WHERE key = 'journal_seq'"), [('2',)])
+
+        deck = self.open_deck(storage_backend='sqlite')
+        self.assertEqual(deck.index.get('laufen').box, 2)
+        self.assertEqual(deck.stats.data['correct'], 1)
+        deck.close(save=False)
+
+    def test_changes_already_saved_are_skipped(self):
+        storage = SqliteStorage(os.path.join(self.data_dir, 'word_wizard.db'))
+        self.addCleanup(storage.close)
+        storage.save_all([Card('laufen')], {'journal_seq': 3}, {})
+        storage.record_change({'op': 'favorite', 'german': 'laufen', 'favorite': True, 'seq': 3})
+        self.assertFalse(storage.load()[0][0].favorite)
+        storage.record_change({'op': 'favorite', 'german': 'laufen', 'favorite': True, 'seq': 4})
+        self.assertTrue(storage.load()[0][0].favorite)
+
+    def test_migrates_cards_without_schedule_columns(self):
+        with sqlite3.connect(os.path.join(self.data_dir, 'word_wizard.db')) as conn:
+            conn.execute("CREATE TABLE cards (german TEXT PRIMARY KEY, english TEXT NOT NULL DEFAULT '', "
+                         "level TEXT NOT NULL DEFAULT '', category TEXT NOT NULL DEFAULT '', gender TEXT, "
+                         "examples TEXT NOT NULL DEFAULT '[]', box INTEGER NOT NULL DEFAULT 1, "
+                         "favorite INTEGER NOT NULL DEFAULT 0, extra TEXT)")
+            conn.execute("INSERT INTO cards (german, english, level, box) VALUES ('gehen', 'to go', 'A1', 3)")
+        conn.close()
+
+        storage = SqliteStorage(os.path.join(self.data_dir, 'word_wizard.db'))
+        self.addCleanup(storage.close)
+        card = storage.load()[0][0]
+        self.assertEqual((card.german, card.level, card.box), ('gehen', 'A1', 3))
+        self.assertEqual((card.due, card.interval, card.ease), (0, 0, 2.5))
+        columns = [row[1] for row in self.query("PRAGMA table_info(cards)")]
+        self.assertEqual(columns[-3:], ['due', 'interval', 'ease'])
+
+        storage.record_change({'op': 'review', 'german': 'gehen', 'correct': True, 'box': 4, 'date': '2025-01-02',
+                               'streak': 1, 'due': 1760000000, 'interval': 8, 'ease': 2.5, 'seq': 1})
+        self.assertEqual(self.query("SELECT box, due, interval FROM cards"), [(4, 1760000000, 8)])
+
+
+
+class ReadOnlyDeckTest(StorageTestCase):
+    def snapshot_files(self):
+        files = {}
+        for directory in (self.data_dir, self.config_dir):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.path.isfile(path):
+                    with open(path, 'rb') as f:
+                        files[path] = f.read()
+        return files
+
+    def run_cli(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(cli.main([*argv, '--data-dir', self.tmp.name]), 0)
+        return output.getvalue()
+
+    def test_stats_and_export_replay_without_writing(self):
+        for backend in ('json', 'sqlite'):
+            with self.subTest(backend=backend):
+                self.open_deck(storage_backend=backend).close()
+                deck = self.open_deck(storage_backend=backend)
+                deck.answer(deck.index.get('laufen'), True)
+                deck.close(save=False)  # The answer is pending in the journal or database only
+                before = self.snapshot_files()
+
+                summary = json.loads(self.run_cli('stats', '--json'))
+                self.assertEqual((summary['correct'], summary['boxes']['2']), (1, 2))
+                export_file = os.path.join(self.tmp.name, 'export.jsonl')
+                self.run_cli('export', export_file)
+                with open(export_file, encoding='utf-8') as f:
+                    exported = {record['german']: record for record in map(json.loads, f)}
+                self.assertEqual(exported['laufen']['box'], 2)
+                self.assertEqual(self.snapshot_files(), before)
+
+    def test_missing_files_are_not_created(self):
+        os.remove(os.path.join(self.data_dir, 'german_flashcards.json'))
+        system_file = os.path.join(self.tmp.name, 'shipped.json')
+        self.write_json(system_file, self.cards)
+        deck = Deck(self.data_dir, self.config_dir, system_vocab_file=system_file, read_only=True)
+        deck.load()
+        self.assertEqual(len(deck), len(self.cards))
+        deck.answer(deck.index.get('laufen'), False)
+        deck.set_favorite(deck.index.get('laufen'), True)
+        deck.close()
+        self.assertEqual(self.snapshot_files(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
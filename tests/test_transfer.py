@@ -0,0 +1,57 @@
+# Word Wizard - import/export tests
+# Run from the repository root with: python -m pytest tests
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'usr', 'share', 'word-wizard'))
+
+from word_wizard_core import Card  # noqa: E402
+from word_wizard_core.transfer import _EXTENSIONS, read_cards, write_cards  # noqa: E402
+
+CARDS = [
+    Card("das Haus", "house", "A1", "Noun", "das", ("Das Haus ist groß.", "Wir <lieben> \"unser\" Haus & mehr."), 2,
+         True, due=1760000000, interval=3, ease=2.36),
+    Card("laufen", "to run, to walk", "A2", "Verb", None, (), 1, False),
+    Card("Tab\tund, Komma", "", "", "", None, ("Nur ein Beispiel; mit Semikolon.",), 5, False),
+    Card("schön", "beautiful", "B1", "Adjective", None, ("Ein schöner Tag.",), 3, False, due=1760086400, interval=12,
+         ease=1.3),
+]
+
+# What each format carries; everything else comes back with its default
+FIELDS = {
+    'json': Card.FIELDS + Card.SCHEDULE_FIELDS,
+    'jsonl': Card.FIELDS + Card.SCHEDULE_FIELDS,
+    'csv': Card.FIELDS + Card.SCHEDULE_FIELDS,
+    'tsv': Card.FIELDS + Card.SCHEDULE_FIELDS,
+    'anki': ('german', 'english', 'level', 'category', 'examples', 'favorite'),
+}
+
+
+class RoundTripTest(unittest.TestCase):
+    def assertRoundTrip(self, filename, fields):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, filename)
+            self.assertEqual(write_cards(path, CARDS).written, len(CARDS))
+            imported = [card for batch in read_cards(path) for card in batch]
+        self.assertEqual([card.german for card in imported], [card.german for card in CARDS])
+        for original, card in zip(CARDS, imported):
+            for field in fields:
+                self.assertEqual(getattr(card, field), getattr(original, field), f"{filename}: {field}")
+
+    def test_every_extension(self):
+        for extension, fmt in _EXTENSIONS.items():
+            with self.subTest(extension=extension):
+                self.assertRoundTrip(f"deck{extension}", FIELDS[fmt])
+
+    def test_compressed(self):
+        for extension, fmt in _EXTENSIONS.items():
+            for compression in ('.gz', '.bz2', '.xz'):
+                with self.subTest(extension=extension, compression=compression):
+                    self.assertRoundTrip(f"deck{extension}{compression}", FIELDS[fmt])
+
+
+if __name__ == '__main__':
+    unittest.main()
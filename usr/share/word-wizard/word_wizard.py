@@ -1,14 +1,22 @@
-from typing import Dict, Any, Optional, List
-import json
-import shutil
-import sys, os, pygame
+from typing import Dict, Any, Optional, List, Callable
+import bisect
+import functools
+import queue
+import threading
+import time
+import sys, os
 import random
 import tkinter as tk
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime
 from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import logging
 
+from word_wizard_core import (ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card, Deck, ExportProgress, ImportProgress, Session,
+                              atomic_write_json, list_profiles, open_profile, profile_name, read_cards)
+from word_wizard_core.transfer import detect_format
+
 # Set up logging (Linux)
 log_dir = os.path.expanduser("~/.word_wizard")
 if not os.path.exists(log_dir):
@@ -22,8 +30,483 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+
+pygame = None  # Imported on first use by _load_pygame(), off the startup path
+
+# Export screen choices: label -> (format, file extension) and label -> (compression, extra extension)
+EXPORT_FORMAT_CHOICES = {"JSON": ('json', '.json'), "JSON Lines": ('jsonl', '.jsonl'), "CSV": ('csv', '.csv'),
+                         "TSV": ('tsv', '.tsv'), "Anki notes": ('anki', '.txt')}
+EXPORT_COMPRESSION_CHOICES = {"None": (None, ''), "gzip": ('gzip', '.gz'), "bzip2": ('bz2', '.bz2'),
+                              "xz": ('xz', '.xz'), "zstd": ('zstd', '.zst')}
+
+
+def _load_pygame():
+    """Import pygame on demand; its import and mixer setup cost more than drawing the first window."""
+    global pygame
+    if pygame is None:
+        import pygame as pygame_module
+        pygame = pygame_module
+    return pygame
+
+
+def _load_matplotlib_figure():
+    """Import matplotlib's Figure on demand (no GUI backend). Returns None when matplotlib is not installed."""
+    try:
+        from matplotlib.figure import Figure
+    except ImportError as e:
+        logging.warning(f"matplotlib unavailable: {str(e)}")
+        return None
+    return Figure
+
+
+class SoundBank:
+    """The app's sound effects, decoded once and played on reserved mixer channels.
+
+    Importing pygame, opening the mixer and decoding happen on a background thread via load_async(); play()
+    only hands an already decoded Sound to its own channel, so a click never touches the disk, and skips
+    sounds requested before loading has finished. If audio cannot be set up, the error is kept and re-raised
+    by play() so the app can turn sound off.
+    """
+
+    SOUNDS = {'click': 'click.wav', 'correct': 'correct.wav', 'incorrect': 'incorrect.wav', 'streak': 'streak.wav'}
+
+    def __init__(self, sounds_dir: str, latency: Optional['LatencyMonitor'] = None) -> None:
+        self.sounds_dir = sounds_dir
+        self.latency = latency  # play() latency is recorded here as sound.<name>
+        self._sounds: Dict[str, Any] = {}
+        self._channels: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._loading = False
+        self._loaded = False
+        self.error: Optional[Exception] = None
+        self.load_ms: Optional[float] = None
+
+    def load(self) -> None:
+        """Open the mixer, decode every sound and reserve one channel per sound.
+
+        Raises ImportError, FileNotFoundError or pygame.error, also on later calls once loading has failed.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            if self.error is not None:
+                raise self.error
+            try:
+                self._load()
+            except Exception as e:
+                self.error = e
+                raise
+        logging.info(f"Loaded {len(self._sounds)} sounds in {self.load_ms:.1f} ms")
+
+    def _load(self) -> None:
+        start = time.perf_counter()
+        _load_pygame()
+        import platform
+        if platform.system() == "Windows":
+            os.environ['SDL_AUDIODRIVER'] = 'directsound'
+        else:
+            os.environ['SDL_AUDIODRIVER'] = 'pulseaudio' if 'pulseaudio' in os.environ.get('SDL_AUDIODRIVER',
+                                                                                           '').lower() else 'alsa'
+        if not pygame.mixer.get_init():
+            pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=512)
+            pygame.mixer.init()
+            if pygame.mixer.get_num_channels() == 0:
+                raise pygame.error("No audio channels detected")
+        for name, file_name in self.SOUNDS.items():
+            sound_file = os.path.join(self.sounds_dir, file_name)
+            if not os.path.exists(sound_file):
+                raise FileNotFoundError(sound_file)
+            sound = pygame.mixer.Sound(sound_file)
+            sound.set_volume(1.0)
+            self._sounds[name] = sound
+        # Reserved channels are never handed out by Sound.play(), so our effects cannot be starved
+        pygame.mixer.set_reserved(len(self.SOUNDS))
+        self._channels = {name: pygame.mixer.Channel(i) for i, name in enumerate(self.SOUNDS)}
+        self._loaded = True
+        self.load_ms = (time.perf_counter() - start) * 1000
+
+    def load_async(self) -> None:
+        """Set up audio on a background thread; failures are logged and surface again on first play()."""
+        if self._loading:
+            return
+        self._loading = True
+
+        def run():
+            try:
+                self.load()
+            except Exception as e:
+                logging.error(f"Background sound loading failed: {str(e)}")
+
+        threading.Thread(target=run, name="word-wizard-sounds", daemon=True).start()
+
+    def play(self, name: str):
+        """Play a sound on its reserved channel, restarting it if it is still playing. Returns the channel.
+
+        Until the background load has finished the sound is skipped (and loading started if it was not yet),
+        so the Tk thread never waits for the mixer; returns None then.
+        """
+        start = time.perf_counter()
+        if not self._loaded:
+            if self.error is not None:
+                raise self.error
+            self.load_async()
+            logging.debug(f"Sounds still loading; skipped {name}")
+            return None
+        channel = self._channels[name]
+        channel.play(self._sounds[name])
+        if self.latency is not None:
+            self.latency.record(f'sound.{name}', (time.perf_counter() - start) * 1000)
+        return channel
+
+
+class TextFitter:
+    """Finds the largest font size at which text wraps into at most max_lines lines of wraplength pixels.
+
+    Word widths are measured once per (family, size) and lines are summed from them, the font size is
+    binary-searched, and whole results are kept in an LRU keyed by (text, wraplength, max_lines, max_size).
+    """
+
+    def __init__(self, family: str = "Segoe UI", min_size: int = 8, cache_size: int = 1024) -> None:
+        self.family = family
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self._fonts: Dict[int, tkfont.Font] = {}
+        self._widths: Dict[tuple, Dict[str, int]] = {}  # (family, size) -> {word: pixels}
+        self._fits: OrderedDict = OrderedDict()
+
+    def _width(self, word: str, size: int) -> int:
+        widths = self._widths.setdefault((self.family, size), {})
+        width = widths.get(word)
+        if width is None:
+            font = self._fonts.get(size)
+            if font is None:
+                font = self._fonts[size] = tkfont.Font(family=self.family, size=size)
+            width = widths[word] = font.measure(word)
+        return width
+
+    def line_count(self, text: str, size: int, wraplength: int) -> int:
+        """Number of lines the greedy word wrap produces at the given size."""
+        space = self._width(" ", size)
+        lines = 0
+        line_width = 0
+        for word in text.split():
+            word_width = self._width(word, size) + space
+            if line_width + word_width <= wraplength:
+                line_width += word_width
+            else:
+                lines += 1
+                line_width = word_width
+        return lines + (1 if line_width else 0)
+
+    def fit(self, text: str, max_size: int, wraplength: int, max_lines: int = 2) -> int:
+        """Largest size <= max_size (but not below min_size) at which text fits in max_lines lines."""
+        if not text or max_size <= self.min_size:
+            return max_size
+        key = (text, wraplength, max_lines, max_size)
+        size = self._fits.get(key)
+        if size is not None:
+            self._fits.move_to_end(key)
+            return size
+        low, high = self.min_size, max_size  # Invariant: every size above high is too large
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.line_count(text, middle, wraplength) <= max_lines:
+                low = middle
+            else:
+                high = middle - 1
+        self._fits[key] = low
+        if len(self._fits) > self.cache_size:
+            self._fits.popitem(last=False)
+        return low
+
+
+class Animator:
+    """Color fades for Tk widgets, all advanced by one shared after() frame clock.
+
+    Fg->bg color ramps are computed once per (fg, bg, steps) and reused; the clock only runs while at least
+    one fade is active. Starting a fade on a widget replaces its running one, and fades on destroyed
+    widgets are dropped. on_frame, if set, is called with the milliseconds since the previous frame.
+    """
+
+    def __init__(self, master, frame_ms: int = 16) -> None:
+        self.master = master
+        self.frame_ms = frame_ms
+        self._ramps: Dict[tuple, tuple] = {}
+        self._fades: Dict[Any, list] = {}  # widget -> [ramp, first, current and last index, step ms, start time]
+        self._after_id = None
+        self._last_frame = 0.0
+        self.on_frame: Optional[Callable[[float], None]] = None
+
+    def ramp(self, fg: str, bg: str, steps: int) -> tuple:
+        """Colors from bg (index 0) to fg (index steps), inclusive."""
+        key = (fg, bg, steps)
+        colors = self._ramps.get(key)
+        if colors is None:
+            fg_rgb = [int(fg[i:i + 2], 16) for i in (1, 3, 5)]
+            bg_rgb = [int(bg[i:i + 2], 16) for i in (1, 3, 5)]
+            colors = tuple(
+                '#' + ''.join(f'{int(b + (f - b) * step / steps):02x}' for f, b in zip(fg_rgb, bg_rgb))
+                for step in range(steps)) + (fg,)
+            self._ramps[key] = colors
+        return colors
+
+    def fade(self, widget, fg: str, bg: str, start_ratio: float, end_ratio: float, steps: int = 10,
+             duration_ms: int = 50) -> None:
+        """Move widget's foreground along the fg/bg ramp from start_ratio to end_ratio over duration_ms."""
+        steps = max(1, steps)
+        colors = self.ramp(fg, bg, steps)
+        first, last = round(start_ratio * steps), round(end_ratio * steps)
+        step_ms = max(1, duration_ms // steps)
+        self._fades[widget] = [colors, first, first, last, step_ms, time.perf_counter()]
+        self._apply(widget, colors[first])
+        if self._after_id is None:
+            self._last_frame = time.perf_counter()
+            self._after_id = self.master.after(self.frame_ms, self._tick)
+
+    def cancel(self, widget=None) -> None:
+        """Stop the fade on widget, or all fades; the widget keeps its current color."""
+        if widget is None:
+            self._fades.clear()
+        else:
+            self._fades.pop(widget, None)
+        if not self._fades and self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _apply(self, widget, color: str) -> bool:
+        try:
+            widget.config(foreground=color)
+            return True
+        except tk.TclError:
+            self._fades.pop(widget, None)  # Widget was destroyed mid-fade
+            return False
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        if self.on_frame:
+            self.on_frame((now - self._last_frame) * 1000)
+        self._last_frame = now
+        for widget, fade in list(self._fades.items()):
+            colors, first, current, last, step_ms, started = fade
+            elapsed_steps = int((now - started) * 1000 / step_ms)
+            index = min(first + elapsed_steps, last) if last >= first else max(first - elapsed_steps, last)
+            if index == current:
+                continue  # Between steps: nothing to redraw this frame
+            fade[2] = index
+            if self._apply(widget, colors[index]) and index == last:
+                del self._fades[widget]
+        self._after_id = self.master.after(self.frame_ms, self._tick) if self._fades else None
+
+
+class BarChart:
+    """A titled bar chart drawn on a region of a shared tk.Canvas.
+
+    update() only moves and relabels the bars whose values changed; the chart is laid out again only
+    when its labels, its scale or its region change.
+    """
+
+    BAR_COLORS = ('#4CAF50', '#81C784', '#FFB300', '#FF5722', '#0288D1')
+
+    def __init__(self, canvas: tk.Canvas, title: str, max_value: Optional[float] = None, value_format: str = "{:.0f}") -> None:
+        self.canvas = canvas
+        self.title = title
+        self.max_value = max_value  # Fixed scale (e.g. 100 for percentages), or None to fit the largest value
+        self.value_format = value_format
+        self.tag = f"chart{id(self)}"
+        self.bounds = (0, 0, 0, 0)
+        self.fg = '#333333'
+        self.series: List[tuple] = []
+        self._scale = 1.0
+        self._bars: List[tuple] = []  # (bar item, value text item) per series entry
+
+    def place(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        if (x0, y0, x1, y1) != self.bounds:
+            self.bounds = (x0, y0, x1, y1)
+            self._layout()
+
+    def set_foreground(self, fg: str) -> None:
+        if fg != self.fg:
+            self.fg = fg
+            self.canvas.itemconfig(f"{self.tag}&&text", fill=fg)
+
+    def update(self, series: List[tuple]) -> None:
+        """Show [(label, value)]; redraws only what changed."""
+        old_series, self.series = self.series, list(series)
+        if (len(self._bars) != len(self.series) or self._fit_scale() != self._scale
+                or [label for label, _ in old_series] != [label for label, _ in self.series]):
+            self._layout()
+            return
+        for i, ((_, old_value), (_, value)) in enumerate(zip(old_series, self.series)):
+            if value != old_value:
+                bar, value_text = self._bars[i]
+                x0, y0, x1, y1 = self._bar_box(i, value)
+                self.canvas.coords(bar, x0, y0, x1, y1)
+                self.canvas.coords(value_text, (x0 + x1) / 2, y0 - 2)
+                self.canvas.itemconfig(value_text, text=self.value_format.format(value))
+
+    def _fit_scale(self) -> float:
+        if self.max_value is not None:
+            return self.max_value
+        return max([value for _, value in self.series] + [1])
+
+    def _plot_area(self) -> tuple:
+        x0, y0, x1, y1 = self.bounds
+        return x0 + 6, y0 + 34, x1 - 6, y1 - 18
+
+    def _bar_box(self, i: int, value: float) -> tuple:
+        left, top, right, bottom = self._plot_area()
+        slot = (right - left) / max(1, len(self.series))
+        height = (bottom - top) * min(value, self._scale) / self._scale
+        return left + slot * i + slot * 0.15, bottom - height, left + slot * (i + 0.85), bottom
+
+    def _layout(self) -> None:
+        self.canvas.delete(self.tag)
+        self._bars = []
+        self._scale = self._fit_scale()
+        x0, y0, x1, y1 = self.bounds
+        if x1 - x0 < 20 or y1 - y0 < 60:
+            return  # Not enough room yet (e.g. before the canvas is mapped)
+        self.canvas.create_text((x0 + x1) / 2, y0 + 4, text=self.title, anchor="n", fill=self.fg,
+                                font=('Segoe UI', 10, 'bold'), tags=(self.tag, 'text'))
+        bottom = self._plot_area()[3]
+        for i, (label, value) in enumerate(self.series):
+            bx0, by0, bx1, by1 = self._bar_box(i, value)
+            bar = self.canvas.create_rectangle(bx0, by0, bx1, by1, width=0,
+                                               fill=self.BAR_COLORS[i % len(self.BAR_COLORS)], tags=(self.tag,))
+            value_text = self.canvas.create_text((bx0 + bx1) / 2, by0 - 2, text=self.value_format.format(value),
+                                                 anchor="s", fill=self.fg, font=('Segoe UI', 8),
+                                                 tags=(self.tag, 'text'))
+            self.canvas.create_text((bx0 + bx1) / 2, bottom + 2, text=label, anchor="n", fill=self.fg,
+                                    font=('Segoe UI', 8), tags=(self.tag, 'text'))
+            self._bars.append((bar, value_text))
+
+
+class LatencyMonitor:
+    """Latency histograms keyed by metric name, in milliseconds.
+
+    Samples fall into fixed, roughly logarithmic buckets so recording is O(1) and memory stays flat over
+    long sessions; percentiles are read back from the bucket counts (to bucket resolution). Samples also arrive
+    from the writer thread (io.perform_save), so the histograms are only touched under a lock.
+    """
+
+    BOUNDS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, list] = {}  # name -> [bucket counts, count, total ms, max ms]
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float) -> None:
+        bucket = bisect.bisect_left(self.BOUNDS_MS, ms)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [[0] * (len(self.BOUNDS_MS) + 1), 0, 0.0, 0.0]
+            histogram[0][bucket] += 1
+            histogram[1] += 1
+            histogram[2] += ms
+            histogram[3] = max(histogram[3], ms)
+
+    def _snapshot(self) -> Dict[str, list]:
+        """Consistent copy of all histograms, so readers never see a sample half recorded."""
+        with self._lock:
+            return {name: [list(counts), count, total, max_ms]
+                    for name, (counts, count, total, max_ms) in self._histograms.items()}
+
+    def percentile(self, name: str, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples (the max for the last bucket).
+
+        Returns 0.0 for a metric with no samples yet.
+        """
+        with self._lock:
+            if name not in self._histograms:
+                return 0.0
+            counts, count, total, max_ms = self._histograms[name]
+            histogram = [list(counts), count, total, max_ms]
+        return self._percentile(histogram, fraction)
+
+    def _percentile(self, histogram: list, fraction: float) -> float:
+        counts, count, _, max_ms = histogram
+        target, seen = fraction * count, 0
+        for bound, bucket in zip(self.BOUNDS_MS, counts):
+            seen += bucket
+            if seen >= target:
+                return min(bound, max_ms)
+        return max_ms
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """count, mean, p50, p95 and max per metric."""
+        return self._summarize(self._snapshot())
+
+    def _summarize(self, histograms: Dict[str, list]) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, histogram in sorted(histograms.items()):
+            _, count, total, max_ms = histogram
+            result[name] = {'count': count, 'mean': total / count, 'p50': self._percentile(histogram, 0.5),
+                            'p95': self._percentile(histogram, 0.95), 'max': max_ms}
+        return result
+
+    def report(self) -> str:
+        lines = [f"{name:<24} n={values['count']:<5} p50={values['p50']:.0f} p95={values['p95']:.0f} "
+                 f"max={values['max']:.0f} ms" for name, values in self.summary().items()]
+        return '\n'.join(lines) if lines else "no samples yet"
+
+    def export(self, path: str) -> None:
+        """Write summaries and raw bucket counts as JSON."""
+        histograms = self._snapshot()
+        data = {'bounds_ms': list(self.BOUNDS_MS), 'summary': self._summarize(histograms),
+                'buckets': {name: histogram[0] for name, histogram in sorted(histograms.items())}}
+        atomic_write_json(path, data, indent=2)
+
+
+def _timed(metric: str):
+    """Decorator for WordWizardApp methods: records each call's duration in self.latency under metric."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.latency.record(metric, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
+
+
+# Level at which log_timing writes to word_wizard.log; set from 'timing_log_level' in config.json
+timing_log_level = logging.INFO
+
+
+def set_timing_log_level(name: str) -> None:
+    """Set the log_timing level from a level name such as 'DEBUG' or 'INFO'."""
+    global timing_log_level
+    level = logging.getLevelName(str(name).upper())
+    if isinstance(level, int):
+        timing_log_level = level
+    else:
+        logging.warning(f"Unknown timing_log_level '{name}' in config; keeping {logging.getLevelName(timing_log_level)}")
+
+
+def log_timing(function):
+    """Decorator: log each call's duration to word_wizard.log at timing_log_level."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if logging.getLogger().isEnabledFor(timing_log_level):
+                logging.log(timing_log_level,
+                            f"{function.__qualname__} took {(time.perf_counter() - start) * 1000:.1f} ms")
+    return wrapper
+
+
 class WordWizardApp:
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, data_dir: Optional[str] = None, profile: Optional[str] = None) -> None:
+        """data_dir overrides where the data/, config/ and profiles/ directories live (default: beside the app).
+
+        profile selects a learner profile (see word_wizard_core.profiles); None is the shared full deck.
+        """
+        startup_start = time.perf_counter()
         self.star_btn = None
         self.progress_bar: Optional[ttk.Progressbar] = None
         self.progress_label: Optional[ttk.Label] = None
@@ -31,18 +514,17 @@ class WordWizardApp:
         self.correct_streak: int = 0
         self.master = master
         self.sound_enabled = True
-        self._initialize_pygame_mixer()
         self.master.title("")
         self.master.geometry(
             f"{int(self.master.winfo_screenwidth() * 0.35)}x{int(self.master.winfo_screenheight() * 0.45)}")
         self.master.minsize(int(self.master.winfo_screenwidth() * 0.35), int(self.master.winfo_screenheight() * 0.45))
 
-        self._fade_after_id = None
+        self.latency = LatencyMonitor()  # Hot-path and response timings, see show_latency_overlay()
+        self.animator = Animator(self.master)
+        self.animator.on_frame = lambda ms: self.latency.record('ui.frame_interval', ms)
 
         # Initialize variables with type hints
-        self.current_card: Optional[Dict[str, Any]] = None
-        self.current_card_idx: int = 0
-        self.review_cards: List[Dict[str, Any]] = []
+        self.current_card: Optional[Card] = None
         self.card_front: bool = True
         self.feedback_given: bool = False
         self.session_start_time: Optional[datetime] = None
@@ -51,9 +533,10 @@ class WordWizardApp:
         self.keyboard_enabled: bool = True
         self.max_cards: int = 20
         self.transition_delay: int = 500
-        self.save_pending = False
+        self.save_debounce_ms: int = 1000
         self._resize_after_id = None
-        self._save_scheduled = False
+        self.text_fitter = TextFitter("Segoe UI")
+        self.prefit_cards: int = 5  # Upcoming session cards whose font sizes are computed ahead of time
 
         # Tkinter variables
         self.status_var: tk.StringVar = tk.StringVar()
@@ -70,18 +553,8 @@ class WordWizardApp:
 
         # Data structures
         self.entry_vars: Dict[str, tk.StringVar] = {}
-        self.flashcards: List[Dict[str, Any]] = []
-        self.stats: Dict[str, Any] = {
-            'total_reviews': 0,
-            'correct': 0,
-            'incorrect': 0,
-            'streak': 0,
-            'last_review_date': None,
-            'by_level': defaultdict(lambda: {'correct': 0, 'incorrect': 0}),
-            'by_category': defaultdict(lambda: {'correct': 0, 'incorrect': 0}),
-            'difficult_words': defaultdict(int)
-        }
-        self.user_config: Dict[str, Any] = {}
+        self.deck: Optional[Deck] = None  # Cards, schedule, stats, config and storage; created with the paths below
+        self.session: Optional[Session] = None
 
         # UI theme variables
         self.style: ttk.Style = ttk.Style()
@@ -105,6 +578,8 @@ class WordWizardApp:
             'incorrect': '#EF5350',
             'streak_bg': '#66BB6A'
         }
+        for colors in (self.light_colors, self.dark_colors):
+            self.animator.ramp(colors['fg'], colors['bg'], 10)  # The fade ramps every card transition uses
 
         # App data paths
         if getattr(sys, 'frozen', False):
@@ -113,33 +588,23 @@ class WordWizardApp:
         else:
             resource_path = os.path.dirname(os.path.abspath(__file__))
             data_path = resource_path
+        if data_dir:
+            data_path = data_dir
 
-        self.app_data_dir = os.path.join(data_path, 'data')  # Explicitly set data directory
-        self.app_config_dir = os.path.join(data_path, 'config')  # Explicitly set config directory
+        self.data_path = data_path
         self.sounds_dir = os.path.join(resource_path, 'sounds')
-        self.vocab_file = os.path.join(self.app_data_dir, 'german_flashcards.json')  # Move vocab to data directory
-        self.backup_vocab_file = os.path.join(self.app_data_dir, 'backup', 'backup.json')  # Backup in data/backup
-        self.stats_file = os.path.join(self.app_config_dir, 'stats.json')
-        self.user_config_file = os.path.join(self.app_config_dir, 'config.json')
-
-        # Ensure directories exist
-        os.makedirs(self.app_data_dir, exist_ok=True)
-        os.makedirs(self.app_config_dir, exist_ok=True)
-        os.makedirs(os.path.join(self.app_data_dir, 'backup'), exist_ok=True)
-
-        # Initialize config and stats if they don't exist
-        if not os.path.exists(self.user_config_file):
-            with open(self.user_config_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'dark_mode': self.dark_mode,
-                    'sound_enabled': self.sound_enabled,
-                    'max_cards': self.max_cards,
-                    'transition_delay': self.transition_delay,
-                    'keyboard_enabled': self.keyboard_enabled
-                }, f, indent=2)
-        if not os.path.exists(self.stats_file):
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2)
+        self.system_vocab_file = os.path.join(resource_path, 'german_flashcards.json')
+        self.sound_bank = SoundBank(self.sounds_dir, self.latency)
+        self.profile = profile
+        self.profile_var: tk.StringVar = tk.StringVar(value=profile or "")
+        self.deck = self._open_deck(profile)
+        self._card_shown_at: Optional[float] = None
+        self._card_flipped_at: Optional[float] = None
+        self._next_card_due: Optional[float] = None  # When the after() call for the next card should fire
+        self.latency_file = os.path.join(log_dir, 'latency.json')
+        self.latency_overlay: Optional[tk.Label] = None
+        self._import_stop: Optional[threading.Event] = None  # Set to stop the running import's reader thread
+        self._export_stop: Optional[threading.Event] = None  # Set to stop the running export's writer thread
 
         # Widget placeholders
         self.main_frame: Optional[ttk.Frame] = None
@@ -148,6 +613,7 @@ class WordWizardApp:
         self.custom_frame: Optional[ttk.Frame] = None
         self.stats_frame: Optional[ttk.Frame] = None
         self.add_word_frame: Optional[ttk.Frame] = None
+        self.export_frame: Optional[ttk.Frame] = None
         self.settings_frame: Optional[ttk.Frame] = None
         self.card_label: Optional[ttk.Label] = None
         self.example_label: Optional[ttk.Label] = None
@@ -159,16 +625,47 @@ class WordWizardApp:
         self.stats_text: Optional[tk.Text] = None
         self.stats_labels = None
         self.level_stats_labels = None
+        self.difficult_words_menu: Optional[ttk.Combobox] = None
+        self.profile_combo: Optional[ttk.Combobox] = None
+        self.category_menu: Optional[ttk.Combobox] = None  # Custom review category choice, from the deck
+        self.stats_chart_btn: Optional[ttk.Button] = None
+        self.chart_canvas: Optional[tk.Canvas] = None
+        self.stats_charts: Dict[str, BarChart] = {}
+        self._charts_visible: bool = False
+        self._stats_view: Dict[str, Any] = {}  # Values currently shown on the stats screen
 
         # Load data and setup UI
+        load_start = time.perf_counter()
         self.load_data()
+        ui_start = time.perf_counter()
         self.setup_ui()
         self.apply_theme()
+        ui_end = time.perf_counter()
+        logging.info(f"Startup timing: init {(load_start - startup_start) * 1000:.1f} ms, "
+                     f"load_data {(ui_start - load_start) * 1000:.1f} ms, setup_ui {(ui_end - ui_start) * 1000:.1f} ms, "
+                     f"total {(ui_end - startup_start) * 1000:.1f} ms")
         self.master.bind('<Configure>', lambda event: self.update_fonts_on_resize())
         self.master.bind('<Escape>', lambda event: self.show_menu())
         self.master.bind('<Return>', lambda event: "break")
         self.master.bind('<space>', lambda event: "break")
+        self.master.bind('<F12>', lambda event: self.toggle_latency_overlay())
+        self.master.bind('<Control-F12>', lambda event: self.export_latency())
         self.bind_keyboard_events()
+        if self.sound_enabled:
+            # Audio setup runs once the first frame is on screen
+            self.master.after_idle(self.sound_bank.load_async)
+
+    def _open_deck(self, profile: Optional[str]) -> Deck:
+        """Create the deck for a profile; a new profile starts with the current settings."""
+        return open_profile(self.data_path, profile, self.system_vocab_file,
+                            default_config={
+                                'dark_mode': self.dark_mode,
+                                'sound_enabled': self.sound_enabled,
+                                'max_cards': self.max_cards,
+                                'transition_delay': self.transition_delay,
+                                'keyboard_enabled': self.keyboard_enabled
+                            },
+                            save_debounce_ms=self.save_debounce_ms, save_callback=self._perform_save)
 
     def bind_keyboard_events(self):
         """Bind keyboard events for review_frame when visible. Up toggles between German and English until feedback is given. Left/Right only work when card is flipped (English translation visible)."""
@@ -232,216 +729,65 @@ class WordWizardApp:
         self.keyboard_enabled = self.keyboard_enabled_var.get()
         self.bind_keyboard_events()
 
-    def _initialize_pygame_mixer(self) -> None:
-        try:
-            import platform
-            if platform.system() == "Windows":
-                os.environ['SDL_AUDIODRIVER'] = 'directsound'
-            else:
-                os.environ['SDL_AUDIODRIVER'] = 'pulseaudio' if 'pulseaudio' in os.environ.get('SDL_AUDIODRIVER',
-                                                                                               '').lower() else 'alsa'
-
-            if not pygame.mixer.get_init():
-                pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=512)
-                pygame.mixer.init()
-                if pygame.mixer.get_num_channels() == 0:
-                    self.sound_enabled = False
-                    messagebox.showwarning("Sound Error", "No audio channels detected. Sounds will be disabled.")
-        except pygame.error as e:
-            print(f"Pygame mixer initialization failed: {e}")
-            self.sound_enabled = False
-            messagebox.showwarning("Sound Error", f"Sound initialization failed: {str(e)}. Sounds will be disabled.")
-
-    @staticmethod
-    def _validate_json_file(file_path: str, min_size: int = 1000) -> bool:
-        """Validate JSON file by checking existence, size, and syntax."""
-        try:
-            if not os.path.exists(file_path):
-                logging.error(f"JSON file not found: {file_path}")
-                return False
-            if os.path.getsize(file_path) < min_size:
-                logging.error(f"JSON file too small: {file_path} (size: {os.path.getsize(file_path)} bytes)")
-                return False
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                logging.error(f"JSON file does not contain a list: {file_path}")
-                return False
-            logging.info(f"JSON file validated successfully: {file_path}")
-            return True
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            logging.error(f"Invalid JSON in {file_path}: {str(e)}")
-            return False
-        except Exception as e:
-            logging.error(f"Error validating JSON file {file_path}: {str(e)}")
-            return False
-
-    def _repair_json_file(self) -> bool:
-        """Attempt to repair missing or corrupted JSON file by copying from resource directory."""
-        system_vocab_file = os.path.join(self.sounds_dir, "..",
-                                         "german_flashcards.json")  # Use resource_path relative to sounds_dir
-        try:
-            if not os.path.exists(system_vocab_file):
-                logging.error(f"System JSON file not found: {system_vocab_file}")
-                return False
-            if not self._validate_json_file(system_vocab_file):
-                logging.error(f"System JSON file is invalid: {system_vocab_file}")
-                return False
-            if os.path.exists(self.vocab_file):
-                shutil.copy(self.vocab_file, self.backup_vocab_file)
-                logging.info(f"Backed up existing user JSON to {self.backup_vocab_file}")
-            shutil.copy(system_vocab_file, self.vocab_file)
-            logging.info(f"Copied system JSON from {system_vocab_file} to {self.vocab_file}")
-            os.chmod(self.vocab_file, 0o644)
-            logging.info(f"Set permissions (644) for {self.vocab_file}")
-            if self._validate_json_file(self.vocab_file):
-                logging.info(f"Successfully repaired JSON file: {self.vocab_file}")
-                return True
-            else:
-                logging.error(f"Copied JSON file is invalid: {self.vocab_file}")
-                return False
-        except Exception as e:
-            logging.error(f"Failed to repair JSON file: {str(e)}")
-            return False
-
+    @log_timing
     def load_data(self):
-        """Load and validate data, repairing if necessary."""
+        """Load the deck, stats and config, repairing the deck if necessary, and apply the settings."""
         try:
-            os.makedirs(self.app_data_dir, exist_ok=True)
-            os.makedirs(self.app_config_dir, exist_ok=True)
-            os.makedirs(os.path.join(self.app_data_dir, 'backup'), exist_ok=True)
-            logging.info(f"Ensured directories exist: {self.app_data_dir}, {self.app_config_dir}")
-
-            # Load vocab file
-            if not self._validate_json_file(self.vocab_file):
-                logging.warning(f"User JSON file invalid or missing: {self.vocab_file}. Attempting repair.")
-                if not self._repair_json_file():
-                    messagebox.showwarning("Warning",
-                                           "Failed to repair vocabulary file. Creating a default one with sample words.")
-                    default_flashcards = [
-                        {
-                            "german": "Haus",
-                            "english": "House",
-                            "level": "A1",
-                            "category": "Noun",
-                            "gender": "Das",
-                            "examples": ["Das Haus ist groß."],
-                            "box": 1,
-                            "favorite": False
-                        },
-                        {
-                            "german": "gehen",
-                            "english": "to go",
-                            "level": "A1",
-                            "category": "Verb",
-                            "gender": "",
-                            "examples": ["Ich gehe zur Schule."],
-                            "box": 1,
-                            "favorite": False
-                        }
-                    ]
-                    with open(self.vocab_file, 'w', encoding='utf-8') as f:
-                        json.dump(default_flashcards, f, ensure_ascii=False, indent=2)
-                    logging.info(f"Created default JSON file with sample words: {self.vocab_file}")
-            with open(self.vocab_file, 'r', encoding='utf-8') as f:
-                self.flashcards = json.load(f)
-            logging.info(f"Loaded flashcards from {self.vocab_file}")
-            shutil.copy(self.vocab_file, self.backup_vocab_file)
-            logging.info(f"Created backup: {self.backup_vocab_file}")
-
-            # Load stats file
-            if os.path.exists(self.stats_file):
-                with open(self.stats_file, 'r', encoding='utf-8') as f:
-                    self.stats = json.load(f)
-                logging.info(f"Loaded stats from {self.stats_file}")
-            else:
-                with open(self.stats_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.stats, f, indent=2)
-                logging.info(f"Created new stats file: {self.stats_file}")
-
-            # Load user config file
-            if os.path.exists(self.user_config_file):
-                with open(self.user_config_file, 'r', encoding='utf-8') as f:
-                    self.user_config = json.load(f)
-                    self.dark_mode = self.user_config.get('dark_mode', self.dark_mode)
-                    self.sound_enabled = self.user_config.get('sound_enabled', self.sound_enabled)
-                    self.max_cards = self.user_config.get('max_cards', self.max_cards)
-                    self.transition_delay = self.user_config.get('transition_delay', self.transition_delay)
-                    self.keyboard_enabled = self.user_config.get('keyboard_enabled', self.keyboard_enabled)
-                    self.dark_mode_var.set(self.dark_mode)
-                    self.sound_var.set(self.sound_enabled)
-                    self.default_cards_var.set(str(self.max_cards))
-                    self.transition_delay_var.set(str(self.transition_delay))
-                    self.keyboard_enabled_var.set(self.keyboard_enabled)
-                logging.info(f"Loaded user config from {self.user_config_file}")
-            else:
-                with open(self.user_config_file, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'dark_mode': self.dark_mode,
-                        'sound_enabled': self.sound_enabled,
-                        'max_cards': self.max_cards,
-                        'transition_delay': self.transition_delay,
-                        'keyboard_enabled': self.keyboard_enabled
-                    }, f, indent=2)
-                logging.info(f"Created new user config file: {self.user_config_file}")
-
-            # Standardize flashcards
-            allowed_categories = ["Noun", "Verb", "Adjective", "Adverb", "Pronoun", "Preposition", "Conjunction",
-                                  "Interjection"]
-            allowed_levels = ["A1", "A2", "B1", "B2", "C1"]
-            for card in self.flashcards:
-                category = card.get('category', '').strip()
-                if category:
-                    standardized_category = category.title()
-                    card['category'] = standardized_category if standardized_category in allowed_categories else ""
-                else:
-                    card['category'] = ""
-                level = card.get('level', '').strip().upper()
-                card['level'] = level if level in allowed_levels else ""
-                if 'example' in card and 'examples' not in card:
-                    card['examples'] = [card['example']] if card['example'] else []
-                    del card['example']
-                if 'box' not in card:
-                    card['box'] = 1
-                if 'favorite' not in card:
-                    card['favorite'] = False
-            self.save_data()
-            logging.info("Data standardization complete")
+            for warning in self.deck.load():
+                messagebox.showwarning("Warning", warning)
         except Exception as e:
             logging.error(f"Unexpected error in load_data: {str(e)}")
             messagebox.showerror("Error", f"Failed to load data: {str(e)}. Please check the log file.")
-            self.flashcards = []
+            self.deck.clear()
+        self._apply_user_config()
 
     @staticmethod
     def _validate_level(level: str) -> bool:
         """Validate if the given level is valid."""
-        return level.upper() in ['A1', 'A2', 'B1', 'B2', 'C1']
+        return level.upper() in ALLOWED_LEVELS
 
     @staticmethod
     def _validate_category(category: str) -> bool:
-        """Validate if the given category is valid."""
-        allowed_categories = ["", "Noun", "Verb", "Adjective", "Adverb", "Pronoun", "Preposition", "Conjunction",
-                              "Interjection"]
-        return category.strip().title() in allowed_categories
-
+        """Validate if the given category is valid (empty is allowed)."""
+        category = category.strip().title()
+        return not category or category in ALLOWED_CATEGORIES
+
+    def _apply_user_config(self) -> None:
+        """Copy settings from user_config onto the app and its Tk variables."""
+        user_config = self.deck.user_config
+        self.dark_mode = user_config.get('dark_mode', self.dark_mode)
+        self.sound_enabled = user_config.get('sound_enabled', self.sound_enabled)
+        self.max_cards = user_config.get('max_cards', self.max_cards)
+        self.transition_delay = user_config.get('transition_delay', self.transition_delay)
+        self.keyboard_enabled = user_config.get('keyboard_enabled', self.keyboard_enabled)
+        if 'timing_log_level' in user_config:
+            set_timing_log_level(user_config['timing_log_level'])
+        self.dark_mode_var.set(self.dark_mode)
+        self.sound_var.set(self.sound_enabled)
+        self.default_cards_var.set(str(self.max_cards))
+        self.transition_delay_var.set(str(self.transition_delay))
+        self.keyboard_enabled_var.set(self.keyboard_enabled)
+
+    @_timed('ui.save_data')
     def save_data(self) -> None:
-        """Save data immediately without debouncing."""
-        self._perform_save()  # Directly call perform_save to ensure immediate saving
+        """Queue a full save of deck, stats and config on the writer thread; bursts are coalesced."""
+        self._report_persistence_error()
+        self.deck.request_save()
+
+    def _report_persistence_error(self) -> bool:
+        """Show the last background write failure, if any, on the Tk thread. Returns True when there was none."""
+        error = self.deck.take_error()
+        if error is None:
+            return True
+        print(f"Error saving data: {error}")
+        messagebox.showerror("Save Error", f"Failed to save data: {str(error)}")
+        return False
 
-    def _perform_save(self) -> None:
-        try:
-            # Save vocab file to data directory
-            with open(self.vocab_file, 'w', encoding='utf-8') as f:
-                json.dump(self.flashcards, f, ensure_ascii=False, indent=2)
-            shutil.copy(self.vocab_file, self.backup_vocab_file)
-            # Save stats and config files
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2)
-            with open(self.user_config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.user_config, f, indent=2)
-        except Exception as e:
-            print(f"Error saving data: {e}")
-            messagebox.showerror("Save Error", f"Failed to save data: {str(e)}")
+    @_timed('io.perform_save')
+    @log_timing
+    def _perform_save(self) -> bool:
+        """Snapshot deck, stats and config and hand them to the storage backend (runs on the writer thread)."""
+        return self.deck.save_snapshot()
 
     def setup_ui(self):
         """Set up the main UI elements"""
@@ -463,11 +809,13 @@ class WordWizardApp:
         self.setup_custom_review_frame()
         self.setup_stats_frame()
         self.setup_add_word_frame()
+        self.setup_export_frame()
         self.setup_settings_frame()
 
         # Start with menu
         self.show_menu()
 
+    @log_timing
     def apply_theme(self):
         """Apply the current theme with explicit Combobox and Checkbutton styling to prevent reset issues."""
         colors = self.dark_colors if self.dark_mode else self.light_colors
@@ -561,12 +909,11 @@ class WordWizardApp:
 
     def update_fonts_on_resize(self):
         """Update font sizes dynamically with debouncing to prevent frequent calls."""
-        import tkinter.font as tkfont
-
         # Debounce mechanism
         if getattr(self, '_resize_after_id', None):
             self.master.after_cancel(self._resize_after_id)
 
+        @log_timing
         def perform_resize():
             # Get window dimensions
             window_height = self.master.winfo_height()
@@ -585,46 +932,14 @@ class WordWizardApp:
             # Update wraplength for labels
             wraplength = int(window_width * 0.8)
 
-            def adjust_font_size(label, initial_font_size, text, max_lines=2):
-                """Dynamically adjust font size to fit text within max_lines."""
-                if not text or not label.winfo_exists():
-                    return initial_font_size
-
-                font_size = initial_font_size
-                font = tkfont.Font(family="Segoe UI", size=font_size)
-                max_width = wraplength
-
-                # Measure text size and adjust font size to fit within max_lines
-                while font_size > 8:  # Minimum font size
-                    lines = []
-                    current_line = ""
-                    words = text.split()
-                    for word in words:
-                        test_line = current_line + word + " "
-                        if font.measure(test_line) <= max_width:
-                            current_line = test_line
-                        else:
-                            lines.append(current_line)
-                            current_line = word + " "
-                    if current_line:
-                        lines.append(current_line)
-
-                    # Check if text fits within max_lines
-                    if len(lines) <= max_lines:
-                        break
-                    font_size -= 1
-                    font.configure(size=font_size)
-
-                return font_size
-
             # Adjust font sizes for card_label and example_label if they exist
             if hasattr(self, 'card_label') and self.card_label and self.card_label.cget("text"):
                 card_text = self.card_label.cget("text")
-                card_font_size = adjust_font_size(self.card_label, card_font_size, card_text, max_lines=2)
+                card_font_size = self.text_fitter.fit(card_text, card_font_size, wraplength, max_lines=2)
 
             if hasattr(self, 'example_label') and self.example_label and self.example_label.cget("text"):
                 example_text = self.example_label.cget("text")
-                example_font_size = adjust_font_size(self.example_label, example_font_size, example_text, max_lines=2)
+                example_font_size = self.text_fitter.fit(example_text, example_font_size, wraplength, max_lines=2)
 
             # Update styles
             self.style.configure('Title.TLabel', font=('Segoe UI', title_font_size, 'bold'))
@@ -644,6 +959,42 @@ class WordWizardApp:
 
         self._resize_after_id = self.master.after(200, perform_resize)
 
+    def _card_font_limits(self):
+        """Starting card and example font sizes and the label wraplength for the current window size."""
+        window_width = self.master.winfo_width()
+        base_size = min(self.master.winfo_height(), window_width)
+        return max(18, int(base_size * 0.08)), 14, int(window_width * 0.8)
+
+    def _apply_card_fonts(self, card_text: str, example_text: str = "") -> None:
+        """Size the card and example styles so their texts fit in two lines."""
+        card_size, example_size, wraplength = self._card_font_limits()
+        self.style.configure('Card.TLabel', font=('Segoe UI', self.text_fitter.fit(card_text, card_size, wraplength)))
+        if example_text:
+            self.style.configure('Example.TLabel',
+                                 font=('Segoe UI', self.text_fitter.fit(example_text, example_size, wraplength),
+                                       'italic'))
+
+    def _prefit_upcoming_cards(self) -> None:
+        """Fit both sides of the next few session cards while idle, so showing them finds the sizes cached."""
+        if self.session is None:
+            return
+        card_size, example_size, wraplength = self._card_font_limits()
+        for card in self.session.upcoming(self.prefit_cards):
+            self.text_fitter.fit(self._capitalize_german_word(card.german), card_size, wraplength)
+            self.text_fitter.fit(self._english_display_text(card.english), card_size, wraplength)
+            self.text_fitter.fit(self._examples_display_text(card), example_size, wraplength)
+
+    @staticmethod
+    def _english_display_text(english_text: str) -> str:
+        """Capitalize the English side, spacing out slash-separated alternatives."""
+        if '/' in english_text:
+            return ' / '.join(word.strip().capitalize() for word in english_text.split('/'))
+        return ' '.join(word.capitalize() for word in english_text.split())
+
+    @staticmethod
+    def _examples_display_text(card: Card) -> str:
+        return "\n".join(f"• {ex}" for ex in card.examples)
+
     def setup_menu(self):
         """Set up the main menu with buttons that disable default Return and Space bindings."""
         self.menu_frame = ttk.Frame(self.main_frame)
@@ -668,7 +1019,7 @@ class WordWizardApp:
             ("Settings", self.show_settings),
             ("Import Vocabulary", self.show_import_dialog),
             ("Export Vocabulary", self.show_export_dialog),
-            ("Exit", self.master.quit)
+            ("Exit", self.on_closing)
         ]
         for text, command in buttons:
             btn = ttk.Button(button_frame, text=text, command=lambda c=command: [self.play_sound(), c()])
@@ -801,8 +1152,6 @@ class WordWizardApp:
 
     def show_streak_celebration(self):
         """Show streak celebration message with proper layout preservation and dynamic font sizing."""
-        import tkinter.font as tkfont
-
         if not self.current_card or not self.streak_label:
             print("Error: Missing current_card or streak_label")
             self.show_next_card()
@@ -857,38 +1206,8 @@ class WordWizardApp:
         wraplength = int(window_width * 0.8)
         initial_font_size = max(18, int(min(self.master.winfo_height(), window_width) * 0.08))
 
-        def adjust_font_size(text, max_lines=2):
-            """Dynamically adjust font size to fit text within max_lines without requiring a label."""
-            if not text:
-                return initial_font_size
-
-            font_size = initial_font_size
-            font = tkfont.Font(family="Segoe UI", size=font_size)
-            max_width = wraplength
-
-            while font_size > 8:  # Minimum font size
-                lines = []
-                current_line = ""
-                words = text.split()
-                for word in words:
-                    test_line = current_line + word + " "
-                    if font.measure(test_line) <= max_width:
-                        current_line = test_line
-                    else:
-                        lines.append(current_line)
-                        current_line = word + " "
-                if current_line:
-                    lines.append(current_line)
-
-                if len(lines) <= max_lines:
-                    break
-                font_size -= 1
-                font.configure(size=font_size)
-
-            return font_size
-
         # Create celebration label with dynamic font size
-        celebration_font_size = adjust_font_size(message, max_lines=2)
+        celebration_font_size = self.text_fitter.fit(message, initial_font_size, wraplength, max_lines=2)
         celebration_label = ttk.Label(
             celebration_frame,
             text=message,
@@ -923,12 +1242,12 @@ class WordWizardApp:
                 self.star_btn.place(relx=1.0, rely=0.0, anchor="ne", x=0, y=0)
 
                 # Move to next card without restoring previous text
-                self.current_card_idx += 1
+                self.session.advance()
                 self.show_next_card()
 
             except Exception as restore_err:
                 print(f"Restore error: {restore_err}")
-                self.current_card_idx += 1
+                self.session.advance()
                 self.show_next_card()
 
         # Schedule cleanup after 4 seconds
@@ -953,20 +1272,18 @@ class WordWizardApp:
         ttk.Label(self.custom_frame, text="Select level:").pack()
         self.level_var = tk.StringVar(value="All")
         level_menu = ttk.Combobox(self.custom_frame, textvariable=self.level_var,
-                                  values=["All", "A1", "A2", "B1", "B2", "C1"], state="readonly")
+                                  values=["All", *ALLOWED_LEVELS], state="readonly")
         level_menu.pack(pady=5)
         # Ensure selection is preserved
         level_menu.bind('<<ComboboxSelected>>', lambda event: self._preserve_combobox_selection('level'))
         # Category filter
         ttk.Label(self.custom_frame, text="Select category:").pack()
         self.category_var = tk.StringVar(value="All")
-        categories = ["All"] + sorted(set(
-            card.get('category', '').strip().title() for card in self.flashcards if card.get('category', '').strip()))
-        category_menu = ttk.Combobox(self.custom_frame, textvariable=self.category_var, values=categories,
-                                     state="readonly")
-        category_menu.pack(pady=5)
+        self.category_menu = ttk.Combobox(self.custom_frame, textvariable=self.category_var, state="readonly")
+        self.refresh_category_choices()
+        self.category_menu.pack(pady=5)
         # Ensure selection is preserved
-        category_menu.bind('<<ComboboxSelected>>', lambda event: self._preserve_combobox_selection('category'))
+        self.category_menu.bind('<<ComboboxSelected>>', lambda event: self._preserve_combobox_selection('category'))
         # Buttons
         btn_frame = ttk.Frame(self.custom_frame)
         btn_frame.pack(pady=20)
@@ -984,6 +1301,15 @@ class WordWizardApp:
         # Pack the custom frame
         self.custom_frame.pack(fill="both", expand=True)
 
+    def refresh_category_choices(self) -> None:
+        """Offer the categories of the current deck in the custom review options (after a profile switch or import)."""
+        if not self.category_menu:
+            return
+        categories = ["All"] + self.deck.index.categories()
+        self.category_menu['values'] = categories
+        if self.category_var.get() not in categories:
+            self.category_var.set("All")
+
     def _preserve_combobox_selection(self, combobox_type: str):
         """Preserve the selected value in the specified combobox without affecting others."""
         if combobox_type == 'level':
@@ -993,13 +1319,11 @@ class WordWizardApp:
         self.custom_frame.focus_set()
 
     def setup_stats_frame(self):
-        # Clear existing stats_frame to prevent duplicate widgets
+        """Build the stats screen once; show_stats updates its widgets in place."""
         if self.stats_frame:
-            for widget in self.stats_frame.winfo_children():
-                widget.destroy()
-            self.stats_frame.pack_forget()
-        else:
-            self.stats_frame = ttk.Frame(self.main_frame)
+            return
+        self.stats_frame = ttk.Frame(self.main_frame)
+        self._stats_view = {}
         # Title
         ttk.Label(self.stats_frame, text="Your Statistics", style='Title.TLabel').pack(pady=0)
         # Stats container
@@ -1019,7 +1343,9 @@ class WordWizardApp:
             ("Correct:", "correct"),
             ("Incorrect:", "incorrect"),
             ("Accuracy:", "accuracy"),
-            ("Streak:", "streak")
+            ("Streak:", "streak"),
+            ("Today:", "today"),
+            ("This Week:", "week")
         ]
         self.stats_labels = {}
         for i, (text, key) in enumerate(labels, 1):
@@ -1039,23 +1365,14 @@ class WordWizardApp:
         # Difficult words Combobox
         ttk.Label(stats_container, text="Difficult Words", style='Title.TLabel').grid(row=len(labels) + 7, column=0,
                                                                                       columnspan=2, sticky="w")
-        difficult_words_menu = ttk.Combobox(stats_container, textvariable=self.stats_var, state="readonly")
-        difficult_words_menu.grid(row=len(labels) + 8, column=0, columnspan=2, sticky="we", padx=5, pady=5)
-        difficult_words = self.stats.get('difficult_words', {})
-        if difficult_words:
-            sorted_words = sorted(difficult_words.items(), key=lambda x: x[1], reverse=True)
-            word_list = [f"{word} ({count})" for word, count in sorted_words]
-            difficult_words_menu['values'] = word_list
-            self.stats_var.set(f"Difficult Words ({len(sorted_words)} Unique Words)")
-        else:
-            difficult_words_menu['values'] = ["No difficult words yet"]
-            self.stats_var.set("No difficult words yet")
+        self.difficult_words_menu = ttk.Combobox(stats_container, textvariable=self.stats_var, state="readonly")
+        self.difficult_words_menu.grid(row=len(labels) + 8, column=0, columnspan=2, sticky="we", padx=5, pady=5)
         # Show Chart button
-        chart_btn = ttk.Button(self.stats_frame, text="Show Statistics Chart",
-                               command=lambda: [self.play_sound(), self.show_stats_chart()])
-        chart_btn.pack(pady=(10, 5))
-        chart_btn.bind('<Return>', lambda event: "break")
-        chart_btn.bind('<space>', lambda event: "break")
+        self.stats_chart_btn = ttk.Button(self.stats_frame, text="Show Statistics Chart",
+                                          command=lambda: [self.play_sound(), self.show_stats_chart()])
+        self.stats_chart_btn.pack(pady=(10, 5))
+        self.stats_chart_btn.bind('<Return>', lambda event: "break")
+        self.stats_chart_btn.bind('<space>', lambda event: "break")
         # Back button
         back_btn = ttk.Button(self.stats_frame, text="Back to Menu",
                               command=lambda: [self.play_sound(), self.show_menu()])
@@ -1090,15 +1407,12 @@ class WordWizardApp:
                 self.entry_vars[field_name] = var
             elif field_name == "category":
                 var = tk.StringVar()
-                category_menu = ttk.Combobox(frame, textvariable=var,
-                                             values=["Noun", "Verb", "Adjective", "Adverb", "Pronoun",
-                                                     "Preposition", "Conjunction", "Interjection"], state="readonly")
+                category_menu = ttk.Combobox(frame, textvariable=var, values=ALLOWED_CATEGORIES, state="readonly")
                 category_menu.pack(side="right", expand=True, fill="x")
                 self.entry_vars[field_name] = var
             elif field_name == "level":
                 var = tk.StringVar()
-                level_menu = ttk.Combobox(frame, textvariable=var, values=["A1", "A2", "B1", "B2", "C1"],
-                                          state="readonly")
+                level_menu = ttk.Combobox(frame, textvariable=var, values=ALLOWED_LEVELS, state="readonly")
                 level_menu.pack(side="right", expand=True, fill="x")
                 self.entry_vars[field_name] = var
             else:
@@ -1118,6 +1432,42 @@ class WordWizardApp:
         back_btn.bind('<Return>', lambda event: "break")
         back_btn.bind('<space>', lambda event: "break")
 
+    def setup_export_frame(self):
+        """Set up the export options frame: file format, compression and which cards to write."""
+        self.export_frame = ttk.Frame(self.main_frame)
+        ttk.Label(self.export_frame, text="Export Vocabulary", style='Title.TLabel').pack(pady=20)
+        options = [
+            ("Format:", "format", list(EXPORT_FORMAT_CHOICES)),
+            ("Compression:", "compression", list(EXPORT_COMPRESSION_CHOICES)),
+            ("Level:", "level", ["All"] + list(ALLOWED_LEVELS)),
+            ("Category:", "category", ["All"] + list(ALLOWED_CATEGORIES)),
+            ("Leitner box:", "box", ["All", "1", "2", "3", "4", "5"]),
+        ]
+        self.export_vars = {}
+        for label_text, option, values in options:
+            frame = ttk.Frame(self.export_frame)
+            frame.pack(fill="x", padx=20, pady=5)
+            ttk.Label(frame, text=label_text).pack(side="left")
+            var = tk.StringVar(value=values[0])
+            ttk.Combobox(frame, textvariable=var, values=values, state="readonly").pack(side="right", expand=True,
+                                                                                       fill="x")
+            self.export_vars[option] = var
+        self.export_vars["favorites"] = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.export_frame, text="Favorites only", variable=self.export_vars["favorites"],
+                        style='NoHover.TCheckbutton').pack(pady=5)
+        # Buttons
+        btn_frame = ttk.Frame(self.export_frame)
+        btn_frame.pack(pady=20)
+        export_btn = ttk.Button(btn_frame, text="Export...",
+                                command=lambda: [self.play_sound(), self.choose_export_file()])
+        export_btn.pack(side="left", padx=10)
+        export_btn.bind('<Return>', lambda event: "break")
+        export_btn.bind('<space>', lambda event: "break")
+        back_btn = ttk.Button(btn_frame, text="Back to Menu", command=lambda: [self.play_sound(), self.show_menu()])
+        back_btn.pack(side="left", padx=10)
+        back_btn.bind('<Return>', lambda event: "break")
+        back_btn.bind('<space>', lambda event: "break")
+
     def setup_settings_frame(self):
         """Set up settings frame with a slider for transition delay, keyboard navigation toggle, and disabled Return/Space bindings."""
         # Clear existing widgets in settings_frame to prevent duplicates
@@ -1170,6 +1520,18 @@ class WordWizardApp:
                            length=200, command=update_slider_value)
         slider.pack(side="left", padx=5)
         ttk.Label(frame, textvariable=self.transition_delay_var).pack(side="left", padx=5)  # Display current value
+        # Learner profile: pick or type a name and switch; empty is the shared full deck
+        frame = ttk.Frame(self.settings_frame)
+        frame.pack(fill="x", padx=20, pady=5)
+        ttk.Label(frame, text="Profile (empty for shared deck):").pack(side="left")
+        self.profile_combo = ttk.Combobox(frame, textvariable=self.profile_var, values=list_profiles(self.data_path),
+                                          width=15)
+        self.profile_combo.pack(side="left", padx=5)
+        switch_btn = ttk.Button(frame, text="Switch",
+                                command=lambda: [self.play_sound(), self.switch_profile(self.profile_var.get())])
+        switch_btn.pack(side="left", padx=5)
+        switch_btn.bind('<Return>', lambda event: "break")
+        switch_btn.bind('<space>', lambda event: "break")
         # Buttons
         frame = ttk.Frame(self.settings_frame)
         frame.pack(pady=20)
@@ -1184,176 +1546,127 @@ class WordWizardApp:
         # Pack the settings frame
         self.settings_frame.pack(fill="both", expand=True)
 
-    def play_sound(self):
+    def _play_bank_sound(self, name: str, description: str) -> None:
+        """Play a preloaded sound; disable sound if the file is missing or the mixer fails."""
         if not self.sound_enabled:
-            print("Sound disabled: Skipping click sound playback.")
+            print(f"Sound disabled: Skipping {description} sound playback.")
             return
         try:
-            sound_file = os.path.join(self.sounds_dir, "click.wav")
-            if not os.path.exists(sound_file):
-                print(f"Click sound file not found: {sound_file}")
-                messagebox.showwarning("Sound Error",
-                                       f"Click sound file not found. Please ensure the application is installed correctly.")
-                self.sound_enabled = False
-                return
-            sound = pygame.mixer.Sound(sound_file)
-            sound.set_volume(1.0)
-            channel = sound.play()
-            if channel is None:
-                print("No available channel for click sound playback.")
-                messagebox.showwarning("Sound Error", "No available audio channel for click sound.")
-        except pygame.error as e:
-            print(f"Click sound playback error: {e}")
-            messagebox.showwarning("Sound Error", f"Failed to play click sound: {str(e)}")
+            self.sound_bank.play(name)
+        except FileNotFoundError as e:
+            print(f"{description.capitalize()} sound file not found: {e}")
+            messagebox.showwarning("Sound Error",
+                                   f"{description.capitalize()} sound file not found. Please ensure the application is installed correctly.")
+            self.sound_enabled = False
+        except Exception as e:  # ImportError or pygame.error: audio is unavailable, fall back to silence
+            print(f"{description.capitalize()} sound playback error: {e}")
+            messagebox.showwarning("Sound Error", f"Failed to play {description} sound: {str(e)}. Sounds will be disabled.")
             self.sound_enabled = False
 
+    def play_sound(self):
+        self._play_bank_sound('click', 'click')
+
     # Play feedback sound for correct/incorrect answers
     def play_feedback_sound(self, correct: bool) -> None:
-        if not self.sound_enabled:
-            print("Sound disabled: Skipping feedback sound playback.")
-            return
-        try:
-            sound_file = os.path.join(self.sounds_dir, "correct.wav" if correct else "incorrect.wav")
-            if not os.path.exists(sound_file):
-                print(f"Feedback sound file not found: {sound_file}")
-                messagebox.showwarning("Sound Error",
-                                       f"Feedback sound file not found. Please ensure the application is installed correctly.")
-                self.sound_enabled = False
-                return
-            sound = pygame.mixer.Sound(sound_file)
-            sound.set_volume(1.0)
-            channel = sound.play()
-            if channel is None:
-                print("No available channel for feedback sound playback.")
-                messagebox.showwarning("Sound Error", "No available audio channel for feedback sound.")
-        except pygame.error as e:
-            print(f"Feedback sound playback error: {e}")
-            messagebox.showwarning("Sound Error", f"Failed to play feedback sound: {str(e)}")
-            self.sound_enabled = False
+        self._play_bank_sound('correct' if correct else 'incorrect', 'feedback')
 
-    # Play streak sound with enhanced diagnostics
     def play_streak_sound(self):
-        if not self.sound_enabled:
-            print("Sound disabled: Skipping streak sound playback.")
-            return
-        try:
-            sound_file = os.path.join(self.sounds_dir, "streak.wav")
-            if not os.path.exists(sound_file):
-                print(f"Streak sound file not found: {sound_file}")
-                messagebox.showwarning("Sound Error",
-                                       f"Streak sound file not found. Please ensure the application is installed correctly.")
-                self.sound_enabled = False
-                return
-            sound = pygame.mixer.Sound(sound_file)
-            sound.set_volume(1.0)
-            channel = sound.play()
-            if channel is None:
-                print("No available channel for streak sound playback.")
-                messagebox.showwarning("Sound Error", "No available audio channel for streak sound.")
-
-                def fade_out(step=10, delay=2000 // 10):
-                    try:
-                        if step <= 0:
-                            sound.set_volume(0.0)
-                            sound.stop()
-                            return
-                        current_volume = sound.get_volume()
-                        sound.set_volume(max(0.0, current_volume - 0.1))
-                        self.master.after(delay, lambda: fade_out(step - 1, delay))
-                    except pygame.error as fade_err:
-                        print(f"Fade-out error: {fade_err}")
-                        messagebox.showwarning("Sound Error", f"Error during streak sound fade-out: {str(fade_err)}")
-
-                self.master.after(3000, lambda: fade_out(10))
-        except pygame.error as e:
-            print(f"Streak sound playback error: {e}")
-            messagebox.showwarning("Sound Error", f"Failed to play streak sound: {str(e)}")
-            self.sound_enabled = False
+        self._play_bank_sound('streak', 'streak')
 
     def hide_all_frames(self):
         # Hide all frames
         for frame in [self.menu_frame, self.review_frame, self.custom_frame,
-                      self.stats_frame, self.add_word_frame, self.settings_frame]:
+                      self.stats_frame, self.add_word_frame, self.export_frame, self.settings_frame]:
             if frame:
                 frame.pack_forget()
 
     # Değiştirilecek: start_review_session fonksiyonu
+    @log_timing
     def start_review_session(self, level=None, category=None):
         """Start a review session for all cards or filtered by level/category"""
         self.correct_streak = 0
         self.session_start_time = datetime.now()
-        self.review_cards = self.flashcards.copy()
+        level_filter = None
+        category_filter = None
 
         if level and level != "All":
             if not self._validate_level(level):
                 messagebox.showinfo("Invalid Level",
-                                    f"Level '{level}' is not valid. Available levels: A1, A2, B1, B2, C1")
+                                    f"Level '{level}' is not valid. Available levels: {', '.join(ALLOWED_LEVELS)}")
                 return
-            available_levels = sorted(set(card.get('level', '') for card in self.flashcards if card.get('level')))
+            available_levels = self.deck.index.levels()
             if level not in available_levels:
                 messagebox.showinfo("No Cards Available",
                                     f"No {level}-level cards available.\nAvailable levels: {', '.join(available_levels) if available_levels else 'None'}")
                 return
-            self.review_cards = [card for card in self.review_cards if card.get('level', '').upper() == level]
+            level_filter = level
 
         if category and category != "All":
             if not self._validate_category(category):
                 messagebox.showinfo("Invalid Category",
-                                    f"Category '{category}' is not valid. Available categories: Noun, Verb, Adjective, Adverb, Pronoun, Preposition, Conjunction, Interjection")
+                                    f"Category '{category}' is not valid. "
+                                    f"Available categories: {', '.join(ALLOWED_CATEGORIES)}")
                 return
-            available_categories = sorted(
-                set(card.get('category', '') for card in self.flashcards if card.get('category')))
+            available_categories = self.deck.index.categories()
             if category not in available_categories:
                 messagebox.showinfo("No Cards Available",
                                     f"No cards in '{category}' category.\nAvailable categories: {', '.join(available_categories) if available_categories else 'None'}")
                 return
-            self.review_cards = [card for card in self.review_cards if card.get('category', '').title() == category]
+            category_filter = category
 
-        if not self.review_cards:
-            available_levels = sorted(set(card.get('level', '') for card in self.flashcards if card.get('level')))
-            available_categories = sorted(
-                set(card.get('category', '') for card in self.flashcards if card.get('category')))
+        # Due cards first (most overdue first), then new cards, then the soonest upcoming ones
+        session = self.deck.session(self.max_cards, level=level_filter, category=category_filter)
+
+        if not session:
+            available_levels = self.deck.index.levels()
+            available_categories = self.deck.index.categories()
             messagebox.showinfo("No Cards",
                                 f"No cards available for Level: {level or 'All'}, Category: {category or 'All'}\n"
                                 f"Available levels: {', '.join(available_levels) if available_levels else 'None'}\n"
                                 f"Available categories: {', '.join(available_categories) if available_categories else 'None'}")
             return
 
-        weights = [1 / (card.get('box', 1)) for card in self.review_cards]
-        self.review_cards = random.choices(self.review_cards, weights=weights, k=len(self.review_cards))
-        self.current_card_idx = 0
+        self.session = session
         self.hide_all_frames()
         self.review_frame.pack(fill="both", expand=True)
 
         # Update status with levels and categories
-        levels = sorted(set(card.get('level', '') for card in self.review_cards if card.get('level')))
-        categories = sorted(set(card.get('category', '') for card in self.review_cards if card.get('category')))
+        levels = session.levels()
+        categories = session.categories()
         levels_text = "All levels" if len(levels) >= 5 else ', '.join(levels) if levels else "No levels"
         categories_text = "All categories" if len(categories) >= 8 else ', '.join(
             categories) if categories else "No categories"
-        self.update_status(f"Reviewing {len(self.review_cards)} cards ({levels_text}) ({categories_text})")
+        self.update_status(f"Reviewing {len(session)} cards ({levels_text}) ({categories_text})")
 
         # Show the first card and ensure keyboard bindings are applied
         self.show_next_card()
         self.master.after(100, self.bind_keyboard_events)
 
+    @_timed('ui.show_next_card')
     def show_next_card(self):
         """Show the next card in the review session with fade transition effect for non-first cards."""
-        if self.current_card_idx >= len(self.review_cards):
+        if self._next_card_due is not None:
+            # How late the transition_delay timer fired behind schedule
+            self.latency.record('ui.transition_lag', (time.perf_counter() - self._next_card_due) * 1000)
+            self._next_card_due = None
+        if self.session is None or self.session.finished:
             self.end_review_session()
             return
 
-        self.current_card = self.review_cards[self.current_card_idx]
+        self.current_card = self.session.current
         self.card_front = True
         self.feedback_given = False  # Reset feedback flag for new card
-        display_text = self._capitalize_german_word(self.current_card['german'])
-        is_favorite = self.current_card.get('favorite', False)
+        display_text = self._capitalize_german_word(self.current_card.german)
+        is_favorite = self.current_card.favorite
 
         # Get current theme colors
         colors = self.dark_colors if self.dark_mode else self.light_colors
 
         def update_card():
-            # Update card label with dynamic font from style and reset color
+            # Update card label with a font fitted to the text (usually precomputed) and reset color
+            self._card_shown_at = time.perf_counter()
+            self._card_flipped_at = None
+            self._apply_card_fonts(display_text)
             self.card_label.config(text=display_text, style='Card.TLabel', foreground=colors['fg'])
 
             # Update star button
@@ -1370,22 +1683,23 @@ class WordWizardApp:
 
             # Update progress bar and progress label
             if self.progress_bar:
-                progress = (self.current_card_idx / len(self.review_cards)) * 100
+                progress = (self.session.index / len(self.session)) * 100
                 self.progress_bar['value'] = progress
             if self.progress_label:
-                self.progress_label.config(text=f"{self.current_card_idx + 1}/{len(self.review_cards)}")
+                self.progress_label.config(text=f"{self.session.index + 1}/{len(self.session)}")
 
             # Apply fade-in effect only for non-first cards
-            if self.current_card_idx > 0:
+            if self.session.index > 0:
                 self._fade_transition(self.card_label, 0.0, 1.0, steps=10, delay=self.transition_delay // 2)
 
             # Ensure the review frame is focused and keyboard bindings are active
             self.master.after(100, lambda: self.review_frame.focus_set())
             self.master.after(100, lambda: self.review_frame.focus_force())
             self.master.after(100, self.bind_keyboard_events)
+            self.master.after_idle(self._prefit_upcoming_cards)
 
         # Apply fade-out effect only for non-first cards
-        if self.current_card_idx > 0:
+        if self.session.index > 0:
             self._fade_transition(self.card_label, 1.0, 0.0, steps=10, delay=self.transition_delay // 2)
             self.master.after(self.transition_delay // 2, update_card)
         else:
@@ -1393,66 +1707,32 @@ class WordWizardApp:
 
     def end_review_session(self):
         # End the review session and return to main menu
-        self.review_cards = []
-        self.current_card_idx = 0
+        self.session = None
         self.hide_all_frames()
         self.show_menu()
         self.update_status("Welcome to Word Wizard")
 
     def _fade_transition(self, widget, start_ratio, end_ratio, steps=10, delay=50):
         """Apply a fade transition effect by interpolating between foreground and background colors."""
-        # Cancel any existing fade transition
-        if self._fade_after_id:
-            self.master.after_cancel(self._fade_after_id)
-            self._fade_after_id = None
-
-        step_size = (end_ratio - start_ratio) / steps
-        current_ratio = start_ratio
         colors = self.dark_colors if self.dark_mode else self.light_colors
-        fg = colors['fg']
-        bg = colors['bg']
-
-        def hex_to_rgb(hex_color):
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
-
-        def rgb_to_hex(rgb):
-            return f'#{int(rgb[0]):02x}{int(rgb[1]):02x}{int(rgb[2]):02x}'
-
-        fg_rgb = hex_to_rgb(fg)
-        bg_rgb = hex_to_rgb(bg)
-
-        def update_color():
-            nonlocal current_ratio
-            if abs(current_ratio - end_ratio) < abs(step_size):
-                current_ratio = end_ratio
-                widget.config(foreground=fg if end_ratio == 1.0 else bg)
-                self._fade_after_id = None
-                return
-            blended_rgb = [
-                bg_rgb[i] + (fg_rgb[i] - bg_rgb[i]) * current_ratio
-                for i in range(3)
-            ]
-            new_color = rgb_to_hex(blended_rgb)
-            widget.config(foreground=new_color)
-            current_ratio += step_size
-            self._fade_after_id = self.master.after(delay // steps, update_color)
-
-        update_color()
+        self.animator.fade(widget, colors['fg'], colors['bg'], start_ratio, end_ratio, steps=steps, duration_ms=delay)
 
+    @_timed('ui.flip_card')
     def flip_card(self):
         """Flip the card with proper capitalization and fade transition effect.
         Allow toggling between German and English until feedback is given.
         """
         if self.feedback_given:
             return  # Prevent flipping after feedback is given
+        if self._card_flipped_at is None and self._card_shown_at:
+            # Time the user took to recall the word before the first flip
+            self._card_flipped_at = time.perf_counter()
+            self.latency.record('user.flip', (self._card_flipped_at - self._card_shown_at) * 1000)
 
         self.card_front = not self.card_front
 
         # Cancel any ongoing fade transition
-        if self._fade_after_id:
-            self.master.after_cancel(self._fade_after_id)
-            self._fade_after_id = None
+        self.animator.cancel()
 
         # Apply fade-out effect before changing text
         self._fade_transition(self.card_label, 1.0, 0.0, steps=10, delay=self.transition_delay // 2)
@@ -1461,29 +1741,21 @@ class WordWizardApp:
             colors = self.dark_colors if self.dark_mode else self.light_colors
             if self.card_front:
                 # Show German side with proper capitalization
-                display_text = self._capitalize_german_word(self.current_card['german'])
+                display_text = self._capitalize_german_word(self.current_card.german)
+                self._apply_card_fonts(display_text)
                 self.card_label.config(text=display_text, foreground=colors['fg'])
                 self.example_label.config(text="",
                                           background=colors['bg'],
                                           foreground=colors['fg'])
             else:
                 # Show English side with proper capitalization and spacing for slashes
-                english_text = self.current_card['english']
-                if '/' in english_text:
-                    words = english_text.split('/')
-                    capitalized_english = ' / '.join(word.strip().capitalize() for word in words)
-                else:
-                    capitalized_english = ' '.join(word.capitalize() for word in english_text.split())
+                capitalized_english = self._english_display_text(self.current_card.english)
+                examples_text = self._examples_display_text(self.current_card)
+                self._apply_card_fonts(capitalized_english, examples_text)
                 self.card_label.config(text=capitalized_english, foreground=colors['fg'])
-                if 'examples' in self.current_card:
-                    examples_text = "\n".join(f"• {ex}" for ex in self.current_card['examples'])
-                    self.example_label.config(text=examples_text,
-                                              background=colors['card_bg'],
-                                              foreground=colors['fg'])
-                elif 'example' in self.current_card:
-                    self.example_label.config(text=self.current_card['example'],
-                                              background=colors['card_bg'],
-                                              foreground=colors['fg'])
+                self.example_label.config(text=examples_text,
+                                          background=colors['card_bg'],
+                                          foreground=colors['fg'])
 
             # Apply fade-in effect after changing text
             self._fade_transition(self.card_label, 0.0, 1.0, steps=10, delay=self.transition_delay // 2)
@@ -1509,18 +1781,17 @@ class WordWizardApp:
         # Otherwise, capitalize only the first word
         return word.capitalize()
 
+    @_timed('ui.answer_feedback')
     def answer_feedback(self, correct: bool):
         """Handle feedback for correct/incorrect answers, allowing only one feedback per card."""
-        if not self.current_card or self.feedback_given:
+        if not self.current_card or self.session is None or self.feedback_given:
             return
 
         self.feedback_given = True
         colors = self.dark_colors if self.dark_mode else self.light_colors
 
         # Cancel any ongoing fade transition
-        if self._fade_after_id:
-            self.master.after_cancel(self._fade_after_id)
-            self._fade_after_id = None
+        self.animator.cancel()
 
         # Update card appearance and play feedback sound
         if correct:
@@ -1529,70 +1800,22 @@ class WordWizardApp:
                 self.play_feedback_sound(True)
             except Exception as e:
                 print(f"Feedback sound error in answer_feedback: {e}")
-            self.stats['correct'] += 1
             self.correct_streak += 1
-            level = self.current_card.get('level')
-            if level:
-                if level not in self.stats['by_level']:
-                    self.stats['by_level'][level] = {'correct': 0, 'incorrect': 0}
-                self.stats['by_level'][level]['correct'] += 1
-            category = self.current_card.get('category')
-            if category:
-                if category not in self.stats['by_category']:
-                    self.stats['by_category'][category] = {'correct': 0, 'incorrect': 0}
-                self.stats['by_category'][category]['correct'] += 1
         else:
             self.card_label.config(foreground=colors['incorrect'])
             try:
                 self.play_feedback_sound(False)
             except Exception as e:
                 print(f"Feedback sound error in answer_feedback: {e}")
-            self.stats['incorrect'] += 1
             self.correct_streak = 0
-            level = self.current_card.get('level')
-            if level:
-                if level not in self.stats['by_level']:
-                    self.stats['by_level'][level] = {'correct': 0, 'incorrect': 0}
-                self.stats['by_level'][level]['incorrect'] += 1
-            category = self.current_card.get('category')
-            if category:
-                if category not in self.stats['by_category']:
-                    self.stats['by_category'][category] = {'correct': 0, 'incorrect': 0}
-                self.stats['by_category'][category]['incorrect'] += 1
-
-            german_word = self.current_card.get('german')
-            if german_word:
-                if german_word not in self.stats['difficult_words']:
-                    self.stats['difficult_words'][german_word] = 0
-                self.stats['difficult_words'][german_word] += 1
-
-        # Update daily streak
-        today = datetime.now().date()
-        last_review_date = self.stats.get('last_review_date')
-
-        if last_review_date:
-            if isinstance(last_review_date, str):
-                last_date = datetime.fromisoformat(last_review_date).date()
-            else:
-                last_date = last_review_date
-
-            if today == last_date + timedelta(days=1):
-                self.stats['streak'] += 1
-            elif today > last_date + timedelta(days=1):
-                self.stats['streak'] = 1
-        else:
-            self.stats['streak'] = 1
-
-        self.stats['last_review_date'] = today.isoformat()
-        self.stats['total_reviews'] += 1
-
-        # Update Leitner box
-        if correct:
-            self.current_card['box'] = min(self.current_card.get('box', 1) + 1, 5)
-        else:
-            self.current_card['box'] = max(self.current_card.get('box', 1) - 1, 1)
 
-        self.save_data()
+        now = time.perf_counter()
+        response_ms = (now - self._card_shown_at) * 1000 if self._card_shown_at else 0
+        if self._card_flipped_at:
+            self.latency.record('user.answer', (now - self._card_flipped_at) * 1000)
+        # Stats, Leitner box, schedule, journal and review log are all updated by the deck
+        self.session.answer(correct, response_ms=response_ms)
+        self._report_persistence_error()
 
         # Check for streak milestones
         if correct and self.correct_streak % 10 == 0:
@@ -1605,7 +1828,8 @@ class WordWizardApp:
             self.incorrect_btn.config(state='disabled')
 
             # Move to next card after delay
-            self.current_card_idx += 1
+            self.session.advance()
+            self._next_card_due = time.perf_counter() + self.transition_delay / 1000
             self.master.after(self.transition_delay, self.show_next_card)
 
     def show_custom_review_options(self):
@@ -1614,40 +1838,6 @@ class WordWizardApp:
         self.custom_frame.pack(fill="both", expand=True)
         self.update_status("Customize your review session")
 
-    def setup_custom_frame(self):
-        """Set up the custom review frame with level, category, and card count selection"""
-        self.custom_frame = ttk.Frame(self.main_frame)
-        self.custom_frame.pack(fill="both", expand=True, padx=20, pady=20)
-
-        # Title
-        ttk.Label(self.custom_frame, text="Custom Review", style='Title.TLabel').pack(pady=10)
-
-        # Level selection
-        ttk.Label(self.custom_frame, text="Select Level:").pack(anchor="w")
-        levels = ["All", "A1", "A2", "B1", "B2", "C1", "C2"]
-        ttk.Combobox(self.custom_frame, textvariable=self.level_var, values=levels, state="readonly").pack(fill="x",
-                                                                                                           pady=5)
-
-        # Category selection
-        ttk.Label(self.custom_frame, text="Select Category:").pack(anchor="w")
-        categories = ["All"] + sorted(set(card.get('category', 'Unknown') for card in self.flashcards))
-        ttk.Combobox(self.custom_frame, textvariable=self.category_var, values=categories, state="readonly").pack(
-            fill="x", pady=5)
-
-        # Card count selection
-        ttk.Label(self.custom_frame, text="Select Number of Cards:").pack(anchor="w")
-        card_counts = ["10", "20", "50", "100"]
-        ttk.Combobox(self.custom_frame, textvariable=self.default_cards_var, values=card_counts, state="readonly").pack(
-            fill="x", pady=5)
-
-        # Start and back buttons
-        btn_frame = ttk.Frame(self.custom_frame)
-        btn_frame.pack(pady=20)
-        ttk.Button(btn_frame, text="Start Review",
-                   command=lambda: [self.play_sound(), self.start_custom_review()]).pack(side="left", padx=10)
-        ttk.Button(btn_frame, text="Back to Menu", command=lambda: [self.play_sound(), self.show_menu()]).pack(
-            side="left", padx=10)
-
     def start_custom_review(self):
         """Start a custom review session based on selected level, category, and card count"""
         self.correct_streak = 0
@@ -1661,37 +1851,24 @@ class WordWizardApp:
             max_cards = self.max_cards
             self.word_count_var.set(str(self.max_cards))  # Reset to default if invalid
 
-        # Filter cards based on level and category
-        filtered_cards = self.flashcards.copy()
-        if selected_level and selected_level != "All":
-            filtered_cards = [card for card in filtered_cards if card.get('level') == selected_level]
-        if selected_category and selected_category != "All":
-            filtered_cards = [card for card in filtered_cards if card.get('category') == selected_category]
-
-        # Ensure we don't exceed available cards
-        if not filtered_cards:
+        # Select up to max_cards unique cards of the chosen level and category, most overdue first
+        level = selected_level if selected_level and selected_level != "All" else None
+        category = selected_category if selected_category and selected_category != "All" else None
+        session = self.deck.session(max_cards, level=level, category=category)
+        if not session:
             messagebox.showinfo("No Cards", "No cards available for the selected level or category.")
             return
 
-        # Select exactly max_cards unique cards
-        try:
-            self.review_cards = random.sample(filtered_cards, k=min(max_cards, len(filtered_cards)))
-            # Sort selected cards by Leitner box to prioritize lower-box cards
-            self.review_cards.sort(key=lambda card: card.get('box', 1))
-        except ValueError as e:
-            messagebox.showerror("Error", f"Failed to select cards: {str(e)}")
-            return
-
-        self.current_card_idx = 0
+        self.session = session
         self.session_start_time = datetime.now()
 
         # Update status with levels and categories
-        levels = sorted(set(card.get('level', '') for card in self.review_cards if card.get('level')))
-        categories = sorted(set(card.get('category', '') for card in self.review_cards if card.get('category')))
+        levels = session.levels()
+        categories = session.categories()
         levels_text = "All levels" if len(levels) >= 5 else ', '.join(levels) if levels else "No levels"
         categories_text = "All categories" if len(categories) >= 8 else ', '.join(
             categories) if categories else "No categories"
-        self.update_status(f"Reviewing {len(self.review_cards)} cards ({levels_text}) ({categories_text})")
+        self.update_status(f"Reviewing {len(session)} cards ({levels_text}) ({categories_text})")
 
         self.hide_all_frames()
         self.review_frame.pack(fill="both", expand=True)
@@ -1699,83 +1876,164 @@ class WordWizardApp:
 
     def review_difficult_words(self):
         """Review words marked as difficult"""
-        if not self.stats['difficult_words']:
+        if not self.deck.stats.data['difficult_words']:
             messagebox.showinfo("No Difficult Words", "You haven't marked any words as difficult yet.")
             return
 
-        difficult_words = [word for word in self.stats['difficult_words'].keys()]
-
-        self.review_cards = [card for card in self.flashcards if card['german'] in difficult_words]
-
-        if not self.review_cards:
+        session = self.deck.difficult_session()
+        if not session:
             messagebox.showinfo("No Cards", "No cards available for review.")
             return
 
-        random.shuffle(self.review_cards)
-        self.current_card_idx = 0
-        self.max_cards = len(self.review_cards)
+        self.session = session
+        self.max_cards = len(session)
         self.show_next_card()
         self.hide_all_frames()
         self.review_frame.pack(fill="both", expand=True)
-        self.update_status(f"Reviewing {len(self.review_cards)} difficult words")
+        self.update_status(f"Reviewing {len(session)} difficult words")
 
     def show_stats(self):
         """Show statistics screen"""
         self.hide_all_frames()
-
-        # Recreate stats frame completely to prevent duplicates
         self.setup_stats_frame()
-
+        self._update_stats_view()
+        self._update_stats_charts()
         self.stats_frame.pack(fill="both", expand=True)
         self.update_status("Viewing statistics")
 
-        # Calculate accuracy
-        total = self.stats['correct'] + self.stats['incorrect']
-        accuracy = (self.stats['correct'] / total * 100) if total > 0 else 0
-
-        # Update general stats - now combined in single labels
-        self.stats_labels['total_reviews'].config(text=f"Total Reviews: {self.stats['total_reviews']}")
-        self.stats_labels['correct'].config(text=f"Correct: {self.stats['correct']}")
-        self.stats_labels['incorrect'].config(text=f"Incorrect: {self.stats['incorrect']}")
-        self.stats_labels['accuracy'].config(text=f"Accuracy: {accuracy:.1f}%")
-        self.stats_labels['streak'].config(text=f"Streak: {self.stats.get('streak', 0)} day")
-
-        # Update level stats - now combined in single label
+    def _stats_view_model(self) -> Dict[str, Any]:
+        """Display values for the stats screen, keyed by widget."""
+        stats = self.deck.stats
+        today = datetime.now().date()
+        accuracy = stats.accuracy(stats.data['correct'], stats.data['incorrect'])
+        day_correct, day_incorrect = stats.window(1, today)
+        week_correct, week_incorrect = stats.window(7, today)
+        model = {
+            'total_reviews': f"Total Reviews: {stats.data['total_reviews']}",
+            'correct': f"Correct: {stats.data['correct']}",
+            'incorrect': f"Incorrect: {stats.data['incorrect']}",
+            'accuracy': f"Accuracy: {accuracy:.1f}%",
+            'streak': f"Streak: {stats.data.get('streak', 0)} day",
+            'today': f"Today: {day_correct + day_incorrect} reviews, "
+                     f"{stats.accuracy(day_correct, day_incorrect):.1f}%",
+            'week': f"This Week: {week_correct + week_incorrect} reviews, "
+                    f"{stats.accuracy(week_correct, week_incorrect):.1f}%"
+        }
         for level in ['A1', 'A2', 'B1', 'B2', 'C1']:
-            if level in self.stats['by_level']:
-                correct = self.stats['by_level'][level]['correct']
-                incorrect = self.stats['by_level'][level]['incorrect']
-                total = correct + incorrect
-                level_acc = (correct / total * 100) if total > 0 else 0
-                self.level_stats_labels[level].config(text=f"{level}: {level_acc:.1f}% ({correct}/{total})")
+            correct, incorrect = stats.lifetime('by_level', level)
+            if correct + incorrect:
+                model[level] = f"{level}: {stats.accuracy(correct, incorrect):.1f}% ({correct}/{correct + incorrect})"
+            else:
+                model[level] = f"{level}: 0% (0/0)"
+        difficult_words = stats.data.get('difficult_words', {})
+        if difficult_words:
+            sorted_words = sorted(difficult_words.items(), key=lambda x: x[1], reverse=True)
+            model['difficult_words'] = (tuple(f"{word} ({count})" for word, count in sorted_words),
+                                        f"Difficult Words ({len(sorted_words)} Unique Words)")
+        else:
+            model['difficult_words'] = (("No difficult words yet",), "No difficult words yet")
+        return model
+
+    def _update_stats_view(self) -> None:
+        """Push only the stats values that changed since the screen was last shown to its widgets."""
+        model = self._stats_view_model()
+        for key, value in model.items():
+            if self._stats_view.get(key) == value:
+                continue
+            if key == 'difficult_words':
+                self.difficult_words_menu['values'] = value[0]
+            elif key in self.stats_labels:
+                self.stats_labels[key].config(text=value)
             else:
-                self.level_stats_labels[level].config(text=f"{level}: 0% (0/0)")
+                self.level_stats_labels[key].config(text=value)
+        # Selecting a word replaces the combobox summary text, so restore it on every visit
+        if self.stats_var.get() != model['difficult_words'][1]:
+            self.stats_var.set(model['difficult_words'][1])
+        self._stats_view = model
 
     def show_stats_chart(self):
-        """Show a bar chart of accuracy by level"""
-        import matplotlib.pyplot as plt
-
-        # Calculate accuracy by level
-        levels = ['A1', 'A2', 'B1', 'B2', 'C1']
-        accuracies = []
-        for level in levels:
-            if level in self.stats['by_level']:
-                correct = self.stats['by_level'][level]['correct']
-                incorrect = self.stats['by_level'][level]['incorrect']
-                total = correct + incorrect
-                accuracy = (correct / total * 100) if total > 0 else 0
-                accuracies.append(accuracy)
-            else:
-                accuracies.append(0)
+        """Show or hide the charts panel on the stats screen."""
+        if self.chart_canvas is None:
+            self._setup_stats_charts()
+        self._charts_visible = not self._charts_visible
+        if not self._charts_visible:
+            self.chart_canvas.pack_forget()
+            self.stats_chart_btn.config(text="Show Statistics Chart")
+            return
+        self.chart_canvas.pack(fill="both", expand=True, padx=20, before=self.stats_chart_btn)
+        self.stats_chart_btn.config(text="Hide Statistics Chart")
+        self._update_stats_charts()
 
-        # Create bar chart
-        plt.figure(figsize=(8, 4))
-        plt.bar(levels, accuracies, color=['#4CAF50', '#81C784', '#FFB300', '#FF5722', '#0288D1'])
-        plt.title('Accuracy by Level (%)')
-        plt.xlabel('Level')
-        plt.ylabel('Accuracy (%)')
-        plt.ylim(0, 100)
-        plt.show()
+    def _setup_stats_charts(self):
+        """Create the chart canvas, its charts and the export button (first time the charts are shown)."""
+        colors = self.dark_colors if self.dark_mode else self.light_colors
+        self.chart_canvas = tk.Canvas(self.stats_frame, height=320, highlightthickness=0, bg=colors['card_bg'])
+        self.stats_charts = {
+            'level': BarChart(self.chart_canvas, "Accuracy by Level (%)", max_value=100),
+            'category': BarChart(self.chart_canvas, "Accuracy by Category (%)", max_value=100),
+            'box': BarChart(self.chart_canvas, "Cards per Box"),
+            'history': BarChart(self.chart_canvas, "Reviews, Last 14 Days")
+        }
+        self.chart_canvas.bind('<Configure>', lambda event: self._layout_stats_charts(event.width, event.height))
+        export_btn = ttk.Button(self.stats_frame, text="Export Chart...",
+                                command=lambda: [self.play_sound(), self.export_stats_chart()])
+        export_btn.pack(pady=(0, 5), before=self.stats_chart_btn)
+        export_btn.bind('<Return>', lambda event: "break")
+        export_btn.bind('<space>', lambda event: "break")
+
+    def _layout_stats_charts(self, width: int, height: int) -> None:
+        """Place the four charts in a 2x2 grid filling the canvas."""
+        half_width, half_height = width // 2, height // 2
+        for i, chart in enumerate(self.stats_charts.values()):
+            x, y = (i % 2) * half_width, (i // 2) * half_height
+            chart.place(x, y, x + half_width, y + half_height)
+
+    def _stats_chart_series(self) -> Dict[str, List[tuple]]:
+        """Chart data straight from the stats and the deck indexes; nothing is rescanned."""
+        stats = self.deck.stats
+        level_series = [(level, stats.accuracy(*stats.lifetime('by_level', level)))
+                        for level in ALLOWED_LEVELS]
+        category_series = [(category[:4], stats.accuracy(*stats.lifetime('by_category', category)))
+                           for category in ALLOWED_CATEGORIES]
+        box_series = [(str(box), len(self.deck.index.by_box.get(box, ()))) for box in range(1, 6)]
+        history_series = [(str(day.day), correct + incorrect)
+                          for day, correct, incorrect in stats.daily_reviews(14, datetime.now().date())]
+        return {'level': level_series, 'category': category_series, 'box': box_series, 'history': history_series}
+
+    def _update_stats_charts(self) -> None:
+        if not self._charts_visible:
+            return
+        colors = self.dark_colors if self.dark_mode else self.light_colors
+        self.chart_canvas.configure(bg=colors['card_bg'])
+        for name, series in self._stats_chart_series().items():
+            self.stats_charts[name].set_foreground(colors['fg'])
+            self.stats_charts[name].update(series)
+
+    def export_stats_chart(self):
+        """Save the stats charts as a high-resolution PNG (needs matplotlib)."""
+        Figure = _load_matplotlib_figure()
+        if Figure is None:
+            messagebox.showinfo("Export Unavailable", "Install matplotlib (python3-matplotlib) to export charts.")
+            return
+        filepath = filedialog.asksaveasfilename(title="Export Statistics Chart", defaultextension=".png",
+                                                filetypes=[("PNG files", "*.png"), ("SVG files", "*.svg"),
+                                                           ("PDF files", "*.pdf")])
+        if not filepath:
+            return
+        try:
+            figure = Figure(figsize=(10, 7))
+            for i, (name, series) in enumerate(self._stats_chart_series().items(), 1):
+                axes = figure.add_subplot(2, 2, i)
+                axes.bar([label for label, _ in series], [value for _, value in series], color=BarChart.BAR_COLORS)
+                axes.set_title(self.stats_charts[name].title if name in self.stats_charts else name)
+                if name in ('level', 'category'):
+                    axes.set_ylim(0, 100)
+            figure.tight_layout()
+            figure.savefig(filepath, dpi=200)
+            self.update_status(f"Exported chart to {os.path.basename(filepath)}")
+        except Exception as e:
+            logging.error(f"Chart export failed: {str(e)}")
+            messagebox.showerror("Export Error", f"Failed to export chart: {str(e)}")
 
     def show_add_word_frame(self):
         self.hide_all_frames()
@@ -1797,14 +2055,13 @@ class WordWizardApp:
         if not new_word['english']:
             errors.append("English translation is required.")
         if not new_word['level']:
-            errors.append("Level (A1, A2, B1, B2, C1) is required.")
+            errors.append(f"Level ({', '.join(ALLOWED_LEVELS)}) is required.")
         elif not WordWizardApp._validate_level(new_word['level']):
-            errors.append("Level must be A1, A2, B1, B2, or C1.")
-        if new_word['german'] in [card['german'] for card in self.flashcards]:
+            errors.append(f"Level must be {', '.join(ALLOWED_LEVELS[:-1])}, or {ALLOWED_LEVELS[-1]}.")
+        if new_word['german'] in self.deck.index:
             errors.append("This German word already exists.")
         if new_word['category'] and not WordWizardApp._validate_category(new_word['category']):
-            errors.append(
-                "Category must be Noun, Verb, Adjective, Adverb, Pronoun, Preposition, Conjunction, Interjection, or empty.")
+            errors.append(f"Category must be {', '.join(ALLOWED_CATEGORIES)}, or empty.")
 
         # Collect example sentences
         for field in ['example1', 'example2']:
@@ -1823,19 +2080,12 @@ class WordWizardApp:
         # Remove temporary example fields from new_word
         del new_word['example1']
         del new_word['example2']
-        self.flashcards.append(new_word)
-        self.save_data()
+        new_card, _ = Card.from_dict(new_word)
+        self.deck.add(new_card)
 
-        # Verify the word was saved to the file
-        try:
-            with open(self.vocab_file, 'r', encoding='utf-8') as f:
-                saved_flashcards = json.load(f)
-            if any(card['german'] == new_word['german'] for card in saved_flashcards):
-                messagebox.showinfo("Success", f"New word added: {new_word['german']}")
-            else:
-                messagebox.showerror("Error", f"Word {new_word['german']} was not saved to file.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to verify saved word: {str(e)}")
+        # The deck journals the new word; pending background write errors are reported instead of the success message
+        if self._report_persistence_error():
+            messagebox.showinfo("Success", f"New word added: {new_word['german']}")
 
         self.show_menu()
 
@@ -1848,123 +2098,318 @@ class WordWizardApp:
     def toggle_dark_mode(self):
         """Toggle dark mode on/off"""
         self.dark_mode = self.dark_mode_var.get()
-        self.user_config['dark_mode'] = self.dark_mode
+        self.deck.update_config(dark_mode=self.dark_mode)
+        self._report_persistence_error()
         self.apply_theme()
 
     def toggle_favorite(self):
         """Toggle the favorite status of the current card and ensure keyboard bindings remain active."""
         if not self.current_card:
             return
-        german_word = self.current_card['german']
-        for card in self.flashcards:
-            if card['german'] == german_word:
-                card['favorite'] = not card.get('favorite', False)
-                self.star_btn.config(text="★" if card['favorite'] else "☆")
-                self.save_data()  # Ensure data is saved immediately
-                break
+        card = self.deck.index.get(self.current_card.german)
+        if card is not None:
+            self.deck.set_favorite(card, not card.favorite)
+            self.star_btn.config(text="★" if card.favorite else "☆")
+            self._report_persistence_error()
         # Rebind keyboard events to ensure they remain active
         self.bind_keyboard_events()
 
     def review_favorites(self):
         """Review favorited words."""
-        self.review_cards = [card for card in self.flashcards if card.get('favorite', False)]
-        if not self.review_cards:
+        session = self.deck.favorites_session()
+        if not session:
             messagebox.showinfo("No Favorites", "You haven't marked any words as favorites yet.")
             return
-        random.shuffle(self.review_cards)
-        self.current_card_idx = 0
-        self.max_cards = len(self.review_cards)
+        self.session = session
+        self.max_cards = len(session)
         self.show_next_card()
         self.hide_all_frames()
         self.review_frame.pack(fill="both", expand=True)
-        self.update_status(f"Reviewing {len(self.review_cards)} favorite words")
+        self.update_status(f"Reviewing {len(session)} favorite words")
 
     def toggle_sound(self):
         """Toggle sound effects on/off"""
         self.sound_enabled = self.sound_var.get()
-        self.user_config['sound_enabled'] = self.sound_enabled
+        if self.sound_enabled:
+            self.sound_bank.load_async()  # No-op if sounds are loaded or loading already
+        self.deck.update_config(sound_enabled=self.sound_enabled)
+        self._report_persistence_error()
 
     def save_settings(self):
         """Save all settings including transition delay and keyboard navigation."""
         self.max_cards = int(self.default_cards_var.get())
         self.transition_delay = int(self.transition_delay_var.get())
         self.keyboard_enabled = self.keyboard_enabled_var.get()  # Save keyboard navigation setting
-        self.user_config['max_cards'] = self.max_cards
-        self.user_config['transition_delay'] = self.transition_delay
-        self.user_config['keyboard_enabled'] = self.keyboard_enabled
-        self.save_data()
+        self.deck.update_config(max_cards=self.max_cards, transition_delay=self.transition_delay,
+                                keyboard_enabled=self.keyboard_enabled)
+        self._report_persistence_error()
         messagebox.showinfo("Success", "Settings saved successfully!")
         self.show_menu()
 
+    @log_timing
+    def switch_profile(self, name: Optional[str]) -> None:
+        """Save and close the current profile and load another one ("" or None for the shared full deck)."""
+        name = name.strip() if name else None
+        if (name or None) == self.profile:
+            return
+        try:
+            deck = self._open_deck(name or None)
+        except ValueError as e:
+            messagebox.showerror("Invalid Profile", str(e))
+            return
+        self.animator.cancel()
+        self.cancel_transfers()
+        self.session = None
+        self.current_card = None
+        self.deck.close()
+        self.deck = deck
+        self.profile = name or None
+        self.load_data()
+        self.refresh_category_choices()
+        self.apply_theme()
+        self._stats_view = {}  # Redraw every stats value for the new profile
+        self.profile_var.set(self.profile or "")
+        if self.profile_combo:
+            self.profile_combo['values'] = list_profiles(self.data_path)
+        logging.info(f"Switched to profile {self.profile or '(shared deck)'}")
+        self.update_status(f"Profile: {self.profile or 'shared deck'}")
+
     def show_import_dialog(self):
         """Show file dialog for importing vocabulary"""
         filepath = filedialog.askopenfilename(
-            title="Select Vocabulary JSON File",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            title="Select Vocabulary File",
+            filetypes=[("Vocabulary files", "*.json *.jsonl *.ndjson *.csv *.tsv *.txt"), ("JSON files", "*.json"),
+                       ("JSON Lines files", "*.jsonl *.ndjson"), ("CSV files", "*.csv"), ("TSV files", "*.tsv"),
+                       ("Anki notes", "*.txt"),
+                       ("All files", "*.*")]
         )
         if filepath:
             self.import_vocabulary(filepath)
 
     def import_vocabulary(self, filepath):
-        """Import vocabulary from JSON file"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                new_words = json.load(f)
-
-            if not isinstance(new_words, list):
-                raise ValueError("JSON file should contain an array of word objects")
+        """Import vocabulary from a JSON, JSON Lines, CSV/TSV or Anki notes file.
 
-            # Merge with existing words (avoid duplicates)
-            existing_words = {word['german'] for word in self.flashcards}
-            added_count = 0
-
-            for word in new_words:
-                if word['german'] not in existing_words:
-                    self.flashcards.append(word)
-                    added_count += 1
-                    existing_words.add(word['german'])
+        The file is parsed on a worker thread; batches of new cards are added to the deck here on the Tk
+        thread (see _commit_import) with progress in the status bar, and the deck is saved at the end.
+        """
+        if self._import_stop is not None:
+            messagebox.showinfo("Import Running", "Please wait for the current import to finish.")
+            return False
+        try:
+            fmt = detect_format(filepath)
+        except OSError as e:
+            messagebox.showerror("Import Error", f"Failed to import vocabulary: {str(e)}")
+            return False
+        progress = ImportProgress()
+        batches = queue.Queue(maxsize=4)  # Bounds memory: the reader waits while the Tk thread catches up
+        stop = self._import_stop = threading.Event()
 
+        def read():
+            try:
+                for batch in read_cards(filepath, fmt, progress=progress, stop=stop):
+                    batches.put(batch)
+                batches.put(None)
+            except Exception as e:
+                batches.put(e)
+
+        threading.Thread(target=read, name="word-wizard-import", daemon=True).start()
+        self.update_status(f"Importing {os.path.basename(filepath)}...")
+        self.master.after(50, self._commit_import, self.deck, filepath, batches, progress, stop)
+        return True
+
+    def _commit_import(self, deck, filepath, batches, progress, stop):
+        """Add the batches read so far to the deck and report progress; runs every 50 ms until the import ends."""
+        if stop.is_set():
+            # Cancelled by a profile switch or closing the window: unblock the reader so it sees stop and exits
+            while not batches.empty():
+                batches.get_nowait()
+            return
+        deadline = time.perf_counter() + 0.03  # Short slices keep reviews and animations responsive
+        while time.perf_counter() < deadline:
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(batch, list):
+                progress.commit(len(batch), deck.add_cards(batch))
+                continue
+            self._import_stop = None
             self.save_data()
-            messagebox.showinfo("Success", f"Added {added_count} new words!")
-            return True
+            self.refresh_category_choices()  # Imported words may bring new categories
+            if batch is None:
+                logging.info(f"Imported {filepath}: {progress.summary()}")
+                self.update_status(progress.summary())
+                messagebox.showinfo("Success", f"{progress.summary()}!")
+            else:
+                logging.error(f"Error importing {filepath}: {str(batch)}")
+                self.update_status(f"Import failed after adding {progress.added} words")
+                messagebox.showerror("Import Error", f"Failed to import vocabulary: {str(batch)}\n\n"
+                                                     f"{progress.summary()} before the error.")
+            return
+        self.update_status(f"Importing {os.path.basename(filepath)}: {progress.fraction:.0%} "
+                           f"({progress.added} new words)")
+        self.master.after(50, self._commit_import, deck, filepath, batches, progress, stop)
 
-        except Exception as e:
-            messagebox.showerror("Import Error", f"Failed to import vocabulary: {str(e)}")
-            return False
+    def cancel_transfers(self):
+        """Stop a running import or export. Words imported so far stay in the deck; a stopped export writes nothing."""
+        for stop in (self._import_stop, self._export_stop):
+            if stop is not None:
+                stop.set()
+        self._import_stop = self._export_stop = None
 
     def show_export_dialog(self):
-        """Show file dialog for exporting vocabulary"""
+        """Show the export options; the file is chosen when exporting"""
+        self.hide_all_frames()
+        self.export_frame.pack(fill="both", expand=True)
+        self.update_status("Export vocabulary")
+
+    def choose_export_file(self):
+        """Ask where to save the export, then start it with the options chosen on the export frame"""
+        format_label = self.export_vars["format"].get()
+        fmt, extension = EXPORT_FORMAT_CHOICES[format_label]
+        compression, suffix = EXPORT_COMPRESSION_CHOICES[self.export_vars["compression"].get()]
         filepath = filedialog.asksaveasfilename(
             title="Save Vocabulary As",
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            defaultextension=extension + suffix,
+            filetypes=[(f"{format_label} files", f"*{extension}{suffix}"), ("All files", "*.*")]
         )
-        if filepath:
-            self.export_vocabulary(filepath)
+        if not filepath:
+            return
+        level, category, box = (self.export_vars[option].get() for option in ("level", "category", "box"))
+        self.export_vocabulary(filepath, fmt, compression, level=None if level == "All" else level,
+                               category=None if category == "All" else category,
+                               box=None if box == "All" else int(box),
+                               favorite=True if self.export_vars["favorites"].get() else None)
 
-    def export_vocabulary(self, filepath):
-        """Export vocabulary to JSON file"""
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.flashcards, f, ensure_ascii=False, indent=2)
-            messagebox.showinfo("Success", "Vocabulary exported successfully!")
-            return True
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export vocabulary: {str(e)}")
+    def export_vocabulary(self, filepath, fmt=None, compression=None, level=None, category=None, box=None,
+                          favorite=None):
+        """Export vocabulary on a worker thread with progress in the status bar (options as for Deck.export).
+
+        The format and compression default to what the file extension says.
+        """
+        if self._export_stop is not None:
+            messagebox.showinfo("Export Running", "Please wait for the current export to finish.")
             return False
+        deck = self.deck
+        progress = ExportProgress()
+        result = queue.Queue()
+        stop = self._export_stop = threading.Event()
+
+        def write():
+            try:
+                deck.export(filepath, fmt, compression, level, category, box, favorite, progress=progress, stop=stop)
+                result.put(None)
+            except Exception as e:
+                result.put(e)
+
+        threading.Thread(target=write, name="word-wizard-export", daemon=True).start()
+        self.update_status(f"Exporting to {os.path.basename(filepath)}...")
+        self.master.after(50, self._watch_export, filepath, result, progress, stop)
+        return True
+
+    def _watch_export(self, filepath, result, progress, stop):
+        """Report export progress every 50 ms until the worker thread is done."""
+        if stop.is_set():
+            return  # Cancelled: the worker removes its partial file
+        try:
+            error = result.get_nowait()
+        except queue.Empty:
+            self.update_status(f"Exporting to {os.path.basename(filepath)}: {progress.fraction:.0%}")
+            self.master.after(50, self._watch_export, filepath, result, progress, stop)
+            return
+        self._export_stop = None
+        if error is None:
+            logging.info(f"Exported {progress.written} cards to {filepath}")
+            self.update_status(f"Exported {progress.written} cards")
+            messagebox.showinfo("Success", f"Exported {progress.written} cards successfully!")
+        else:
+            logging.error(f"Error exporting to {filepath}: {str(error)}")
+            self.update_status("Export failed")
+            messagebox.showerror("Export Error", f"Failed to export vocabulary: {str(error)}")
 
     def update_status(self, message):
         """Update the status bar"""
         self.status_var.set(message)
 
+    def toggle_latency_overlay(self):
+        """Show or hide the latency debug overlay (F12) in the bottom right corner of the window."""
+        if self.latency_overlay:
+            self.latency_overlay.destroy()
+            self.latency_overlay = None
+            return
+        colors = self.dark_colors if self.dark_mode else self.light_colors
+        self.latency_overlay = tk.Label(self.master, justify='left', anchor='nw', font=('Courier', 9),
+                                        background=colors['card_bg'], foreground=colors['fg'],
+                                        relief='solid', borderwidth=1)
+        self.latency_overlay.place(relx=1.0, rely=1.0, x=-4, y=-4, anchor='se')
+        self._refresh_latency_overlay()
+
+    def _refresh_latency_overlay(self):
+        if not self.latency_overlay:
+            return
+        self.latency_overlay.config(text=self.latency.report())
+        self.latency_overlay.lift()
+        self.master.after(500, self._refresh_latency_overlay)
+
+    def export_latency(self):
+        """Write the latency histograms to ~/.word_wizard/latency.json (Ctrl+F12, and on exit)."""
+        try:
+            self.latency.export(self.latency_file)
+            logging.info(f"Latency histograms exported to {self.latency_file}")
+        except Exception as e:
+            logging.error(f"Error exporting latency histograms: {str(e)}")
+
     def on_closing(self):
-        # Handle window closing event
-        self.save_data()
+        # Handle window closing event: drain the writer and compact the journal into the data files
+        self.cancel_transfers()
+        self.deck.close()
+        self.export_latency()
         self.master.destroy()
 
 
-if __name__ == "__main__":
+def run_app(profile: Optional[str] = None) -> None:
     root = tk.Tk()
-    app = WordWizardApp(root)
+    app = WordWizardApp(root, profile=profile)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
+
+
+def run_profiled(output: str, limit: int = 40, profile: Optional[str] = None) -> None:
+    """Run the app under cProfile; dump the stats to output and log the top functions by cumulative time."""
+    import cProfile
+    import io
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run_app(profile)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(limit)
+        logging.info(f"Profile written to {output}\n{report.getvalue()}")
+        print(f"Profile written to {output} (inspect with: python3 -m pstats {output})")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for /usr/bin/word-wizard."""
+    import argparse
+    parser = argparse.ArgumentParser(prog='word-wizard', description="German vocabulary flashcards.",
+                                     epilog="Terminal commands (no window): review, stats, export, import, "
+                                            "reset-boxes. See word-wizard COMMAND --help.")
+    parser.add_argument('--profile', nargs='?', metavar='FILE',
+                        const=os.path.join(log_dir, f"profile-{datetime.now():%Y%m%d-%H%M%S}.prof"),
+                        help="profile the session with cProfile and write the stats to FILE on exit "
+                             "(default: ~/.word_wizard/profile-<time>.prof)")
+    parser.add_argument('--user', type=profile_name, metavar='NAME',
+                        help="learner profile to open (default: the shared full deck)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        run_profiled(args.profile, profile=args.user)
+    else:
+        run_app(args.user)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Word Wizard's deck, session, scheduling and statistics engine, usable without Tk, pygame or matplotlib.
+
+    from word_wizard_core import Deck
+
+    deck = Deck(data_dir, config_dir)
+    deck.load()
+    session = deck.session(20, level='B1')
+    while not session.finished:
+        session.answer(correct=True)
+        session.advance()
+    deck.close()
+
+Named learner profiles share the shipped deck and store only their own changes:
+
+    deck = open_profile(data_path, 'anna', system_vocab_file)
+"""
+
+from .cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card, DeckIndex
+from .compiled import CompiledDeck, MappedCard, compile_deck
+from .deck import Deck
+from .profiles import list_profiles, open_profile, profile_dir, profile_name
+from .scheduler import Scheduler
+from .session import Session
+from .stats import ReviewLog, Stats
+from .storage import (JsonStorage, OverlayStorage, PersistenceWorker, ReviewJournal, SqliteStorage, StorageBackend,
+                      atomic_write_json, iter_json_array)
+from .transfer import ExportProgress, ImportProgress, read_cards, write_cards
+
+__all__ = ['ALLOWED_CATEGORIES', 'ALLOWED_LEVELS', 'Card', 'CompiledDeck', 'Deck', 'DeckIndex', 'ExportProgress',
+           'ImportProgress', 'JsonStorage', 'MappedCard', 'OverlayStorage', 'PersistenceWorker', 'ReviewJournal',
+           'ReviewLog', 'Scheduler', 'Session', 'SqliteStorage', 'Stats', 'StorageBackend', 'atomic_write_json',
+           'compile_deck', 'iter_json_array', 'list_profiles', 'open_profile', 'profile_dir', 'profile_name',
+           'read_cards', 'write_cards']
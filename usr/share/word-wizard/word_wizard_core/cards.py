@@ -0,0 +1,181 @@
+"""Flashcards and the in-memory indexes over a deck."""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+ALLOWED_LEVELS = ("A1", "A2", "B1", "B2", "C1")
+ALLOWED_CATEGORIES = ("Noun", "Verb", "Adjective", "Adverb", "Pronoun", "Preposition", "Conjunction", "Interjection")
+
+# Canonical (shared) string objects for levels and categories, so every card references the same instances
+_LEVELS_BY_NAME = {level: level for level in ALLOWED_LEVELS}
+_CATEGORIES_BY_NAME = {category: category for category in ALLOWED_CATEGORIES}
+
+
+class Card:
+    """A flashcard. level and category are the shared constants from ALLOWED_LEVELS/ALLOWED_CATEGORIES, or ''."""
+
+    __slots__ = ('german', 'english', 'level', 'category', 'gender', 'examples', 'box', 'favorite', 'extra',
+                 'due', 'interval', 'ease')
+    FIELDS = ('german', 'english', 'level', 'category', 'gender', 'examples', 'box', 'favorite')
+    SCHEDULE_FIELDS = ('due', 'interval', 'ease')
+
+    def __init__(self, german: str, english: str = '', level: str = '', category: str = '',
+                 gender: Optional[str] = None, examples: tuple = (), box: int = 1, favorite: bool = False,
+                 extra: Optional[Dict[str, Any]] = None, due: int = 0, interval: int = 0,
+                 ease: float = 2.5) -> None:
+        self.german = german
+        self.english = english
+        self.level = level
+        self.category = category
+        self.gender = gender
+        self.examples = examples
+        self.box = box
+        self.favorite = favorite
+        self.extra = extra  # Unknown JSON keys, preserved on export
+        self.due = due  # Unix time the card is next due; 0 means it was never reviewed
+        self.interval = interval  # Days between the last review and due
+        self.ease = ease  # SM-2 ease factor
+
+    def __reduce__(self):
+        return Card, (self.german, self.english, self.level, self.category, self.gender, self.examples, self.box,
+                      self.favorite, self.extra, self.due, self.interval, self.ease)
+
+    def __repr__(self) -> str:
+        return f"Card({self.german!r}, level={self.level!r}, category={self.category!r}, box={self.box})"
+
+    def copy(self) -> 'Card':
+        return Card(self.german, self.english, self.level, self.category, self.gender, self.examples, self.box,
+                    self.favorite, dict(self.extra) if self.extra else None, self.due, self.interval, self.ease)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Build a standardized Card from a JSON object.
+
+        Returns (card, changed); changed is True if to_dict() differs from the input, i.e. it must be written back.
+        """
+        category = (data.get('category') or '').strip().title()
+        level = (data.get('level') or '').strip().upper()
+        examples = data.get('examples')
+        if examples is None:
+            example = data.get('example')
+            examples = [example] if example else []
+        elif isinstance(examples, str):
+            examples = [examples]
+        extra = {key: value for key, value in data.items()
+                 if key not in cls.FIELDS and key not in cls.SCHEDULE_FIELDS}
+        if 'examples' not in data:
+            extra.pop('example', None)
+        card = cls(data['german'], data.get('english', ''), _LEVELS_BY_NAME.get(level, ''),
+                   _CATEGORIES_BY_NAME.get(category, ''), data.get('gender'), tuple(examples), data.get('box', 1),
+                   data.get('favorite', False), extra or None, data.get('due', 0), data.get('interval', 0),
+                   data.get('ease', 2.5))
+        return card, card.to_dict() != data
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'german': self.german,
+            'english': self.english,
+            'level': self.level,
+            'category': self.category,
+            'gender': self.gender,
+            'examples': list(self.examples),
+            'box': self.box,
+            'favorite': self.favorite
+        }
+        if self.due:
+            # Scheduling state is only written once a card has been reviewed, keeping unreviewed decks unchanged
+            data.update(due=self.due, interval=self.interval, ease=self.ease)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class DeckIndex:
+    """Hash indexes over the deck (german, level, category, box, favorites), kept up to date incrementally.
+
+    Cards must be changed through set_box/set_favorite/update so the indexes stay consistent.
+    """
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.by_german: Dict[str, Card] = {}
+        self.by_level: Dict[str, Set[Card]] = defaultdict(set)
+        self.by_category: Dict[str, Set[Card]] = defaultdict(set)
+        self.by_box: Dict[int, Set[Card]] = defaultdict(set)
+        self.favorites: Set[Card] = set()
+        for card in cards:
+            self.add(card)
+
+    def __len__(self) -> int:
+        return len(self.by_german)
+
+    def __contains__(self, german: str) -> bool:
+        return german in self.by_german
+
+    def get(self, german: str) -> Optional[Card]:
+        return self.by_german.get(german)
+
+    def add(self, card: Card) -> None:
+        self.by_german[card.german] = card
+        self.by_level[card.level].add(card)
+        self.by_category[card.category].add(card)
+        self.by_box[card.box].add(card)
+        if card.favorite:
+            self.favorites.add(card)
+
+    def remove(self, card: Card) -> None:
+        if self.by_german.get(card.german) is card:
+            del self.by_german[card.german]
+        self.by_level[card.level].discard(card)
+        self.by_category[card.category].discard(card)
+        self.by_box[card.box].discard(card)
+        self.favorites.discard(card)
+
+    def set_box(self, card: Card, box: int) -> None:
+        self.by_box[card.box].discard(card)
+        card.box = box
+        self.by_box[box].add(card)
+
+    def set_favorite(self, card: Card, favorite: bool) -> None:
+        card.favorite = favorite
+        if favorite:
+            self.favorites.add(card)
+        else:
+            self.favorites.discard(card)
+
+    def update(self, card: Card, **fields) -> None:
+        """Edit a card's fields and re-index it."""
+        self.remove(card)
+        for name, value in fields.items():
+            setattr(card, name, value)
+        self.add(card)
+
+    def select(self, level: Optional[str] = None, category: Optional[str] = None, box: Optional[int] = None,
+               favorite: Optional[bool] = None) -> Set[Card]:
+        """Return the cards matching all given filters, intersecting from the smallest index set."""
+        candidates = []
+        if level is not None:
+            candidates.append(self.by_level.get(level, set()))
+        if category is not None:
+            candidates.append(self.by_category.get(category, set()))
+        if box is not None:
+            candidates.append(self.by_box.get(box, set()))
+        if favorite:
+            candidates.append(self.favorites)
+        if not candidates:
+            result = set(self.by_german.values())
+        else:
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for other in candidates[1:]:
+                result &= other
+        if favorite is False:
+            result -= self.favorites
+        return result
+
+    def levels(self) -> List[str]:
+        """Levels that currently have at least one card, sorted."""
+        return sorted(level for level, cards in self.by_level.items() if level and cards)
+
+    def categories(self) -> List[str]:
+        """Categories that currently have at least one card, sorted."""
+        return sorted(category for category, cards in self.by_category.items() if category and cards)
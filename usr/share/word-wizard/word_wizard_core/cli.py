@@ -0,0 +1,280 @@
+"""Terminal commands for /usr/bin/word-wizard: review over stdin/stdout and batch stats, export, import,
+reset-boxes, profiles and compile-deck. Only the core package is imported, so these start without Tk, pygame
+or matplotlib.
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS
+from .compiled import compile_deck
+from .deck import Deck
+from .profiles import list_profiles, open_profile, profile_name
+from .transfer import COMPRESSIONS, FORMATS
+
+COMMANDS = ('review', 'stats', 'export', 'import', 'reset-boxes', 'profiles', 'compile-deck')
+
+# The installed app keeps data/ and config/ beside word_wizard.py, one level up from this package
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.expanduser("~/.word_wizard")
+
+
+def _category(name: str) -> str:
+    return name.strip().title()
+
+
+def open_deck(data_path: str, user: Optional[str] = None, read_only: bool = False) -> Deck:
+    """Load a profile's deck stored under data_path, as the GUI does; read_only never writes anything back."""
+    deck = open_profile(data_path, user, os.path.join(APP_DIR, 'german_flashcards.json'), read_only=read_only)
+    for warning in deck.load():
+        print(f"Warning: {warning}", file=sys.stderr)
+    return deck
+
+
+def _ask(prompt: str) -> Optional[str]:
+    """Read one answer from stdin; None at end of input."""
+    try:
+        return input(prompt).strip().lower()
+    except EOFError:
+        print()
+        return None
+
+
+def review(deck: Deck, args) -> int:
+    """Run a Leitner review session in the terminal, like start_review_session() in the GUI."""
+    count = args.count or deck.user_config.get('max_cards', 20)
+    if args.level and args.level not in deck.index.levels():
+        print(f"No {args.level}-level cards available.", file=sys.stderr)
+        return 1
+    if args.category and args.category not in deck.index.categories():
+        print(f"No cards in '{args.category}' category.", file=sys.stderr)
+        return 1
+    session = deck.session(count, level=args.level, category=args.category)
+    if not session:
+        print("No cards available for review.", file=sys.stderr)
+        return 1
+
+    print(f"Reviewing {len(session)} cards. Answer y (knew it), n (didn't) or q (quit).")
+    correct = incorrect = 0
+    while not session.finished:
+        card = session.current
+        print(f"\n[{session.index + 1}/{len(session)}] {card.level} {card.category}".rstrip())
+        print(f"  {card.german}")
+        if _ask("  Press Enter to show the answer: ") in (None, 'q'):
+            break
+        print(f"  = {card.english}")
+        for example in card.examples:
+            print(f"    • {example}")
+        answer = _ask("  Did you know it? [y/n/q] ")
+        while answer not in (None, 'q', 'y', 'n'):
+            answer = _ask("  Please answer y, n or q: ")
+        if answer in (None, 'q'):
+            break
+        session.answer(answer == 'y')
+        if answer == 'y':
+            correct += 1
+        else:
+            incorrect += 1
+        session.advance()
+
+    total = correct + incorrect
+    accuracy = deck.stats.accuracy(correct, incorrect)
+    print(f"\nReviewed {total} cards: {correct} correct, {incorrect} incorrect ({accuracy:.1f}%)")
+    return 0
+
+
+def stats_summary(deck: Deck) -> Dict[str, Any]:
+    """The figures shown on the GUI's stats screen, plus card counts per Leitner box."""
+    stats = deck.stats
+    today = datetime.now().date()
+    day_correct, day_incorrect = stats.window(1, today)
+    week_correct, week_incorrect = stats.window(7, today)
+    by_level = {}
+    for level in ALLOWED_LEVELS:
+        level_correct, level_incorrect = stats.lifetime('by_level', level)
+        by_level[level] = {'correct': level_correct, 'incorrect': level_incorrect,
+                           'accuracy': round(stats.accuracy(level_correct, level_incorrect), 1)}
+    difficult_words = sorted(stats.data.get('difficult_words', {}).items(), key=lambda x: x[1], reverse=True)
+    return {
+        'cards': len(deck),
+        'boxes': {box: len(deck.index.select(box=box)) for box in range(1, 6)},
+        'total_reviews': stats.data['total_reviews'],
+        'correct': stats.data['correct'],
+        'incorrect': stats.data['incorrect'],
+        'accuracy': round(stats.accuracy(stats.data['correct'], stats.data['incorrect']), 1),
+        'streak': stats.data.get('streak', 0),
+        'today': {'reviews': day_correct + day_incorrect,
+                  'accuracy': round(stats.accuracy(day_correct, day_incorrect), 1)},
+        'week': {'reviews': week_correct + week_incorrect,
+                 'accuracy': round(stats.accuracy(week_correct, week_incorrect), 1)},
+        'by_level': by_level,
+        'difficult_words': dict(difficult_words)
+    }
+
+
+def stats(deck: Deck, args) -> int:
+    summary = stats_summary(deck)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0
+    print(f"Cards: {summary['cards']} (boxes 1-5: "
+          f"{', '.join(str(count) for count in summary['boxes'].values())})")
+    print(f"Total Reviews: {summary['total_reviews']}")
+    print(f"Correct: {summary['correct']}")
+    print(f"Incorrect: {summary['incorrect']}")
+    print(f"Accuracy: {summary['accuracy']:.1f}%")
+    print(f"Streak: {summary['streak']} day")
+    print(f"Today: {summary['today']['reviews']} reviews, {summary['today']['accuracy']:.1f}%")
+    print(f"This Week: {summary['week']['reviews']} reviews, {summary['week']['accuracy']:.1f}%")
+    for level, counts in summary['by_level'].items():
+        answered = counts['correct'] + counts['incorrect']
+        print(f"{level}: {counts['accuracy']:.1f}% ({counts['correct']}/{answered})")
+    difficult_words = list(summary['difficult_words'].items())
+    if difficult_words:
+        print(f"Difficult Words ({len(difficult_words)} Unique Words): "
+              f"{', '.join(f'{word} ({count})' for word, count in difficult_words[:args.top])}")
+    else:
+        print("No difficult words yet")
+    return 0
+
+
+def export(deck: Deck, args) -> int:
+    def report(progress):
+        print(f"\rExporting to {args.file}: {progress.fraction:.0%}", end='', file=sys.stderr, flush=True)
+
+    progress = deck.export(args.file, fmt=args.format, compression=args.compress, level=args.level,
+                           category=args.category, box=args.box, favorite=True if args.favorites else None,
+                           callback=report if sys.stderr.isatty() else None)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    print(f"Exported {progress.written} cards to {args.file}")
+    return 0
+
+
+def import_(deck: Deck, args) -> int:
+    def report(progress):
+        print(f"\rImporting {args.file}: {progress.fraction:.0%} ({progress.added} new words)", end='',
+              file=sys.stderr, flush=True)
+
+    progress = deck.import_file(args.file, fmt=args.format, callback=report if sys.stderr.isatty() else None)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    if progress.added:
+        deck.request_save()
+    print(progress.summary())
+    return 0
+
+
+def reset_boxes(deck: Deck, args) -> int:
+    reset_count = deck.reset_boxes(level=args.level, category=args.category)
+    if reset_count:
+        deck.request_save()
+    print(f"Reset {reset_count} cards to box 1")
+    return 0
+
+
+def profiles(args) -> int:
+    for name in list_profiles(args.data_dir):
+        print(name)
+    return 0
+
+
+def compile_base(args) -> int:
+    output = args.output or os.path.splitext(args.source)[0] + '.wwdeck'
+    print(f"Compiled {compile_deck(args.source, output)} cards into {output}")
+    return 0
+
+
+def build_parser():
+    import argparse
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--data-dir', default=APP_DIR, metavar='DIR',
+                        help="directory holding the data/, config/ and profiles/ directories "
+                             "(default: %(default)s)")
+    common.add_argument('--user', type=profile_name, metavar='NAME',
+                        help="learner profile (default: the shared full deck)")
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument('--level', type=str.upper, choices=ALLOWED_LEVELS, help="only cards of this level")
+    filters.add_argument('--category', type=_category, choices=ALLOWED_CATEGORIES,
+                         help="only cards of this category")
+
+    parser = argparse.ArgumentParser(prog='word-wizard', description="Word Wizard terminal commands.")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    command = commands.add_parser('review', parents=[common, filters], help="review cards in the terminal")
+    command.add_argument('--count', type=int, help="cards in the session (default: max_cards from config)")
+    command.set_defaults(run=review)
+    command = commands.add_parser('stats', parents=[common], help="print review statistics")
+    command.add_argument('--json', action='store_true', help="print the statistics as JSON")
+    command.add_argument('--top', type=int, default=10, help="difficult words to list (default: %(default)s)")
+    command.set_defaults(run=stats)
+    command = commands.add_parser('export', parents=[common, filters],
+                                  help="export the deck as JSON, JSON Lines, CSV, TSV or Anki notes")
+    command.add_argument('file', help="output file; the format and compression follow its extension "
+                                      "(.json, .jsonl, .csv, .tsv, .txt for Anki; .gz, .bz2, .xz, .zst)")
+    command.add_argument('--format', choices=FORMATS, help="file format (default: from the extension)")
+    command.add_argument('--compress', choices=COMPRESSIONS, help="compression (default: from the extension)")
+    command.add_argument('--box', type=int, choices=range(1, 6), metavar='{1-5}', help="only cards in this box")
+    command.add_argument('--favorites', action='store_true', help="only favorite cards")
+    command.set_defaults(run=export)
+    command = commands.add_parser('import', parents=[common],
+                                  help="add new words from a JSON, JSON Lines, CSV or TSV file")
+    command.add_argument('file')
+    command.add_argument('--format', choices=FORMATS,
+                         help="file format (default: from the extension; CSV/TSV need a header row)")
+    command.set_defaults(run=import_)
+    command = commands.add_parser('reset-boxes', parents=[common, filters],
+                                  help="move cards back to Leitner box 1 as new cards")
+    command.set_defaults(run=reset_boxes)
+    command = commands.add_parser('profiles', parents=[common], help="list the learner profiles")
+    command.set_defaults(run=profiles)
+    command = commands.add_parser('compile-deck', help="compile a JSON deck into the memory-mapped format profiles "
+                                                       "read (run at install for the shipped deck)")
+    command.add_argument('source', nargs='?', default=os.path.join(APP_DIR, 'german_flashcards.json'),
+                         help="JSON deck (default: %(default)s)")
+    command.add_argument('-o', '--output', help="compiled file (default: SOURCE with a .wwdeck extension)")
+    command.set_defaults(run=compile_base)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one terminal command; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logging.basicConfig(filename=os.path.join(LOG_DIR, 'word_wizard.log'), level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.run in (profiles, compile_base):
+        # These work on files only, not on a loaded deck
+        try:
+            return args.run(args)
+        except Exception as e:
+            logging.error(f"Command '{args.command}' failed: {str(e)}")
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    try:
+        # stats and export only read: pending changes are replayed in memory, not compacted into the files
+        deck = open_deck(args.data_dir, args.user, read_only=args.run in (stats, export))
+    except Exception as e:
+        logging.error(f"Failed to load data for '{args.command}': {str(e)}")
+        print(f"Error: failed to load data: {e}", file=sys.stderr)
+        return 1
+    status = 1
+    try:
+        status = args.run(deck, args)
+    except KeyboardInterrupt:
+        print()
+        status = 130
+    except Exception as e:
+        logging.error(f"Command '{args.command}' failed: {str(e)}")
+        print(f"Error: {e}", file=sys.stderr)
+    finally:
+        # Flush queued answers and requested saves; answers stay in the journal rather than rewriting the deck
+        deck.close(save=False)
+    error = deck.take_error()
+    if error is not None:
+        print(f"Error saving data: {error}", file=sys.stderr)
+        return 1
+    return status
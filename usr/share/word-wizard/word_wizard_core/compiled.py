@@ -0,0 +1,229 @@
+"""Compiled, memory-mapped read-only decks.
+
+The shipped deck is compiled once (at install, see DEBIAN/postinst, or on first use into profiles/) into a
+binary file that every process maps read-only, so app instances and terminal commands share its pages
+through the OS cache. Layout, all little-endian:
+
+    header    magic, version, card count, mtime and size of the source JSON, section offsets
+    records   one fixed-size record per card: (offset, length) of its strings in the string table,
+              level/category codes, box, favorite and schedule
+    examples  (offset, length) of every example sentence; a record points at a run of them
+    strings   UTF-8 string table; repeated strings (genders, shared examples) are stored once
+
+Loading builds MappedCards holding only what the indexes and scheduler need (German word, level,
+category, box, favorite, schedule); english, gender, examples and extra are decoded from the map the
+first time a card is shown or exported. `word-wizard compile-deck` compiles the shipped deck.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card
+
+MAGIC = b'WWDECK\x00\x00'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIqqQQQ')  # magic, version, count, source mtime_ns, source size, 3 section offsets
+_RECORD = struct.Struct('<10I4BqId')
+_SPAN = struct.Struct('<II')
+_NONE = 0xFFFFFFFF  # String length marking None (gender, extra)
+_LEVEL_CODES = {level: code for code, level in enumerate(ALLOWED_LEVELS, 1)}
+_CATEGORY_CODES = {category: code for code, category in enumerate(ALLOWED_CATEGORIES, 1)}
+_LEVELS = ('',) + ALLOWED_LEVELS
+_CATEGORIES = ('',) + ALLOWED_CATEGORIES
+
+
+_LAZY_FIELDS = ('english', 'gender', 'examples', 'extra')
+
+
+def _lazy_field(name: str) -> property:
+    """A MappedCard attribute decoded from the map on first read and then kept in Card's slot."""
+    slot = Card.__dict__[name]
+    bit = 1 << _LAZY_FIELDS.index(name)
+
+    def read(card):
+        if card._loaded & bit:
+            return slot.__get__(card, MappedCard)
+        value = card._deck.field(card._index, name)
+        slot.__set__(card, value)
+        card._loaded |= bit
+        return value
+
+    def write(card, value):
+        slot.__set__(card, value)
+        card._loaded |= bit
+
+    return property(read, write)
+
+
+class MappedCard(Card):
+    """A Card backed by a CompiledDeck record; its text fields are decoded on first use."""
+
+    __slots__ = ('_deck', '_index', '_loaded')  # _loaded: bit per LAZY_FIELDS entry read or set so far
+    LAZY_FIELDS = _LAZY_FIELDS
+
+    english = _lazy_field('english')
+    gender = _lazy_field('gender')
+    examples = _lazy_field('examples')
+    extra = _lazy_field('extra')
+
+    def is_loaded(self, name: str) -> bool:
+        """False for a text field that has not been read or set yet, i.e. still equals the compiled value."""
+        return name not in _LAZY_FIELDS or bool(self._loaded & (1 << _LAZY_FIELDS.index(name)))
+
+    def copy(self) -> 'MappedCard':
+        card = MappedCard.__new__(MappedCard)
+        card._deck, card._index, card._loaded = self._deck, self._index, 0
+        card.german, card.level, card.category, card.box = self.german, self.level, self.category, self.box
+        card.favorite, card.due, card.interval, card.ease = self.favorite, self.due, self.interval, self.ease
+        if self._loaded:
+            for name in _LAZY_FIELDS:
+                if self.is_loaded(name):
+                    value = getattr(self, name)
+                    setattr(card, name, dict(value) if name == 'extra' and value else value)
+        return card
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Card.to_dict(); text fields never read are decoded for the dict only, so exports keep the card lazy."""
+        english, gender, examples, extra = (getattr(self, name) if self.is_loaded(name)
+                                            else self._deck.field(self._index, name) for name in _LAZY_FIELDS)
+        return Card(self.german, english, self.level, self.category, gender, examples, self.box, self.favorite,
+                    extra, self.due, self.interval, self.ease).to_dict()
+
+
+def is_loaded(card: Card, name: str) -> bool:
+    """True unless card is a MappedCard whose field name was never decoded (and so is unchanged)."""
+    return not isinstance(card, MappedCard) or card.is_loaded(name)
+
+
+class CompiledDeck:
+    """A deck file written by write_compiled_deck(), mapped read-only. Raises ValueError for other files."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"Not a compiled deck: {path}")
+            (magic, version, self.count, mtime_ns, size, self._records, self._examples,
+             self._strings) = _HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a compiled deck (version {VERSION}): {path}")
+        except ValueError:
+            self._map.close()
+            raise
+        self.source_key = (mtime_ns, size)  # Of the JSON deck it was compiled from
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == _NONE:
+            return None
+        start = self._strings + offset
+        return str(self._map[start:start + length], 'utf-8')
+
+    def cards(self) -> List[MappedCard]:
+        """One MappedCard per record, with only the fields the indexes and scheduler use decoded."""
+        cards = []
+        records = memoryview(self._map)[self._records:self._records + self.count * _RECORD.size]
+        try:
+            for index, record in enumerate(_RECORD.iter_unpack(records)):
+                card = MappedCard.__new__(MappedCard)
+                card._deck, card._index, card._loaded = self, index, 0
+                card.german = self._string(record[0], record[1])
+                card.level, card.category = _LEVELS[record[10]], _CATEGORIES[record[11]]
+                card.box, card.favorite = record[12], bool(record[13])
+                card.due, card.interval, card.ease = record[14], record[15], record[16]
+                cards.append(card)
+        finally:
+            records.release()
+        return cards
+
+    def field(self, index: int, name: str) -> Any:
+        """Decode one text field of record index."""
+        record = _RECORD.unpack_from(self._map, self._records + index * _RECORD.size)
+        if name == 'english':
+            return self._string(record[2], record[3])
+        if name == 'gender':
+            return self._string(record[4], record[5])
+        if name == 'examples':
+            first, count = record[6], record[7]
+            return tuple(self._string(*_SPAN.unpack_from(self._map, self._examples + i * _SPAN.size))
+                         for i in range(first, first + count))
+        if name == 'extra':
+            extra = self._string(record[8], record[9])
+            return json.loads(extra) if extra is not None else None
+        raise KeyError(name)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def open_compiled_deck(path: str, source_key: Tuple[int, int]) -> Optional[CompiledDeck]:
+    """Map path if it is a compiled deck built from the source with that (mtime_ns, size), else None."""
+    try:
+        deck = CompiledDeck(path)
+    except (OSError, ValueError):
+        return None
+    if deck.source_key != source_key:
+        deck.close()
+        return None
+    return deck
+
+
+def write_compiled_deck(path: str, flashcards: List[Card], source_key: Tuple[int, int]) -> None:
+    """Compile cards into path, written next to it first and swapped in so mapped readers are unaffected."""
+    strings: Dict[str, int] = {}
+    blob = bytearray()
+
+    def span(text: Optional[str]) -> Tuple[int, int]:
+        if text is None:
+            return 0, _NONE
+        data = text.encode('utf-8')
+        offset = strings.get(text)
+        if offset is None:
+            offset = strings[text] = len(blob)
+            blob.extend(data)
+        return offset, len(data)
+
+    records = bytearray()
+    examples = bytearray()
+    example_count = 0
+    for card in flashcards:
+        extra = json.dumps(card.extra, ensure_ascii=False) if card.extra else None
+        for example in card.examples:
+            examples += _SPAN.pack(*span(example))
+        records += _RECORD.pack(*span(card.german), *span(card.english), *span(card.gender), example_count,
+                                len(card.examples), *span(extra), _LEVEL_CODES.get(card.level, 0),
+                                _CATEGORY_CODES.get(card.category, 0), card.box, bool(card.favorite),
+                                int(card.due), int(card.interval), card.ease)
+        example_count += len(card.examples)
+
+    records_offset = _HEADER.size
+    examples_offset = records_offset + len(records)
+    strings_offset = examples_offset + len(examples)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(flashcards), source_key[0], source_key[1], records_offset,
+                             examples_offset, strings_offset))
+        f.write(records)
+        f.write(examples)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def compile_deck(source_file: str, output_file: str) -> int:
+    """Compile a JSON deck; returns the number of cards. Raises ValueError if the deck cannot be read."""
+    from .storage import _parse_deck_file, _source_key  # storage imports this module
+    parsed = _parse_deck_file(source_file)
+    if parsed is None:
+        raise ValueError(f"Cannot read vocabulary file {source_file}")
+    write_compiled_deck(output_file, parsed[0], _source_key(source_file))
+    return len(parsed[0])
+
@@ -0,0 +1,463 @@
+"""A user's deck: flashcards with their indexes, schedule, stats, config and storage."""
+
+import json
+import logging
+import os
+import pickle
+import random
+import shutil
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .cards import Card, DeckIndex
+from .scheduler import Scheduler
+from .session import Session
+from .stats import ReviewLog, Stats
+from .storage import (JsonStorage, OverlayStorage, PersistenceWorker, SqliteStorage, StorageBackend,
+                      _read_json_data, _validate_json_file)
+from .transfer import ExportProgress, ImportProgress, read_cards, write_cards
+
+# Written when neither the user's deck nor the shipped one can be loaded
+SAMPLE_CARDS = [
+    {
+        "german": "Haus",
+        "english": "House",
+        "level": "A1",
+        "category": "Noun",
+        "gender": "Das",
+        "examples": ["Das Haus ist groß."],
+        "box": 1,
+        "favorite": False
+    },
+    {
+        "german": "gehen",
+        "english": "to go",
+        "level": "A1",
+        "category": "Verb",
+        "gender": "",
+        "examples": ["Ich gehe zur Schule."],
+        "box": 1,
+        "favorite": False
+    }
+]
+
+
+class Deck:
+    """Flashcards, their indexes and schedule, review stats and user config, persisted by a StorageBackend.
+
+    load() reads everything from the backend selected in config.json and replays the changes recorded since
+    the last full save. Answers, favorites, new cards and config changes are applied in memory at once and
+    recorded by a background writer thread; close() flushes it. Nothing here touches Tk.
+
+    With base_file set the deck is a profile (see profiles.py): the cards come from that shared, read-only
+    deck and only the user's overlay on it is stored, whatever storage_backend says.
+
+    With read_only set (the stats and export commands) load() replays pending changes in memory only and
+    nothing is ever written back: no repair, no compaction, no saves and no journaling.
+    """
+
+    def __init__(self, data_dir: str, config_dir: str, system_vocab_file: Optional[str] = None,
+                 default_config: Optional[Dict[str, Any]] = None, save_debounce_ms: int = 1000,
+                 save_callback: Optional[Callable[[], None]] = None, base_file: Optional[str] = None,
+                 base_cache_file: Optional[str] = None, read_only: bool = False) -> None:
+        self.data_dir = data_dir
+        self.config_dir = config_dir
+        self.system_vocab_file = system_vocab_file  # Shipped deck, copied in when the user's deck is unusable
+        self.base_file = base_file
+        self.base_cache_file = base_cache_file
+        self.read_only = read_only
+        self.default_config = dict(default_config or {})
+        self.vocab_file = os.path.join(data_dir, 'german_flashcards.json')
+        self.backup_vocab_file = os.path.join(data_dir, 'backup', 'backup.json')
+        self.stats_file = os.path.join(config_dir, 'stats.json')
+        self.user_config_file = os.path.join(config_dir, 'config.json')
+        self.journal_file = os.path.join(data_dir, 'journal.jsonl')  # Per-answer changes, compacted on save
+        self.db_file = os.path.join(data_dir, 'word_wizard.db')  # Used when storage_backend is 'sqlite'
+        self.overlay_file = os.path.join(data_dir, 'overlay.json')  # Used with base_file
+        os.makedirs(data_dir if base_file else os.path.join(data_dir, 'backup'), exist_ok=True)
+        os.makedirs(config_dir, exist_ok=True)
+        self.review_log = ReviewLog(os.path.join(data_dir, 'review_events.bin'))  # Per-review history
+
+        self.flashcards: List[Card] = []
+        self.index = DeckIndex()
+        self.scheduler = Scheduler()
+        self.stats = Stats()
+        self.user_config: Dict[str, Any] = {}
+        self.storage: Optional[StorageBackend] = None
+        self.storage_backend: str = 'json'
+        self.journal_compact_threshold: int = 500
+        self.journal_seq: int = 0
+        self.lock = threading.RLock()  # Guards stats and journal_seq against the writer thread's snapshot
+        self.writer = PersistenceWorker(save_callback or self.save_snapshot, save_debounce_ms)
+
+    def __len__(self) -> int:
+        return len(self.flashcards)
+
+    # Loading
+
+    def load(self) -> List[str]:
+        """Load config, deck and stats, repairing the deck if necessary, and replay pending changes.
+
+        The deck is parsed once and only rewritten if it changed. Returns warnings to show the user;
+        raises if nothing usable could be loaded.
+        """
+        warnings = []
+        timings = []
+        phase_start = time.perf_counter()
+
+        def mark(phase):
+            nonlocal phase_start
+            now = time.perf_counter()
+            timings.append(f"{phase} {(now - phase_start) * 1000:.1f} ms")
+            phase_start = now
+
+        os.makedirs(self.data_dir if self.base_file else os.path.join(self.data_dir, 'backup'), exist_ok=True)
+        os.makedirs(self.config_dir, exist_ok=True)
+        logging.info(f"Ensured directories exist: {self.data_dir}, {self.config_dir}")
+
+        # Load user config file first: it selects the storage backend
+        if os.path.exists(self.user_config_file):
+            with open(self.user_config_file, 'r', encoding='utf-8') as f:
+                self.user_config = json.load(f)
+            logging.info(f"Loaded user config from {self.user_config_file}")
+        elif self.read_only:
+            self.user_config = dict(self.default_config)
+        else:
+            self.user_config = dict(self.default_config)
+            with open(self.user_config_file, 'w', encoding='utf-8') as f:
+                json.dump(self.user_config, f, indent=2)
+            logging.info(f"Created new user config file: {self.user_config_file}")
+        if not self.read_only and not os.path.exists(self.stats_file):
+            with open(self.stats_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stats.data, f, indent=2)
+        mark("config")
+
+        # Load deck and stats from the configured backend
+        self.storage = self._create_storage()
+        stored = self.storage.load()
+        if stored is None and self.storage.name != 'json':
+            # Seed a new backend from the JSON deck; it has to be written to the backend afterwards
+            stored = _read_json_data(self.vocab_file, self.stats_file)
+            if stored is not None:
+                stored = (stored[0], stored[1], True)
+        if stored is None and self.base_file:
+            raise ValueError(f"Base vocabulary file {self.base_file} is missing or invalid")
+        if stored is None and self.read_only:
+            # Show the shipped deck, which is what a repair would copy in, without touching the user's files
+            stored = _read_json_data(self.system_vocab_file, self.stats_file) if self.system_vocab_file else None
+            if stored is None:
+                raise ValueError(f"Vocabulary file {self.vocab_file} is missing or invalid")
+        if stored is None:
+            # Nothing usable stored yet: repair the JSON deck and load from it
+            logging.warning(f"User JSON file invalid or missing: {self.vocab_file}. Attempting repair.")
+            if not self.repair():
+                warnings.append("Failed to repair vocabulary file. Creating a default one with sample words.")
+                with open(self.vocab_file, 'w', encoding='utf-8') as f:
+                    json.dump(SAMPLE_CARDS, f, ensure_ascii=False, indent=2)
+                logging.info(f"Created default JSON file with sample words: {self.vocab_file}")
+            stored = _read_json_data(self.vocab_file, self.stats_file)
+            if stored is None:
+                raise ValueError(f"Vocabulary file {self.vocab_file} is still invalid after repair")
+            stored = (stored[0], stored[1], True)
+        self.flashcards, stats, changed = stored
+        self.index = DeckIndex(self.flashcards)
+        self.scheduler = Scheduler(self.flashcards)
+        if stats is not None:
+            self.stats = Stats(stats)
+        self.user_config.update(self.storage.load_config())
+        self.apply_config()
+        mark(f"deck ({len(self.flashcards)} cards, {self.storage.name})")
+
+        # Replay changes recorded since the last compaction, then fold them into the stored data
+        replayed = self._replay_changes()
+        mark(f"replay ({replayed} changes)")
+        if self.read_only:
+            logging.info("Opened read-only; stored data left as it is")
+        elif changed or replayed:
+            self.request_save()
+        else:
+            logging.info("Stored data already standardized and compacted; skipping rewrite")
+        logging.info("Data standardization complete")
+        logging.info(f"Startup timing: {', '.join(timings)}")
+        return warnings
+
+    def clear(self) -> None:
+        """Drop all cards, e.g. after a failed load."""
+        self.flashcards = []
+        self.index = DeckIndex()
+        self.scheduler = Scheduler()
+
+    def repair(self) -> bool:
+        """Attempt to repair a missing or corrupted deck by copying in the shipped one."""
+        system_vocab_file = self.system_vocab_file
+        try:
+            if not system_vocab_file or not os.path.exists(system_vocab_file):
+                logging.error(f"System JSON file not found: {system_vocab_file}")
+                return False
+            if not _validate_json_file(system_vocab_file):
+                logging.error(f"System JSON file is invalid: {system_vocab_file}")
+                return False
+            if os.path.exists(self.vocab_file):
+                shutil.copy(self.vocab_file, self.backup_vocab_file)
+                logging.info(f"Backed up existing user JSON to {self.backup_vocab_file}")
+            shutil.copy(system_vocab_file, self.vocab_file)
+            logging.info(f"Copied system JSON from {system_vocab_file} to {self.vocab_file}")
+            os.chmod(self.vocab_file, 0o644)
+            logging.info(f"Set permissions (644) for {self.vocab_file}")
+            if _validate_json_file(self.vocab_file):
+                logging.info(f"Successfully repaired JSON file: {self.vocab_file}")
+                return True
+            else:
+                logging.error(f"Copied JSON file is invalid: {self.vocab_file}")
+                return False
+        except Exception as e:
+            logging.error(f"Failed to repair JSON file: {str(e)}")
+            return False
+
+    def apply_config(self) -> None:
+        """Apply the settings in user_config that the deck itself uses (scheduler, save debounce)."""
+        self.writer.debounce_ms = self.user_config.get('save_debounce_ms', self.writer.debounce_ms)
+        self.scheduler.algorithm = self.user_config.get('scheduler', self.scheduler.algorithm)
+        if self.scheduler.algorithm not in Scheduler.ALGORITHMS:
+            logging.warning(f"Unknown scheduler '{self.scheduler.algorithm}' in config; using Leitner intervals")
+            self.scheduler.algorithm = 'leitner'
+
+    def _create_storage(self) -> StorageBackend:
+        """Create the storage backend selected by 'storage_backend' in config.json ('json' or 'sqlite')."""
+        self.storage_backend = self.user_config.get('storage_backend', self.storage_backend)
+        self.journal_compact_threshold = self.user_config.get('journal_compact_threshold',
+                                                              self.journal_compact_threshold)
+        if self.base_file:
+            self.storage_backend = 'overlay'
+            return OverlayStorage(self.base_file, self.overlay_file, self.stats_file, self.user_config_file,
+                                  self.journal_file, self.journal_compact_threshold, self.base_cache_file)
+        if self.storage_backend == 'sqlite' and self.read_only and not os.path.exists(self.db_file):
+            # Opening it would create the database; it would be seeded from the JSON deck anyway
+            self.storage_backend = 'json'
+        elif self.storage_backend == 'sqlite':
+            try:
+                return SqliteStorage(self.db_file)
+            except Exception as e:
+                logging.error(f"Failed to open SQLite storage {self.db_file}: {str(e)}. Falling back to JSON.")
+                self.storage_backend = 'json'
+        return JsonStorage(self.vocab_file, self.backup_vocab_file, self.stats_file, self.user_config_file,
+                           self.journal_file, self.journal_compact_threshold)
+
+    def _replay_changes(self) -> int:
+        """Apply recorded changes newer than the last compaction to the loaded flashcards and stats.
+
+        Returns the number of changes applied.
+        """
+        entries = self.storage.pending_changes()
+        self.journal_seq = self.stats.data.get('journal_seq', 0)
+        if not entries:
+            return 0
+        applied = 0
+        for entry in entries:
+            seq = entry.get('seq', 0)
+            if seq <= self.journal_seq:
+                continue  # Already compacted into the data files
+            op = entry.get('op')
+            card = self.index.get(entry.get('german'))
+            if op == 'review' and card is not None:
+                # Stats are counted against the box the card had before this answer. Take it from the entry:
+                # the saved card may already include this answer (see save_snapshot)
+                self.stats.record(card.german, card.level, card.category, entry.get('previous_box', card.box),
+                                  entry['correct'], datetime.fromisoformat(entry['date']).date())
+                self.index.set_box(card, entry['box'])
+                if entry.get('due'):
+                    card.due, card.interval, card.ease = entry['due'], entry['interval'], entry['ease']
+                    self.scheduler.add(card)
+            elif op == 'favorite' and card is not None:
+                self.index.set_favorite(card, entry['favorite'])
+            elif op == 'add' and entry['card'].get('german') not in self.index:
+                self.add(Card.from_dict(entry['card'])[0], record=False)
+            elif op == 'config':
+                self.user_config.update(entry['config'])
+                self.apply_config()
+            self.journal_seq = seq
+            applied += 1
+        logging.info(f"Replayed {applied} pending changes from {self.storage.name} storage")
+        return applied
+
+    # Changes
+
+    def record_change(self, entry: Dict[str, Any]) -> None:
+        """Record a single change with the storage backend instead of rewriting the deck; compact when needed."""
+        with self.lock:
+            self.journal_seq += 1
+            entry['seq'] = self.journal_seq
+        if self.read_only:
+            return
+        self.writer.submit(self._store_change, entry)
+        if self.storage.needs_compaction():
+            self.request_save()
+
+    def _store_change(self, entry: Dict[str, Any]) -> None:
+        """Hand one change to the storage backend (writer thread); a failure falls back to a full save."""
+        try:
+            self.storage.record_change(entry)
+        except Exception as e:
+            logging.error(f"Failed to record change with {self.storage.name} storage: {str(e)}")
+            self.writer.request_save()  # Fall back to a full save so the change is not lost
+
+    def add(self, card: Card, record: bool = True) -> None:
+        """Append a card to the deck and its indexes, journaling it unless record is False."""
+        self.flashcards.append(card)
+        self.index.add(card)
+        self.scheduler.add(card)
+        if record:
+            self.record_change({'op': 'add', 'card': card.to_dict()})
+
+    def answer(self, card: Card, correct: bool, today: Optional[date] = None, response_ms: int = 0) -> None:
+        """Count an answer, move the card to its new Leitner box and reschedule it."""
+        today = today or datetime.now().date()
+        # Stats, box and journal sequence change together so a background snapshot never splits them
+        with self.lock:
+            previous_box = card.box
+            self.stats.record(card.german, card.level, card.category, card.box, correct, today)
+            self.index.set_box(card, min(card.box + 1, 5) if correct else max(card.box - 1, 1))
+            self.scheduler.review(card, correct)
+            self.record_change({'op': 'review', 'german': card.german, 'correct': correct, 'box': card.box,
+                                'date': today.isoformat(), 'level': card.level, 'category': card.category,
+                                'streak': self.stats.data['streak'], 'due': card.due, 'interval': card.interval,
+                                'ease': card.ease, 'previous_box': previous_box})
+        if not self.read_only:
+            self.writer.submit(self.review_log.append, card.german, time.time(), correct, previous_box, card.box,
+                               response_ms)
+
+    def add_cards(self, cards: Iterable[Card]) -> int:
+        """Add the cards whose German word is not in the deck yet; returns how many were added.
+
+        Checked against the index as each card goes in, so repeats within cards are skipped too.
+        Imports are not journaled: call request_save() afterwards.
+        """
+        added = 0
+        with self.lock:
+            for card in cards:
+                if card.german not in self.index:
+                    self.add(card, record=False)
+                    added += 1
+        return added
+
+    def import_file(self, path: str, fmt: Optional[str] = None, batch_size: int = 1000,
+                    progress: Optional[ImportProgress] = None,
+                    callback: Optional[Callable[[ImportProgress], None]] = None) -> ImportProgress:
+        """Stream a JSON, JSON Lines or CSV/TSV vocabulary file into the deck in batches on this thread.
+
+        callback is called with the progress after each batch. Call request_save() afterwards.
+        """
+        progress = progress or ImportProgress()
+        for batch in read_cards(path, fmt, batch_size, progress):
+            progress.commit(len(batch), self.add_cards(batch))
+            if callback is not None:
+                callback(progress)
+        return progress
+
+    def export(self, path: str, fmt: Optional[str] = None, compression: Optional[str] = None,
+               level: Optional[str] = None, category: Optional[str] = None, box: Optional[int] = None,
+               favorite: Optional[bool] = None, progress: Optional[ExportProgress] = None,
+               stop: Optional[threading.Event] = None,
+               callback: Optional[Callable[[ExportProgress], None]] = None) -> ExportProgress:
+        """Write the cards matching the filters to path as JSON, JSON Lines, CSV or Anki notes (see write_cards).
+
+        Streams from a snapshot of the card list, so it can run on a worker thread while the deck is in use.
+        """
+        with self.lock:
+            flashcards = list(self.flashcards)  # References only, not copies of the cards
+        return write_cards(path, flashcards, fmt, compression, level, category, box, favorite, progress, stop,
+                           callback)
+
+    def reset_boxes(self, level: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Move cards (optionally of one level and/or category) back to box 1 as new cards.
+
+        Returns how many cards were reset. Resets are not journaled: call request_save() afterwards.
+        """
+        cards = self.flashcards
+        if level is not None or category is not None:
+            cards = list(self.index.select(level=level, category=category))
+        with self.lock:
+            for card in cards:
+                self.index.set_box(card, 1)
+                card.due, card.interval, card.ease = 0, 0, 2.5
+                self.scheduler.add(card)
+        return len(cards)
+
+    def set_favorite(self, card: Card, favorite: bool) -> None:
+        self.index.set_favorite(card, favorite)
+        self.record_change({'op': 'favorite', 'german': card.german, 'favorite': favorite})
+
+    def update_config(self, **values) -> None:
+        """Change config values and journal them."""
+        self.user_config.update(values)
+        self.apply_config()
+        self.record_change({'op': 'config', 'config': values})
+
+    # Sessions
+
+    def session(self, count: int, level: Optional[str] = None, category: Optional[str] = None) -> Session:
+        """Up to count cards, optionally of one level and/or category: due first, then new, then upcoming."""
+        candidates = None
+        if level is not None or category is not None:
+            candidates = self.index.select(level=level, category=category)
+        return Session(self, self.scheduler.next_cards(count, candidates=candidates))
+
+    def difficult_session(self) -> Session:
+        """Every card answered incorrectly at least once, shuffled."""
+        cards = [self.index.get(word) for word in self.stats.data['difficult_words'] if word in self.index]
+        random.shuffle(cards)
+        return Session(self, cards)
+
+    def favorites_session(self) -> Session:
+        """Every favorite card, shuffled."""
+        cards = list(self.index.favorites)
+        random.shuffle(cards)
+        return Session(self, cards)
+
+    # Saving
+
+    def request_save(self) -> None:
+        """Queue a full save on the writer thread; bursts are coalesced. Ignored for a read-only deck."""
+        if not self.read_only:
+            self.writer.request_save()
+
+    def save_snapshot(self) -> bool:
+        """Snapshot deck, stats and config and hand them to the storage backend (runs on the writer thread).
+
+        Only the stats (which must match journal_seq exactly) are copied under the lock; the cards are copied
+        afterwards, so answering is not blocked for the length of the deck. A card copy may then already
+        include a change newer than journal_seq; replaying that change at startup sets the same fields again.
+        """
+        with self.lock:
+            # A pickle round trip is a deep copy done in C, several times faster than copy.deepcopy
+            stats = pickle.loads(pickle.dumps(self.stats.data, pickle.HIGHEST_PROTOCOL))
+            stats['journal_seq'] = self.journal_seq
+            flashcards = list(self.flashcards)  # References only
+            user_config = dict(self.user_config)
+        flashcards = [card.copy() for card in flashcards]
+        try:
+            self.storage.save_all(flashcards, stats, user_config)
+            return True
+        except Exception as e:
+            logging.error(f"Error saving data: {str(e)}")
+            self.writer.last_error = e
+            return False
+
+    def take_error(self) -> Optional[Exception]:
+        """Return and clear the last background write failure, if any."""
+        error = self.writer.last_error
+        self.writer.last_error = None
+        return error
+
+    def close(self, save: bool = True) -> None:
+        """Run queued writes and a final save, then close the review log and storage.
+
+        With save=False the final save is skipped unless one was requested; journaled changes are kept
+        and folded in by a later save. A read-only deck is never saved.
+        """
+        self.writer.flush(save and not self.read_only)
+        self.review_log.close()
+        if self.storage:
+            self.storage.close()
@@ -0,0 +1,47 @@
+"""Learner profiles: per-user overlays on one shared, read-only base deck.
+
+The default profile (no name) is the original single-user layout, a full deck in data/ and its stats and
+config in config/. A named profile lives in profiles/<name>/ and stores only its overlay, stats, config,
+change journal and review log; the cards come from the shipped deck, memory-mapped in its compiled form
+(see compiled.py) and shared by every profile.
+"""
+
+import os
+import re
+from typing import List, Optional
+
+from .deck import Deck
+
+PROFILES_DIR = 'profiles'
+_PROFILE_NAME = re.compile(r'\w[\w.-]*')
+
+
+def profile_name(name: str) -> str:
+    """Return name if it can be used as a profile (directory) name, else raise ValueError."""
+    if not _PROFILE_NAME.fullmatch(name):
+        raise ValueError(f"Invalid profile name '{name}': use letters, digits, '.', '-' and '_'")
+    return name
+
+
+def profile_dir(data_path: str, name: str) -> str:
+    """Directory holding a named profile's files."""
+    return os.path.join(data_path, PROFILES_DIR, profile_name(name))
+
+
+def list_profiles(data_path: str) -> List[str]:
+    """Names of the profiles created so far, sorted."""
+    try:
+        return sorted(name for name in os.listdir(os.path.join(data_path, PROFILES_DIR))
+                      if _PROFILE_NAME.fullmatch(name) and os.path.isdir(profile_dir(data_path, name)))
+    except FileNotFoundError:
+        return []
+
+
+def open_profile(data_path: str, name: Optional[str], system_vocab_file: str, **deck_options) -> Deck:
+    """Create (without loading) the Deck for a profile; name None is the default, full-deck profile."""
+    if not name:
+        return Deck(os.path.join(data_path, 'data'), os.path.join(data_path, 'config'),
+                    system_vocab_file=system_vocab_file, **deck_options)
+    directory = profile_dir(data_path, name)
+    return Deck(directory, directory, system_vocab_file=system_vocab_file, base_file=system_vocab_file,
+                base_cache_file=os.path.join(data_path, PROFILES_DIR, 'base.wwdeck'), **deck_options)
@@ -0,0 +1,144 @@
+"""Spaced-repetition scheduling."""
+
+import heapq
+import random
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .cards import Card
+
+
+class Scheduler:
+    """Spaced-repetition scheduler: a min-heap of reviewed cards keyed on due time plus a queue of new cards.
+
+    'leitner' schedules a card LEITNER_INTERVALS[box] days ahead; 'sm2' uses the SM-2 interval and ease
+    factor. Heap entries are invalidated lazily, so rescheduling a card is O(log n) and building a session
+    of k cards is O(k log n) rather than a pass over the whole deck.
+    """
+
+    LEITNER_INTERVALS = {1: 1, 2: 2, 3: 4, 4: 8, 5: 16}
+    ALGORITHMS = ('leitner', 'sm2')
+    DAY = 86400
+
+    def __init__(self, cards: Iterable[Card] = (), algorithm: str = 'leitner') -> None:
+        self.algorithm = algorithm if algorithm in self.ALGORITHMS else 'leitner'
+        self._heap: List[tuple] = []
+        self._entries: Dict[Card, int] = {}  # Card -> id of its live heap entry
+        self._new: List[Card] = []  # Never-reviewed cards, sampled directly by next_cards
+        self._new_positions: Dict[Card, int] = {}  # Card -> index in _new, for O(1) swap-remove
+        self._counter = 0
+        for card in cards:
+            if card.due:
+                self._counter += 1
+                self._entries[card] = self._counter
+                self._heap.append((card.due, self._counter, card))
+            else:
+                self._add_new(card)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._new)
+
+    def _add_new(self, card: Card) -> None:
+        if card not in self._new_positions:
+            self._new_positions[card] = len(self._new)
+            self._new.append(card)
+
+    def _remove_new(self, card: Card) -> None:
+        """Drop a card from the new cards in O(1) by moving the last one into its slot."""
+        position = self._new_positions.pop(card, None)
+        if position is None:
+            return
+        last = self._new.pop()
+        if position < len(self._new):
+            self._new[position] = last
+            self._new_positions[last] = position
+
+    def add(self, card: Card) -> None:
+        """Queue a card at its stored due time, or as new if it was never reviewed."""
+        self._entries.pop(card, None)
+        self._remove_new(card)
+        if card.due:
+            self._counter += 1
+            self._entries[card] = self._counter
+            heapq.heappush(self._heap, (card.due, self._counter, card))
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._compact()
+        else:
+            self._add_new(card)
+
+    def remove(self, card: Card) -> None:
+        self._entries.pop(card, None)
+        self._remove_new(card)
+
+    def _compact(self) -> None:
+        """Drop stale heap entries once they outnumber the live ones."""
+        self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+        heapq.heapify(self._heap)
+
+    def review(self, card: Card, correct: bool, now: Optional[float] = None) -> None:
+        """Set a card's next due time after an answer. Leitner uses card.box, so update the box first."""
+        now = time.time() if now is None else now
+        if self.algorithm == 'sm2':
+            quality = 5 if correct else 2
+            if not correct:
+                card.interval = 1
+            elif card.interval < 1:
+                card.interval = 1
+            elif card.interval < 6:
+                card.interval = 6
+            else:
+                card.interval = round(card.interval * card.ease)
+            card.ease = round(max(1.3, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)), 2)
+        else:
+            card.interval = self.LEITNER_INTERVALS.get(card.box, 1)
+        card.due = int(now + card.interval * self.DAY)
+        self.add(card)
+
+    def _sort_key(self, card: Card, now: float) -> tuple:
+        if not card.due:
+            return 1, random.random()  # Any new card is as good as another
+        return (0 if card.due <= now else 2), card.due
+
+    @staticmethod
+    def _shuffled(*buckets: List[Card]) -> List[Card]:
+        """Concatenate the buckets in priority order, each one shuffled so sessions don't replay the same order."""
+        session = []
+        for bucket in buckets:
+            random.shuffle(bucket)
+            session.extend(bucket)
+        return session
+
+    def next_cards(self, k: int, now: Optional[float] = None,
+                   candidates: Optional[Iterable[Card]] = None) -> List[Card]:
+        """Pick up to k cards: due cards (most overdue first), then new cards, then the soonest upcoming ones.
+
+        Which cards are picked follows that priority (new cards are sampled at random); within each of the
+        three groups the session is shuffled. Without candidates the session is taken from the heap and the
+        new card list in O(k log n); with a filtered candidate set (e.g. one level) the k best of those are
+        selected in O(m log k).
+        """
+        now = time.time() if now is None else now
+        if k <= 0:
+            return []
+        if candidates is not None:
+            buckets = ([], [], [])
+            for card in heapq.nsmallest(k, candidates, key=lambda card: self._sort_key(card, now)):
+                buckets[1 if not card.due else 0 if card.due <= now else 2].append(card)
+            return self._shuffled(*buckets)
+
+        due, upcoming, popped = [], [], []
+        while self._heap and len(due) + len(upcoming) < k:
+            entry = heapq.heappop(self._heap)
+            card = entry[2]
+            if self._entries.get(card) != entry[1]:
+                continue  # Stale entry left behind by a reschedule or removal
+            popped.append(entry)
+            (due if entry[0] <= now else upcoming).append(card)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+
+        wanted = min(k - len(due), len(self._new))
+        # random.sample draws indices into the list and only copies it when it is within a small multiple of k
+        new = random.sample(self._new, wanted) if wanted > 0 else []
+        return self._shuffled(due, new, upcoming[:k - len(due) - len(new)])
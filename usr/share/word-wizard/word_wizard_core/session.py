@@ -0,0 +1,49 @@
+"""Review sessions."""
+
+from datetime import date
+from typing import List, Optional
+
+from .cards import Card
+
+
+class Session:
+    """The cards picked for one review run and the position in it.
+
+    answer() records the result for the current card with the deck; advance() moves on, which a UI may
+    delay until its feedback animation has finished.
+    """
+
+    def __init__(self, deck, cards: List[Card]) -> None:
+        self.deck = deck
+        self.cards = cards
+        self.index = 0
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @property
+    def current(self) -> Optional[Card]:
+        return self.cards[self.index] if self.index < len(self.cards) else None
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.cards)
+
+    def upcoming(self, count: int) -> List[Card]:
+        """The next count cards after the current one."""
+        return self.cards[self.index + 1:self.index + 1 + count]
+
+    def answer(self, correct: bool, today: Optional[date] = None, response_ms: int = 0) -> Card:
+        """Record an answer for the current card; returns the card."""
+        card = self.cards[self.index]
+        self.deck.answer(card, correct, today, response_ms)
+        return card
+
+    def advance(self) -> None:
+        self.index += 1
+
+    def levels(self) -> List[str]:
+        return sorted(set(card.level for card in self.cards if card.level))
+
+    def categories(self) -> List[str]:
+        return sorted(set(card.category for card in self.cards if card.category))
@@ -0,0 +1,321 @@
+"""Review statistics and the per-review history log."""
+
+import array
+import logging
+import os
+import struct
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card
+
+
+class Stats:
+    """Review counters over the persisted stats dict, plus per-day buckets for rolling day and week windows.
+
+    Lifetime totals stay in the existing keys (correct, incorrect, by_level, by_category, difficult_words,
+    streak) so older stats files keep working; 'by_box' and 'daily' are added. daily maps an ISO date to
+    {dimension: [correct, incorrect]} with dimensions 'total', 'level:A1', 'category:Noun' and 'box:1',
+    and only the last WINDOW_DAYS days are kept. An answer updates a fixed number of counters, and a
+    window sums at most WINDOW_DAYS buckets, so nothing is ever recomputed from the review history.
+    """
+
+    WINDOW_DAYS = 28
+
+    def __init__(self, stats: Optional[Dict[str, Any]] = None) -> None:
+        stats = {} if stats is None else stats
+        self.data = stats  # The persisted stats dict, updated in place
+        for key in ('total_reviews', 'correct', 'incorrect', 'streak'):
+            stats.setdefault(key, 0)
+        stats.setdefault('last_review_date', None)
+        for key in ('by_level', 'by_category', 'by_box', 'difficult_words', 'daily'):
+            stats[key] = dict(stats.get(key) or {})  # Plain dicts: JSON-friendly and deep-copied cheaply
+
+    def record(self, german: str, level: str, category: str, box: int, correct: bool, today) -> None:
+        """Count one answer; box is the card's box before the answer moved it."""
+        stats = self.data
+        index = 0 if correct else 1
+        result = 'correct' if correct else 'incorrect'
+        stats[result] += 1
+        stats['total_reviews'] += 1
+        dimensions = ['total', f"box:{box}"]
+        for scope, key in (('by_level', level), ('by_category', category), ('by_box', str(box))):
+            if key:
+                counts = stats[scope].get(key)
+                if counts is None:
+                    counts = stats[scope][key] = {'correct': 0, 'incorrect': 0}
+                counts[result] += 1
+        if level:
+            dimensions.append(f"level:{level}")
+        if category:
+            dimensions.append(f"category:{category}")
+        if not correct and german:
+            stats['difficult_words'][german] = stats['difficult_words'].get(german, 0) + 1
+
+        day = today.isoformat()
+        bucket = stats['daily'].get(day)
+        if bucket is None:
+            bucket = stats['daily'][day] = {}
+            self._prune(today)
+        for dimension in dimensions:
+            counts = bucket.get(dimension)
+            if counts is None:
+                counts = bucket[dimension] = [0, 0]
+            counts[index] += 1
+
+        # Update daily streak
+        last_review_date = stats.get('last_review_date')
+        if last_review_date:
+            if isinstance(last_review_date, str):
+                last_date = datetime.fromisoformat(last_review_date).date()
+            else:
+                last_date = last_review_date
+            if today == last_date + timedelta(days=1):
+                stats['streak'] += 1
+            elif today > last_date + timedelta(days=1):
+                stats['streak'] = 1
+        else:
+            stats['streak'] = 1
+        stats['last_review_date'] = day
+
+    def _prune(self, today) -> None:
+        """Drop day buckets that fell out of the window; runs once per new day."""
+        oldest = (today - timedelta(days=self.WINDOW_DAYS - 1)).isoformat()
+        for day in [day for day in self.data['daily'] if day < oldest]:
+            del self.data['daily'][day]
+
+    @staticmethod
+    def accuracy(correct: int, incorrect: int) -> float:
+        total = correct + incorrect
+        return correct / total * 100 if total > 0 else 0
+
+    def lifetime(self, scope: str, key: str) -> tuple:
+        """(correct, incorrect) over all time for a key of by_level, by_category or by_box."""
+        counts = self.data[scope].get(key)
+        return (counts['correct'], counts['incorrect']) if counts else (0, 0)
+
+    def window(self, days: int, today, dimension: str = 'total') -> tuple:
+        """(correct, incorrect) for a dimension over the last days days, today included."""
+        correct = incorrect = 0
+        for offset in range(min(days, self.WINDOW_DAYS)):
+            counts = self.data['daily'].get((today - timedelta(days=offset)).isoformat(), {}).get(dimension)
+            if counts:
+                correct += counts[0]
+                incorrect += counts[1]
+        return correct, incorrect
+
+    def daily_reviews(self, days: int, today) -> List[tuple]:
+        """[(date, correct, incorrect)] for each of the last days days, oldest first."""
+        history = []
+        for offset in range(min(days, self.WINDOW_DAYS) - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            counts = self.data['daily'].get(day.isoformat(), {}).get('total', (0, 0))
+            history.append((day, counts[0], counts[1]))
+        return history
+
+
+def _load_numpy():
+    """Import NumPy on demand. Returns None when it is not installed; callers fall back to pure Python."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ReviewLog:
+    """Append-only per-review history stored as fixed-size binary records plus a table of card words.
+
+    Each record holds the card id (line number in the words file), Unix timestamp, local date ordinal,
+    result, box before and after the answer, and response time in ms (0 if unknown). In memory the log
+    is columnar: one array.array per field, or NumPy arrays when NumPy is available, loaded on first use.
+    """
+
+    RECORD = struct.Struct('<IdIBBBI')
+    FIELDS = ('card', 'timestamp', 'day', 'correct', 'box_before', 'box_after', 'response_ms')
+    TYPECODES = ('I', 'd', 'I', 'B', 'B', 'B', 'I')
+    NUMPY_DTYPE = [('card', '<u4'), ('timestamp', '<f8'), ('day', '<u4'), ('correct', 'u1'),
+                   ('box_before', 'u1'), ('box_after', 'u1'), ('response_ms', '<u4')]
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.words_path = os.path.splitext(path)[0] + '.words'
+        self.words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        self._columns: Optional[Dict[str, Any]] = None
+        self._file = None
+        self._words_file = None
+        self._load_words()
+
+    def _load_words(self) -> None:
+        if os.path.exists(self.words_path):
+            with open(self.words_path, 'rb') as f:
+                data = f.read()
+            # A word written without its newline was cut off; no record refers to it yet
+            data = data[:data.rfind(b'\n') + 1]
+            self.words = data.decode('utf-8').split('\n')[:-1]
+            self._word_ids = {word: i for i, word in enumerate(self.words)}
+
+    @staticmethod
+    def _open_for_append(path: str, complete_size: int, mode: str):
+        """Open path for appending after cutting off anything past complete_size (a torn final write)."""
+        if os.path.exists(path) and os.path.getsize(path) > complete_size:
+            logging.warning(f"Dropping a partially written record at the end of {path}")
+            os.truncate(path, complete_size)
+        return open(path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'}))
+
+    def __len__(self) -> int:
+        if self._columns is not None:
+            return len(self._columns['card'])
+        return os.path.getsize(self.path) // self.RECORD.size if os.path.exists(self.path) else 0
+
+    def append(self, german: str, timestamp: float, correct: bool, box_before: int, box_after: int,
+               response_ms: int = 0) -> None:
+        """Append one review; the record is flushed immediately, like the journal."""
+        card_id = self._word_ids.get(german)
+        if card_id is None:
+            if self._words_file is None:
+                words_size = sum(len(word.encode('utf-8')) + 1 for word in self.words)
+                self._words_file = self._open_for_append(self.words_path, words_size, 'a')
+            card_id = self._word_ids[german] = len(self.words)
+            self.words.append(german)
+            self._words_file.write(german.replace('\n', ' ') + '\n')
+            self._words_file.flush()
+        values = (card_id, timestamp, date.fromtimestamp(timestamp).toordinal(), int(bool(correct)), box_before,
+                  box_after, max(0, int(response_ms)))
+        if self._file is None:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            self._file = self._open_for_append(self.path, size - size % self.RECORD.size, 'ab')
+        self._file.write(self.RECORD.pack(*values))
+        self._file.flush()
+        if self._columns is not None and isinstance(self._columns['card'], array.array):
+            for name, value in zip(self.FIELDS, values):
+                self._columns[name].append(value)
+        else:
+            self._columns = None  # NumPy columns are immutable views; reload them on next use
+
+    def columns(self, use_numpy: bool = True) -> Dict[str, Any]:
+        """The log as {field: column}; NumPy arrays when available (and use_numpy), array.array otherwise."""
+        numpy = _load_numpy() if use_numpy else None
+        if self._columns is not None and isinstance(self._columns['card'], array.array) != (numpy is None):
+            self._columns = None
+        if self._columns is None:
+            data = b''
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+            data = data[:len(data) - len(data) % self.RECORD.size]  # Ignore a torn final record
+            if numpy is not None:
+                records = numpy.frombuffer(data, dtype=numpy.dtype(self.NUMPY_DTYPE))
+                self._columns = {name: records[name] for name in self.FIELDS}
+            else:
+                self._columns = {name: array.array(code) for name, code in zip(self.FIELDS, self.TYPECODES)}
+                appenders = [self._columns[name].append for name in self.FIELDS]
+                for values in self.RECORD.iter_unpack(data):
+                    for append, value in zip(appenders, values):
+                        append(value)
+        return self._columns
+
+    def replay(self, cards: Dict[str, Card], use_numpy: bool = True):
+        """Rebuild the stats dict and every card's Leitner box from the events alone.
+
+        cards maps german -> Card and supplies each card's level and category. Returns (stats, boxes)
+        where boxes maps german -> box after the card's last review.
+        """
+        columns = self.columns(use_numpy)
+        if not isinstance(columns['card'], array.array):
+            return self._replay_numpy(_load_numpy(), columns, cards)
+        stats: Dict[str, Any] = {}
+        aggregator = Stats(stats)
+        words = self.words
+        info = [(cards[word].level, cards[word].category) if word in cards else ('', '') for word in words]
+        days: Dict[int, date] = {}
+        boxes: Dict[str, int] = {}
+        for card_id, day, correct, box_before, box_after in zip(
+                columns['card'], columns['day'], columns['correct'], columns['box_before'], columns['box_after']):
+            today = days.get(day)
+            if today is None:
+                today = days[day] = date.fromordinal(day)
+            level, category = info[card_id]
+            aggregator.record(words[card_id], level, category, box_before, bool(correct), today)
+            boxes[words[card_id]] = box_after
+        return stats, boxes
+
+    def _replay_numpy(self, numpy, columns: Dict[str, Any], cards: Dict[str, Card]):
+        """Vectorized replay: the same result as the pure-Python path, computed with bincount and unique."""
+        stats: Dict[str, Any] = {}
+        Stats(stats)
+        card, day, correct = columns['card'], columns['day'], columns['correct'].astype(numpy.int64)
+        box_before, box_after = columns['box_before'], columns['box_after']
+        if not len(card):
+            return stats, {}
+        word_count = len(self.words)
+        stats['correct'] = int(correct.sum())
+        stats['incorrect'] = int(len(card) - stats['correct'])
+        stats['total_reviews'] = int(len(card))
+
+        def counts_by(keys, names, scope):
+            correct_counts = numpy.bincount(keys, weights=correct, minlength=len(names))
+            totals = numpy.bincount(keys, minlength=len(names))
+            for i, name in enumerate(names):
+                if name and totals[i]:
+                    stats[scope][name] = {'correct': int(correct_counts[i]),
+                                          'incorrect': int(totals[i] - correct_counts[i])}
+
+        levels = [''] + list(ALLOWED_LEVELS)
+        categories = [''] + list(ALLOWED_CATEGORIES)
+        level_of = numpy.array([levels.index(cards[w].level) if w in cards and cards[w].level in levels else 0
+                                for w in self.words], dtype=numpy.int64)
+        category_of = numpy.array([categories.index(cards[w].category)
+                                   if w in cards and cards[w].category in categories else 0
+                                   for w in self.words], dtype=numpy.int64)
+        counts_by(level_of[card], levels, 'by_level')
+        counts_by(category_of[card], categories, 'by_category')
+        box_names = [str(box) for box in range(int(box_before.max()) + 1)]
+        counts_by(box_before.astype(numpy.int64), box_names, 'by_box')
+        misses = numpy.bincount(card[correct == 0], minlength=word_count)
+        stats['difficult_words'] = {self.words[i]: int(misses[i]) for i in numpy.nonzero(misses)[0]}
+
+        # Streak: length of the final run of consecutive review days
+        unique_days = numpy.unique(day)
+        last_day = int(unique_days[-1])
+        gaps = numpy.nonzero(numpy.diff(unique_days) != 1)[0]
+        stats['streak'] = int(len(unique_days) - (gaps[-1] + 1 if len(gaps) else 0))
+        stats['last_review_date'] = date.fromordinal(last_day).isoformat()
+
+        # Day buckets for the retained window, counted per (day, dimension) with one bincount per dimension
+        first_day = last_day - (Stats.WINDOW_DAYS - 1)
+        in_window = day >= first_day
+        window_days = (day[in_window] - first_day).astype(numpy.int64)
+        window_correct = correct[in_window]
+        window_cards = card[in_window]
+
+        def bucket_counts(keys, names, prefix):
+            combined = window_days * len(names) + keys
+            totals = numpy.bincount(combined, minlength=Stats.WINDOW_DAYS * len(names))
+            correct_counts = numpy.bincount(combined, weights=window_correct, minlength=len(totals))
+            for index in numpy.nonzero(totals)[0].tolist():
+                offset, name_index = divmod(index, len(names))
+                if names[name_index]:
+                    bucket = stats['daily'].setdefault(date.fromordinal(first_day + offset).isoformat(), {})
+                    bucket[prefix + names[name_index]] = [int(correct_counts[index]),
+                                                          int(totals[index] - correct_counts[index])]
+
+        bucket_counts(numpy.zeros(len(window_days), dtype=numpy.int64), ['total'], '')
+        bucket_counts(level_of[window_cards], levels, 'level:')
+        bucket_counts(category_of[window_cards], categories, 'category:')
+        bucket_counts(box_before[in_window].astype(numpy.int64), box_names, 'box:')
+
+        # Final box per card: box_after of its last event
+        reversed_cards = card[::-1]
+        reviewed, first_in_reverse = numpy.unique(reversed_cards, return_index=True)
+        last_events = len(card) - 1 - first_in_reverse
+        boxes = {self.words[card_id]: int(box)
+                 for card_id, box in zip(reviewed.tolist(), box_after[last_events].tolist())}
+        return stats, boxes
+
+    def close(self) -> None:
+        for handle in (self._file, self._words_file):
+            if handle is not None:
+                handle.close()
+        self._file = self._words_file = None
@@ -0,0 +1,739 @@
+"""Persistence: the JSON and SQLite storage backends, the change journal and the background writer."""
+
+import json
+import logging
+import os
+import pickle
+import queue
+import re
+import shutil
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .cards import Card, _CATEGORIES_BY_NAME, _LEVELS_BY_NAME
+from .compiled import is_loaded, open_compiled_deck, write_compiled_deck
+
+
+class ReviewJournal:
+    """Append-only write-ahead journal holding one JSON object per line (box changes, favorites, stats deltas)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entry_count: int = 0
+        self._file = None
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append a single entry and flush it so it survives a crash or an unclean exit."""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.entry_count += 1
+
+    def read_entries(self) -> List[Dict[str, Any]]:
+        """Read all journal entries, skipping a torn or corrupted line instead of failing."""
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    logging.warning(f"Skipping corrupted journal line {line_no} in {self.path}: {str(e)}")
+        self.entry_count = len(entries)
+        return entries
+
+    def truncate(self) -> None:
+        """Drop all entries once they have been compacted into the deck, stats and config files."""
+        self.close()
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+        self.entry_count = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs) -> None:
+    """Write JSON to a temporary file in the same directory and swap it in with os.replace."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _atomic_copy(src: str, dst: str) -> None:
+    """Copy a file next to its destination first, then swap it in with os.replace."""
+    tmp_path = f"{dst}.tmp"
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+class PersistenceWorker:
+    """Background writer thread: runs submitted jobs in order and coalesces save requests within a debounce window."""
+
+    _SAVE = object()
+    _STOP = object()
+
+    def __init__(self, save_callback: Callable[[], None], debounce_ms: int = 1000) -> None:
+        self.save_callback = save_callback
+        self.debounce_ms = debounce_ms
+        self.last_error: Optional[Exception] = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._save_requested = threading.Event()
+        self._save_now = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="word-wizard-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Callable, *args) -> None:
+        """Queue a job (e.g. a journal append); jobs run in submission order on the writer thread."""
+        self._queue.put((job, args))
+
+    def request_save(self) -> None:
+        """Ask for a full save; requests arriving within the debounce window collapse into one write."""
+        if self._save_requested.is_set():
+            return
+        self._save_requested.set()
+        self._queue.put(self._SAVE)
+
+    def flush(self, save: bool = True) -> None:
+        """Run all queued jobs and a final save synchronously, then stop the thread.
+
+        With save=False only saves that were already requested are run.
+        """
+        if not self._thread.is_alive():
+            return
+        self._save_now.set()
+        if save:
+            self.request_save()
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            if item is self._SAVE:
+                # Hold the save back so a burst of requests results in a single write
+                self._save_now.wait(self.debounce_ms / 1000)
+                self._save_requested.clear()
+                self._execute(self.save_callback)
+            else:
+                job, args = item
+                self._execute(job, *args)
+
+    def _execute(self, job: Callable, *args) -> None:
+        try:
+            job(*args)
+        except Exception as e:
+            logging.error(f"Persistence job {getattr(job, '__name__', job)} failed: {str(e)}")
+            self.last_error = e
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_array(fp, chunk_size: int = 1 << 16):
+    """Yield the elements of a top-level JSON array from a text file, decoding one element at a time.
+
+    Raises json.JSONDecodeError on malformed input and ValueError when the document is not an array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return
+            read_more()
+
+    skip_whitespace()
+    if buffer[pos:pos + 1] != '[':
+        raise ValueError("JSON document is not an array")
+    pos += 1
+    skip_whitespace()
+    if buffer[pos:pos + 1] == ']':
+        return
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()  # The element straddles the chunk boundary
+                continue
+            # A number cut off by the chunk boundary decodes as a shorter number ('1.' as 1), so only accept
+            # the value once the delimiter after it has been read
+            after = _JSON_WHITESPACE.match(buffer, end).end()
+            if eof or (after < len(buffer) and buffer[after] in ',]'):
+                break
+            read_more()
+        yield value
+        pos = end
+        skip_whitespace()
+        delimiter = buffer[pos:pos + 1]
+        pos += 1
+        if delimiter == ',':
+            continue
+        if delimiter == ']':
+            skip_whitespace()
+            if pos < len(buffer):
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+            return
+        raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos - 1)
+
+
+def _valid_card_record(data: Any) -> bool:
+    """A deck entry must be a JSON object with a non-empty German word; anything else is skipped."""
+    return isinstance(data, dict) and isinstance(data.get('german'), str) and bool(data['german'])
+
+
+def _parse_deck_file(file_path: str, min_size: int = 1000):
+    """Parse, validate and standardize a JSON deck in a single streaming pass.
+
+    Returns (flashcards, changed), or None if the file is missing, too small or not a JSON array.
+    """
+    try:
+        if not os.path.exists(file_path):
+            logging.error(f"JSON file not found: {file_path}")
+            return None
+        size = os.path.getsize(file_path)
+        if size < min_size:
+            logging.error(f"JSON file too small: {file_path} (size: {size} bytes)")
+            return None
+        flashcards = []
+        changed = False
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for index, card in enumerate(iter_json_array(f)):
+                if not _valid_card_record(card):
+                    logging.warning(f"Skipping invalid card #{index} in {file_path}")
+                    changed = True
+                    continue
+                card, card_changed = Card.from_dict(card)
+                changed |= card_changed
+                flashcards.append(card)
+        logging.info(f"JSON file validated successfully: {file_path}")
+        return flashcards, changed
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logging.error(f"Invalid JSON in {file_path}: {str(e)}")
+        return None
+    except ValueError:
+        logging.error(f"JSON file does not contain a list: {file_path}")
+        return None
+    except Exception as e:
+        logging.error(f"Error validating JSON file {file_path}: {str(e)}")
+        return None
+
+
+def _validate_json_file(file_path: str, min_size: int = 1000) -> bool:
+    """Validate JSON file by checking existence, size, and syntax."""
+    return _parse_deck_file(file_path, min_size) is not None
+
+
+class StorageBackend:
+    """Where flashcards, stats and config are persisted. Changes are journal-style entries (see _record_change)."""
+
+    name = ''
+
+    def load(self):
+        """Return (flashcards, stats or None, changed), or None when nothing usable is stored yet.
+
+        changed is True when the stored cards had to be standardized and should be written back.
+        """
+        raise NotImplementedError
+
+    def load_config(self) -> Dict[str, Any]:
+        """Return config stored by the backend on top of config.json (which always selects the backend)."""
+        return {}
+
+    def pending_changes(self) -> List[Dict[str, Any]]:
+        """Return recorded changes that are not yet part of the data returned by load()."""
+        return []
+
+    def record_change(self, entry: Dict[str, Any]) -> None:
+        """Persist one incremental change (writer thread)."""
+        raise NotImplementedError
+
+    def needs_compaction(self) -> bool:
+        return False
+
+    def save_all(self, flashcards: List[Card], stats: Dict[str, Any], user_config: Dict[str, Any]) -> None:
+        """Persist a full snapshot (writer thread)."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def _read_json_data(vocab_file: str, stats_file: str):
+    """Read the JSON deck (parsed once, see _parse_deck_file) and, if present, the JSON stats file."""
+    parsed = _parse_deck_file(vocab_file)
+    if parsed is None:
+        return None
+    flashcards, changed = parsed
+    logging.info(f"Loaded flashcards from {vocab_file}")
+    return flashcards, _read_json_stats(stats_file), changed
+
+
+def _read_json_stats(stats_file: str) -> Optional[Dict[str, Any]]:
+    """Read the JSON stats file, or return None if it does not exist yet."""
+    if not os.path.exists(stats_file):
+        return None
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    logging.info(f"Loaded stats from {stats_file}")
+    return stats
+
+
+def _source_key(source_file: str) -> tuple:
+    source = os.stat(source_file)
+    return source.st_mtime_ns, source.st_size
+
+
+def _load_deck_cache(cache_file: str, source_file: str, version: int) -> Optional[List[Card]]:
+    """Return the cached standardized deck if it was built from the current source file, else None."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = pickle.load(f)
+        if (cache.get('version') != version
+                or (cache.get('source_mtime_ns'), cache.get('source_size')) != _source_key(source_file)):
+            logging.info(f"Deck cache is stale: {cache_file}")
+            return None
+        logging.info(f"Loaded flashcards from deck cache {cache_file}")
+        return cache['cards']
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable deck cache {cache_file}: {str(e)}")
+        return None
+
+
+def _write_deck_cache(cache_file: str, source_file: str, flashcards: List[Card], version: int) -> None:
+    """Snapshot the standardized deck, keyed on the source file's current mtime and size."""
+    try:
+        mtime_ns, size = _source_key(source_file)
+        tmp_path = f"{cache_file}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': version, 'source_mtime_ns': mtime_ns, 'source_size': size,
+                         'cards': flashcards}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+    except Exception as e:
+        logging.warning(f"Failed to write deck cache {cache_file}: {str(e)}")
+
+
+class JsonStorage(StorageBackend):
+    """Deck, stats and config as JSON files, with per-answer changes appended to a ReviewJournal.
+
+    A pickled snapshot of the standardized deck is kept next to the JSON file and used at startup
+    for as long as the JSON file's mtime and size match the ones recorded in the snapshot.
+    """
+
+    name = 'json'
+    CACHE_VERSION = 3
+
+    def __init__(self, vocab_file: str, backup_vocab_file: str, stats_file: str, user_config_file: str,
+                 journal_file: str, compact_threshold: int = 500) -> None:
+        self.vocab_file = vocab_file
+        self.backup_vocab_file = backup_vocab_file
+        self.stats_file = stats_file
+        self.user_config_file = user_config_file
+        self.journal = ReviewJournal(journal_file)
+        self.compact_threshold = compact_threshold
+        self.cache_file = os.path.splitext(vocab_file)[0] + '.cache'
+
+    def load(self):
+        flashcards = self._load_cache()
+        if flashcards is not None:
+            stored = (flashcards, _read_json_stats(self.stats_file), False)
+        else:
+            stored = _read_json_data(self.vocab_file, self.stats_file)
+            if stored is not None and not stored[2]:
+                self._write_cache(stored[0])  # A changed deck is cached when it is written back
+        if stored is not None and not self._backup_is_current():
+            shutil.copy(self.vocab_file, self.backup_vocab_file)
+            logging.info(f"Created backup: {self.backup_vocab_file}")
+        return stored
+
+    def _load_cache(self) -> Optional[List[Card]]:
+        return _load_deck_cache(self.cache_file, self.vocab_file, self.CACHE_VERSION)
+
+    def _write_cache(self, flashcards: List[Card]) -> None:
+        _write_deck_cache(self.cache_file, self.vocab_file, flashcards, self.CACHE_VERSION)
+
+    def _backup_is_current(self) -> bool:
+        """True if the backup was written from the current deck (same size and not older), so no copy is needed."""
+        try:
+            deck_stat = os.stat(self.vocab_file)
+            backup_stat = os.stat(self.backup_vocab_file)
+        except OSError:
+            return False
+        return backup_stat.st_size == deck_stat.st_size and backup_stat.st_mtime >= deck_stat.st_mtime
+
+    def pending_changes(self) -> List[Dict[str, Any]]:
+        return self.journal.read_entries()
+
+    def record_change(self, entry: Dict[str, Any]) -> None:
+        self.journal.append(entry)
+
+    def needs_compaction(self) -> bool:
+        return self.journal.entry_count >= self.compact_threshold
+
+    def save_all(self, flashcards: List[Card], stats: Dict[str, Any], user_config: Dict[str, Any]) -> None:
+        # Save vocab file to data directory
+        atomic_write_json(self.vocab_file, [card.to_dict() for card in flashcards], ensure_ascii=False, indent=2)
+        self._write_cache(flashcards)
+        _atomic_copy(self.vocab_file, self.backup_vocab_file)
+        # Save stats and config files
+        atomic_write_json(self.stats_file, stats, indent=2)
+        atomic_write_json(self.user_config_file, user_config, indent=2)
+        # Everything journaled so far is now part of the files
+        self.journal.truncate()
+
+    def close(self) -> None:
+        self.journal.close()
+
+
+def _apply_overlay_fields(card: Card, fields: Dict[str, Any]) -> None:
+    """Set a card's fields from an overlay entry, restoring the in-memory types (tuple examples, shared levels)."""
+    for name, value in fields.items():
+        if name == 'examples':
+            value = tuple(value)
+        elif name == 'level':
+            value = _LEVELS_BY_NAME.get(value, '')
+        elif name == 'category':
+            value = _CATEGORIES_BY_NAME.get(value, '')
+        elif name not in OverlayStorage.OVERLAY_FIELDS:
+            continue
+        setattr(card, name, value)
+
+
+class OverlayStorage(StorageBackend):
+    """A profile's view of a shared, read-only base deck: only what the user changed or added is stored.
+
+    The overlay file maps the German word of every base card the user touched (box, favorite, schedule or an
+    edit) to the fields that differ from the base, and lists added cards in full, so it grows with the cards
+    the user touched rather than with the deck. Stats, config and the change journal are per profile as with
+    JsonStorage.
+
+    The base is read from its compiled, memory-mapped form (see compiled.py): the one built at install next
+    to the JSON file, else one compiled on first use into base_cache_file. Loaded base decks are kept for
+    the life of the process, so switching profiles does not read the base again.
+    """
+
+    name = 'overlay'
+    OVERLAY_VERSION = 1
+    OVERLAY_FIELDS = tuple(field for field in Card.__slots__ if field != 'german')
+    _base_decks: Dict[str, tuple] = {}  # Base file -> (mtime and size, pristine cards)
+
+    def __init__(self, base_file: str, overlay_file: str, stats_file: str, user_config_file: str,
+                 journal_file: str, compact_threshold: int = 500, base_cache_file: Optional[str] = None) -> None:
+        self.base_file = base_file
+        self.base_cache_file = base_cache_file  # Compiled base deck shared by all profiles
+        self.overlay_file = overlay_file
+        self.stats_file = stats_file
+        self.user_config_file = user_config_file
+        self.journal = ReviewJournal(journal_file)
+        self.compact_threshold = compact_threshold
+        self.base: Dict[str, Card] = {}
+
+    def _load_base(self) -> Optional[List[Card]]:
+        try:
+            key = _source_key(self.base_file)
+        except OSError:
+            logging.error(f"Base deck not found: {self.base_file}")
+            return None
+        cached = self._base_decks.get(self.base_file)
+        if cached and cached[0] == key:
+            return cached[1]
+        compiled_files = [os.path.splitext(self.base_file)[0] + '.wwdeck', self.base_cache_file]
+        for compiled_file in filter(None, compiled_files):
+            compiled = open_compiled_deck(compiled_file, key)
+            if compiled is not None:
+                logging.info(f"Mapped compiled base deck {compiled_file}")
+                cards = compiled.cards()
+                break
+        else:
+            parsed = _parse_deck_file(self.base_file)
+            if parsed is None:
+                return None
+            cards = parsed[0]
+            if self.base_cache_file:
+                try:
+                    write_compiled_deck(self.base_cache_file, cards, key)
+                    logging.info(f"Compiled base deck into {self.base_cache_file}")
+                except Exception as e:
+                    logging.warning(f"Failed to compile base deck into {self.base_cache_file}: {str(e)}")
+        self._base_decks[self.base_file] = (key, cards)
+        return cards
+
+    def load(self):
+        base = self._load_base()
+        if base is None:
+            return None
+        overlay = {}
+        if os.path.exists(self.overlay_file):
+            with open(self.overlay_file, 'r', encoding='utf-8') as f:
+                overlay = json.load(f)
+            logging.info(f"Loaded overlay from {self.overlay_file}")
+        self.base = {card.german: card for card in base}
+        edits = overlay.get('cards', {})
+        flashcards = []
+        for base_card in base:
+            card = base_card.copy()
+            fields = edits.get(card.german)
+            if fields:
+                _apply_overlay_fields(card, fields)
+            flashcards.append(card)
+        flashcards.extend(Card.from_dict(data)[0] for data in overlay.get('added', [])
+                          if data.get('german') not in self.base)
+        return flashcards, _read_json_stats(self.stats_file), False
+
+    def pending_changes(self) -> List[Dict[str, Any]]:
+        return self.journal.read_entries()
+
+    def record_change(self, entry: Dict[str, Any]) -> None:
+        self.journal.append(entry)
+
+    def needs_compaction(self) -> bool:
+        return self.journal.entry_count >= self.compact_threshold
+
+    def save_all(self, flashcards: List[Card], stats: Dict[str, Any], user_config: Dict[str, Any]) -> None:
+        edits = {}
+        added = []
+        for card in flashcards:
+            base_card = self.base.get(card.german)
+            if base_card is None:
+                added.append(card.to_dict())
+                continue
+            # Text fields of mapped cards that were never decoded are unchanged; don't decode them to compare
+            fields = {name: getattr(card, name) for name in self.OVERLAY_FIELDS
+                      if is_loaded(card, name) and getattr(card, name) != getattr(base_card, name)}
+            if fields:
+                edits[card.german] = fields
+        atomic_write_json(self.overlay_file, {'version': self.OVERLAY_VERSION, 'cards': edits, 'added': added},
+                           ensure_ascii=False, indent=2)
+        atomic_write_json(self.stats_file, stats, indent=2)
+        atomic_write_json(self.user_config_file, user_config, indent=2)
+        # Everything journaled so far is now part of the files
+        self.journal.truncate()
+
+    def close(self) -> None:
+        self.journal.close()
+
+
+class SqliteStorage(StorageBackend):
+    """SQLite store: one row per card, an append-only review_events table and aggregate stats tables."""
+
+    name = 'sqlite'
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cards (
+            german TEXT PRIMARY KEY,
+            english TEXT NOT NULL DEFAULT '',
+            level TEXT NOT NULL DEFAULT '',
+            category TEXT NOT NULL DEFAULT '',
+            gender TEXT,
+            examples TEXT NOT NULL DEFAULT '[]',
+            box INTEGER NOT NULL DEFAULT 1,
+            favorite INTEGER NOT NULL DEFAULT 0,
+            extra TEXT,
+            due INTEGER NOT NULL DEFAULT 0,
+            interval INTEGER NOT NULL DEFAULT 0,
+            ease REAL NOT NULL DEFAULT 2.5
+        );
+        CREATE INDEX IF NOT EXISTS idx_cards_level ON cards(level);
+        CREATE INDEX IF NOT EXISTS idx_cards_category ON cards(category);
+        CREATE INDEX IF NOT EXISTS idx_cards_box ON cards(box);
+        CREATE INDEX IF NOT EXISTS idx_cards_favorite ON cards(favorite);
+        CREATE TABLE IF NOT EXISTS review_events (
+            id INTEGER PRIMARY KEY,
+            german TEXT NOT NULL,
+            reviewed_on TEXT NOT NULL,
+            correct INTEGER NOT NULL,
+            box INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_review_events_german ON review_events(german);
+        CREATE TABLE IF NOT EXISTS stats (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            correct INTEGER NOT NULL DEFAULT 0,
+            incorrect INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS config (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, db_file: str) -> None:
+        import sqlite3
+        self.db_file = db_file
+        # Opened on the Tk thread for loading, then used by the writer thread; access is serialized by _lock
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            # Databases created before scheduling was added lack the due/interval/ease columns
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(cards)")}
+            for column, definition in (('due', 'INTEGER NOT NULL DEFAULT 0'),
+                                       ('interval', 'INTEGER NOT NULL DEFAULT 0'),
+                                       ('ease', 'REAL NOT NULL DEFAULT 2.5')):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE cards ADD COLUMN {column} {definition}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_due ON cards(due)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'journal_seq'").fetchone()
+        # Changes up to this sequence number are already part of the stored snapshot
+        self._applied_seq: int = json.loads(row['value'] or 'null') or 0 if row else 0
+
+    @staticmethod
+    def _card_to_row(card: Card) -> tuple:
+        return (card.german, card.english, card.level, card.category, card.gender,
+                json.dumps(list(card.examples), ensure_ascii=False), card.box, int(bool(card.favorite)),
+                json.dumps(card.extra, ensure_ascii=False) if card.extra else None, card.due, card.interval, card.ease)
+
+    @staticmethod
+    def _row_to_card(row) -> Card:
+        return Card(row['german'], row['english'], _LEVELS_BY_NAME.get(row['level'], ''),
+                    _CATEGORIES_BY_NAME.get(row['category'], ''), row['gender'], tuple(json.loads(row['examples'])),
+                    row['box'], bool(row['favorite']), json.loads(row['extra']) if row['extra'] else None,
+                    row['due'], row['interval'], row['ease'])
+
+    def load(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM cards ORDER BY rowid").fetchall()
+            if not rows:
+                return None
+            flashcards = [self._row_to_card(row) for row in rows]
+            stats = {
+                'total_reviews': 0, 'correct': 0, 'incorrect': 0, 'streak': 0, 'last_review_date': None,
+                'by_level': {}, 'by_category': {}, 'by_box': {}, 'difficult_words': {}, 'daily': {}
+            }
+            for row in self._conn.execute("SELECT key, value FROM meta"):
+                stats[row['key']] = json.loads(row['value'])
+            for row in self._conn.execute("SELECT scope, key, correct, incorrect FROM stats"):
+                if row['scope'] == 'total':
+                    stats['correct'], stats['incorrect'] = row['correct'], row['incorrect']
+                elif row['scope'] == 'word':
+                    stats['difficult_words'][row['key']] = row['incorrect']
+                elif row['scope'] == 'day':
+                    day, dimension = row['key'].split('|', 1)
+                    stats['daily'].setdefault(day, {})[dimension] = [row['correct'], row['incorrect']]
+                else:
+                    stats[row['scope']][row['key']] = {'correct': row['correct'], 'incorrect': row['incorrect']}
+        logging.info(f"Loaded {len(flashcards)} flashcards from {self.db_file}")
+        return flashcards, stats, False
+
+    def load_config(self) -> Dict[str, Any]:
+        with self._lock:
+            return {row['key']: json.loads(row['value'])
+                    for row in self._conn.execute("SELECT key, value FROM config")}
+
+    def _bump_stats(self, scope: str, key: str, correct: bool) -> None:
+        self._conn.execute(
+            "INSERT INTO stats (scope, key, correct, incorrect) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(scope, key) DO UPDATE SET correct = correct + excluded.correct, "
+            "incorrect = incorrect + excluded.incorrect",
+            (scope, key, int(correct), int(not correct)))
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def record_change(self, entry: Dict[str, Any]) -> None:
+        if entry['seq'] <= self._applied_seq:
+            return  # Already included by a full save that ran after the change was made
+        op = entry.get('op')
+        with self._lock, self._conn:
+            if op == 'review':
+                self._conn.execute("UPDATE cards SET box = ?, due = ?, interval = ?, ease = ? WHERE german = ?",
+                                   (entry['box'], entry.get('due', 0), entry.get('interval', 0),
+                                    entry.get('ease', 2.5), entry['german']))
+                self._conn.execute("INSERT INTO review_events (german, reviewed_on, correct, box) VALUES (?, ?, ?, ?)",
+                                   (entry['german'], entry['date'], int(entry['correct']), entry['box']))
+                self._bump_stats('total', '', entry['correct'])
+                day_dimensions = ['total']
+                if 'previous_box' in entry:
+                    self._bump_stats('by_box', str(entry['previous_box']), entry['correct'])
+                    day_dimensions.append(f"box:{entry['previous_box']}")
+                if entry.get('level'):
+                    self._bump_stats('by_level', entry['level'], entry['correct'])
+                    day_dimensions.append(f"level:{entry['level']}")
+                if entry.get('category'):
+                    self._bump_stats('by_category', entry['category'], entry['correct'])
+                    day_dimensions.append(f"category:{entry['category']}")
+                for dimension in day_dimensions:
+                    self._bump_stats('day', f"{entry['date']}|{dimension}", entry['correct'])
+                if not entry['correct']:
+                    self._bump_stats('word', entry['german'], False)
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('total_reviews', '1') "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+                self._set_meta('streak', entry['streak'])
+                self._set_meta('last_review_date', entry['date'])
+            elif op == 'favorite':
+                self._conn.execute("UPDATE cards SET favorite = ? WHERE german = ?",
+                                   (int(entry['favorite']), entry['german']))
+            elif op == 'add':
+                self._conn.execute("INSERT OR IGNORE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   self._card_to_row(Card.from_dict(entry['card'])[0]))
+            elif op == 'config':
+                self._conn.executemany("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+                                       [(k, json.dumps(v)) for k, v in entry['config'].items()])
+            self._set_meta('journal_seq', entry['seq'])
+        self._applied_seq = entry['seq']
+
+    def save_all(self, flashcards: List[Card], stats: Dict[str, Any], user_config: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cards")
+            self._conn.executemany("INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   [self._card_to_row(card) for card in flashcards])
+            self._conn.execute("DELETE FROM stats")
+            self._conn.execute("INSERT INTO stats VALUES ('total', '', ?, ?)",
+                               (stats.get('correct', 0), stats.get('incorrect', 0)))
+            for scope in ('by_level', 'by_category', 'by_box'):
+                self._conn.executemany("INSERT INTO stats VALUES (?, ?, ?, ?)",
+                                       [(scope, key, counts.get('correct', 0), counts.get('incorrect', 0))
+                                        for key, counts in stats.get(scope, {}).items()])
+            self._conn.executemany("INSERT INTO stats VALUES ('day', ?, ?, ?)",
+                                   [(f"{day}|{dimension}", counts[0], counts[1])
+                                    for day, bucket in stats.get('daily', {}).items()
+                                    for dimension, counts in bucket.items()])
+            self._conn.executemany("INSERT INTO stats VALUES ('word', ?, 0, ?)",
+                                   list(stats.get('difficult_words', {}).items()))
+            for key in ('total_reviews', 'streak', 'last_review_date', 'journal_seq'):
+                self._set_meta(key, stats.get(key))
+            self._conn.executemany("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+                                   [(k, json.dumps(v)) for k, v in user_config.items()])
+        self._applied_seq = stats.get('journal_seq') or 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
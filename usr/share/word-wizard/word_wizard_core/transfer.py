@@ -0,0 +1,373 @@
+"""Streaming import and export of vocabulary files: JSON arrays, JSON Lines, CSV/TSV and Anki notes.
+
+The format follows the file extension in both directions (.json, .jsonl, .csv, .tsv, and .txt for Anki
+notes), so anything exported can be imported again.
+
+Imports are read incrementally and turned into batches of standardized Cards (the same validation and
+standardization as loading the deck), so memory use does not depend on the file size. Batches are added
+with Deck.add_cards(), which skips words already in the deck.
+
+Exports write one card at a time, optionally filtered and compressed (gzip, bz2 and xz from the standard
+library; zstd with Python 3.14 or the zstandard package), so a large deck is never turned into one big list
+or string. Compressed files are recognized by extension (.gz, .bz2, .xz, .zst) in both directions.
+"""
+
+import bz2
+import contextlib
+import csv
+import gzip
+import html
+import io
+import itertools
+import json
+import lzma
+import os
+import re
+import threading
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .cards import ALLOWED_CATEGORIES, ALLOWED_LEVELS, Card
+from .storage import _valid_card_record, iter_json_array
+
+FORMATS = ('json', 'jsonl', 'csv', 'tsv', 'anki')  # For both import and export
+COMPRESSIONS = ('gzip', 'bz2', 'xz', 'zstd')
+CSV_COLUMNS = Card.FIELDS + Card.SCHEDULE_FIELDS
+EXAMPLE_SEPARATOR = ' | '  # Between example sentences in one CSV/TSV column
+_EXTENSIONS = {'.json': 'json', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.tsv': 'tsv', '.txt': 'anki'}
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+_TRUE = ('1', 'true', 'yes', 'y', 'x')
+
+
+class ImportProgress:
+    """Counters for a running import; written by the reader and the committer, read for progress reports."""
+
+    def __init__(self) -> None:
+        self.records = 0  # Records read from the file
+        self.invalid = 0  # Records skipped by validation
+        self.added = 0
+        self.duplicates = 0  # Valid records whose German word was already in the deck
+        self.bytes_read = 0
+        self.total_bytes = 0
+
+    @property
+    def fraction(self) -> float:
+        return min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 1.0
+
+    def commit(self, batch_size: int, added: int) -> None:
+        """Count a batch handed to Deck.add_cards()."""
+        self.added += added
+        self.duplicates += batch_size - added
+
+    def summary(self) -> str:
+        text = f"Added {self.added} new words"
+        skipped = [f"{count} {what}" for count, what in ((self.duplicates, "already in the deck"),
+                                                          (self.invalid, "invalid")) if count]
+        return text + (f" (skipped {', '.join(skipped)})" if skipped else "")
+
+
+class ExportProgress:
+    """Counters for a running export, read for progress reports."""
+
+    def __init__(self) -> None:
+        self.scanned = 0  # Cards checked against the filters
+        self.written = 0
+        self.total = 0  # Cards in the deck
+
+    @property
+    def fraction(self) -> float:
+        return min(self.scanned / self.total, 1.0) if self.total else 1.0
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Compression of a vocabulary file from its extension (e.g. words.json.gz), or None."""
+    return _COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _extension(path: str) -> str:
+    """The format extension, looking past a compression extension."""
+    root, extension = os.path.splitext(path)
+    if extension.lower() in _COMPRESSION_EXTENSIONS:
+        extension = os.path.splitext(root)[1]
+    return extension.lower()
+
+
+def _zstd_file(fileobj: BinaryIO, mode: str):
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.ZstdFile(fileobj, mode)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression needs Python 3.14 or the zstandard package; use gzip, bz2 or xz") from None
+    if mode == 'wb':
+        return zstandard.ZstdCompressor().stream_writer(fileobj, closefd=False)
+    return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+
+
+def _compressed(fileobj: BinaryIO, compression: Optional[str], mode: str) -> BinaryIO:
+    """Wrap an open binary file to (de)compress it; mode is 'rb' or 'wb'. Closing the wrapper leaves fileobj open."""
+    if compression is None:
+        return fileobj
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode=mode)
+    if compression == 'bz2':
+        return bz2.BZ2File(fileobj, mode)
+    if compression == 'xz':
+        return lzma.LZMAFile(fileobj, mode)
+    if compression == 'zstd':
+        return _zstd_file(fileobj, mode)
+    raise ValueError(f"Unknown compression '{compression}' (use one of {', '.join(COMPRESSIONS)})")
+
+
+def detect_format(path: str) -> str:
+    """Format of a vocabulary file to import from its extension, else from its first bytes."""
+    extension = _extension(path)
+    if extension in _EXTENSIONS:
+        return _EXTENSIONS[extension]
+    with open(path, 'rb') as raw, _compressed(raw, detect_compression(path), 'rb') as stream:
+        head = stream.read(4096).decode('utf-8-sig', errors='replace').lstrip()
+    if head.startswith('['):
+        return 'json'
+    if head.startswith('{'):
+        return 'jsonl'
+    if head.startswith('#separator:'):
+        return 'anki'
+    return 'tsv' if '\t' in head.partition('\n')[0] else 'csv'
+
+
+def _row_record(row: Dict[Optional[str], Any]) -> Dict[str, Any]:
+    """Turn a CSV/TSV row into a deck entry: empty cells are left out and typed columns are converted."""
+    record = {key.strip().lower(): value.strip() for key, value in row.items()
+              if key and isinstance(value, str) and value.strip()}
+    examples = [example.strip() for example in record.pop('examples', '').split(EXAMPLE_SEPARATOR.strip())]
+    examples += [record.pop(key) for key in ('example', 'example1', 'example2') if key in record]
+    examples = [example for example in examples if example]
+    if examples:
+        record['examples'] = examples
+    if 'favorite' in record:
+        record['favorite'] = record['favorite'].lower() in _TRUE
+    for key, convert in (('box', int), ('due', int), ('interval', int), ('ease', float)):
+        if key in record:
+            try:
+                record[key] = convert(record[key])
+            except ValueError:
+                del record[key]
+    return record
+
+
+def _anki_text(field: str) -> str:
+    return html.unescape(re.sub(r'</?i>', '', field).replace('<br>', '\n')).strip()
+
+
+def _anki_records(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Entries from tab-separated Anki notes in the layout _write_anki() writes.
+
+    German is on the front, English and the examples on the back; level, category and favorite are tags.
+    """
+    tags_column = None
+    notes = False
+    for row in csv.reader(f, delimiter='\t'):
+        if not row:
+            continue
+        if not notes and row[0].startswith('#'):
+            # File headers such as '#separator:tab' and '#tags column:3' come before the first note
+            key, _, value = row[0][1:].partition(':')
+            if key == 'tags column' and value.isdigit():
+                tags_column = int(value) - 1
+            continue
+        notes = True
+        english, _, examples = (row[1] if len(row) > 1 else '').partition('<br><br>')
+        record = {'german': _anki_text(row[0]), 'english': _anki_text(english),
+                  'examples': [_anki_text(example) for example in examples.split('<br>') if example]}
+        tags = row[tags_column].split() if tags_column is not None and tags_column < len(row) else []
+        for tag in tags:
+            if tag.upper() in ALLOWED_LEVELS:
+                record['level'] = tag
+            elif tag.title() in ALLOWED_CATEGORIES:
+                record['category'] = tag
+            elif tag == 'favorite':
+                record['favorite'] = True
+        yield record
+
+
+def iter_records(f: TextIO, fmt: str) -> Iterator[Any]:
+    """Yield the raw entries of an open vocabulary file, one at a time."""
+    if fmt == 'json':
+        yield from iter_json_array(f)
+    elif fmt == 'jsonl':
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt in ('csv', 'tsv'):
+        reader = csv.DictReader(f, delimiter=',' if fmt == 'csv' else '\t')
+        if 'german' not in [name.strip().lower() for name in reader.fieldnames or ()]:
+            raise ValueError(f"{fmt.upper()} file needs a header row with a 'german' column")
+        for row in reader:
+            yield _row_record(row)
+    elif fmt == 'anki':
+        yield from _anki_records(f)
+    else:
+        raise ValueError(f"Unknown vocabulary format '{fmt}' (use one of {', '.join(FORMATS)})")
+
+
+def read_cards(path: str, fmt: Optional[str] = None, batch_size: int = 1000,
+               progress: Optional[ImportProgress] = None,
+               stop: Optional[threading.Event] = None) -> Iterator[List[Card]]:
+    """Stream a vocabulary file as batches of standardized Cards, skipping invalid entries.
+
+    Safe to run on a worker thread: nothing here touches the deck. Stops early when stop is set.
+    """
+    fmt = fmt or detect_format(path)
+    progress = progress or ImportProgress()
+    progress.total_bytes = os.path.getsize(path)
+    batch = []
+    with open(path, 'rb') as raw, _compressed(raw, detect_compression(path), 'rb') as stream:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        for record in iter_records(text, fmt):
+            progress.records += 1
+            if not _valid_card_record(record):
+                progress.invalid += 1
+                continue
+            batch.append(Card.from_dict(record)[0])
+            if len(batch) >= batch_size:
+                progress.bytes_read = raw.tell()
+                yield batch
+                batch = []
+                if stop is not None and stop.is_set():
+                    return
+    if batch:
+        yield batch
+    progress.bytes_read = progress.total_bytes
+
+
+def _chunks(entries: Iterable[Dict[str, Any]], size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(entries)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_json(out: TextIO, entries: Iterable[Dict[str, Any]]) -> None:
+    """The same text as json.dump(list(entries), out, ensure_ascii=False, indent=2).
+
+    Entries are encoded 1000 at a time as an indented array whose brackets are cut off, which costs one
+    encoder call per chunk rather than per card.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+    separator = '[\n'
+    for chunk in _chunks(entries):
+        out.write(separator)
+        out.write(encode(chunk)[2:-2])  # Without the leading '[\n' and trailing '\n]'
+        separator = ',\n'
+    out.write('[]' if separator == '[\n' else '\n]')
+
+
+def _write_jsonl(out: TextIO, entries: Iterable[Dict[str, Any]]) -> None:
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for chunk in _chunks(entries):
+        out.write('\n'.join(map(encode, chunk)))
+        out.write('\n')
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list):
+        return EXAMPLE_SEPARATOR.join(value)
+    return str(value)
+
+
+def _write_csv(out: TextIO, entries: Iterable[Dict[str, Any]], delimiter: str = ',') -> None:
+    """One row per card under a header row, readable by the CSV/TSV importer; unknown JSON keys are left out."""
+    writer = csv.writer(out, delimiter=delimiter)
+    writer.writerow(CSV_COLUMNS)
+    for data in entries:
+        writer.writerow([_cell(data.get(column)) for column in CSV_COLUMNS])
+
+
+def _anki_field(text: str) -> str:
+    # Tabs and line breaks would end the field or the note; as HTML they survive both Anki and re-import
+    return html.escape(text).replace('\t', '&#9;').replace('\r', '').replace('\n', '<br>')
+
+
+def _write_anki(out: TextIO, entries: Iterable[Dict[str, Any]]) -> None:
+    """Tab-separated notes for Anki's File > Import (Basic note type).
+
+    German goes on the front, English and the examples on the back; level, category and favorite become tags.
+    """
+    out.write('#separator:tab\n#html:true\n#tags column:3\n')
+    for data in entries:
+        back = _anki_field(data['english'] or '')
+        if data['examples']:
+            back += '<br><br>' + '<br>'.join(f"<i>{_anki_field(example)}</i>" for example in data['examples'])
+        tags = [tag for tag in (data['level'], data['category']) if tag]
+        if data['favorite']:
+            tags.append('favorite')
+        out.write(f"{_anki_field(data['german'])}\t{back}\t{' '.join(tags)}\n")
+
+
+def _write_tsv(out: TextIO, entries: Iterable[Dict[str, Any]]) -> None:
+    _write_csv(out, entries, delimiter='\t')
+
+
+_WRITERS = {'json': _write_json, 'jsonl': _write_jsonl, 'csv': _write_csv, 'tsv': _write_tsv, 'anki': _write_anki}
+
+
+def write_cards(path: str, flashcards: List[Card], fmt: Optional[str] = None, compression: Optional[str] = None,
+                level: Optional[str] = None, category: Optional[str] = None, box: Optional[int] = None,
+                favorite: Optional[bool] = None, progress: Optional[ExportProgress] = None,
+                stop: Optional[threading.Event] = None,
+                callback: Optional[Callable[[ExportProgress], None]] = None) -> ExportProgress:
+    """Write the cards matching the filters to path, one at a time, in deck order.
+
+    fmt and compression default to what path's extension says (JSON, uncompressed otherwise). The file is
+    written next to path and swapped in when complete; an export stopped through stop leaves path untouched.
+    callback is called with the progress every 1000 cards.
+    Safe to run on a worker thread as long as flashcards is a snapshot of the deck's list.
+    """
+    fmt = fmt or _EXTENSIONS.get(_extension(path), 'json')
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}' (use one of {', '.join(FORMATS)})")
+    compression = compression or detect_compression(path)
+    progress = progress or ExportProgress()
+    progress.total = len(flashcards)
+
+    def entries():
+        for card in flashcards:
+            if stop is not None and stop.is_set():
+                return
+            progress.scanned += 1
+            if callback is not None and progress.scanned % 1000 == 0:
+                callback(progress)
+            if ((level is None or card.level == level) and (category is None or card.category == category)
+                    and (box is None or card.box == box) and (favorite is None or bool(card.favorite) == favorite)):
+                progress.written += 1
+                yield card.to_dict()
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as raw:
+            stream = _compressed(raw, compression, 'wb')
+            out = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+            _WRITERS[fmt](out, entries())
+            out.flush()
+            out.detach()
+            if stream is not raw:
+                stream.close()  # Writes the end of the compressed stream
+            raw.flush()
+            os.fsync(raw.fileno())
+        if stop is not None and stop.is_set():
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return progress